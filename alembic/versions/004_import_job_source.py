@@ -0,0 +1,23 @@
+"""Add source to import jobs
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('import_jobs', sa.Column('source', sa.String(length=20), nullable=False, server_default='external_api'))
+    op.alter_column('import_jobs', 'requested_count', existing_type=sa.Integer(), nullable=True)
+
+def downgrade():
+    op.execute("UPDATE import_jobs SET requested_count = 0 WHERE requested_count IS NULL")
+    op.alter_column('import_jobs', 'requested_count', existing_type=sa.Integer(), nullable=False)
+    op.drop_column('import_jobs', 'source')
@@ -0,0 +1,32 @@
+"""Track source id and content hash on patients
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('patients', sa.Column('source', sa.String(length=50), nullable=True))
+    op.add_column('patients', sa.Column('source_id', sa.String(length=100), nullable=True))
+    op.add_column('patients', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('uq_patients_source_id', 'patients', ['source', 'source_id'])
+    
+    op.add_column('import_jobs', sa.Column('updated_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('import_jobs', sa.Column('unchanged_count', sa.Integer(), nullable=False, server_default='0'))
+
+def downgrade():
+    op.drop_column('import_jobs', 'unchanged_count')
+    op.drop_column('import_jobs', 'updated_count')
+    
+    op.drop_constraint('uq_patients_source_id', 'patients', type_='unique')
+    op.drop_column('patients', 'content_hash')
+    op.drop_column('patients', 'source_id')
+    op.drop_column('patients', 'source')
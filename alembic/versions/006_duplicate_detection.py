@@ -0,0 +1,49 @@
+"""Add duplicate detection tables
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'patient_blocking_keys',
+        sa.Column('key', sa.String(length=80), nullable=False),
+        sa.Column('patient_id', sa.Integer(), sa.ForeignKey('patients.id', ondelete='CASCADE'), nullable=False),
+        sa.PrimaryKeyConstraint('key', 'patient_id')
+    )
+    op.create_index('ix_patient_blocking_keys_patient_id', 'patient_blocking_keys', ['patient_id'])
+    
+    op.create_table(
+        'duplicate_matches',
+        sa.Column('patient_id', sa.Integer(), sa.ForeignKey('patients.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('matched_patient_id', sa.Integer(), sa.ForeignKey('patients.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('patient_id', 'matched_patient_id')
+    )
+    op.create_index('ix_duplicate_matches_matched_patient_id', 'duplicate_matches', ['matched_patient_id'])
+    
+    op.create_table(
+        'duplicate_clusters',
+        sa.Column('patient_id', sa.Integer(), sa.ForeignKey('patients.id', ondelete='CASCADE'), nullable=False, primary_key=True),
+        sa.Column('cluster_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True)
+    )
+    op.create_index('ix_duplicate_clusters_cluster_id', 'duplicate_clusters', ['cluster_id'])
+
+def downgrade():
+    op.drop_index('ix_duplicate_clusters_cluster_id', table_name='duplicate_clusters')
+    op.drop_table('duplicate_clusters')
+    op.drop_index('ix_duplicate_matches_matched_patient_id', table_name='duplicate_matches')
+    op.drop_table('duplicate_matches')
+    op.drop_index('ix_patient_blocking_keys_patient_id', table_name='patient_blocking_keys')
+    op.drop_table('patient_blocking_keys')
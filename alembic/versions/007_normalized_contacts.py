@@ -0,0 +1,75 @@
+"""Add normalized email and phone lookup columns
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.domain.normalization import normalize_email, normalize_phone
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+patients = sa.table(
+    'patients',
+    sa.column('id', sa.Integer),
+    sa.column('email', sa.String),
+    sa.column('phone', sa.String),
+    sa.column('email_normalized', sa.String),
+    sa.column('phone_normalized', sa.String)
+)
+
+def upgrade():
+    op.add_column('patients', sa.Column('email_normalized', sa.String(length=100), nullable=True))
+    op.add_column('patients', sa.Column('phone_normalized', sa.String(length=16), nullable=True))
+    
+    # Backfill in id order with the same functions the application uses.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(patients.c.id, patients.c.email, patients.c.phone)
+            .where(patients.c.id > last_id)
+            .order_by(patients.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.update(patients)
+            .where(patients.c.id == sa.bindparam('row_id'))
+            .values(email_normalized=sa.bindparam('email_value'), phone_normalized=sa.bindparam('phone_value')),
+            [
+                {'row_id': row.id, 'email_value': normalize_email(row.email), 'phone_value': normalize_phone(row.phone)}
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+    
+    duplicates = connection.execute(
+        sa.select(patients.c.email_normalized)
+        .group_by(patients.c.email_normalized)
+        .having(sa.func.count() > 1)
+        .limit(10)
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Patients differ only by email case and must be merged before upgrading: " + ", ".join(duplicates)
+        )
+    
+    op.alter_column('patients', 'email_normalized', nullable=False)
+    op.alter_column('patients', 'phone_normalized', nullable=False)
+    op.create_index('ix_patients_email_normalized', 'patients', ['email_normalized'], unique=True)
+    op.create_index('ix_patients_phone_normalized', 'patients', ['phone_normalized'])
+
+def downgrade():
+    op.drop_index('ix_patients_phone_normalized', table_name='patients')
+    op.drop_index('ix_patients_email_normalized', table_name='patients')
+    op.drop_column('patients', 'phone_normalized')
+    op.drop_column('patients', 'email_normalized')
@@ -0,0 +1,34 @@
+"""Add the patient change log behind the change feed
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'patient_changes',
+        sa.Column('seq', sa.BigInteger(), sa.Identity(), nullable=False, primary_key=True),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+    op.create_index('ix_patient_changes_patient_id', 'patient_changes', ['patient_id'])
+    # Existing patients enter the feed as creations so a client starting from
+    # cursor 0 receives the whole table once.
+    op.execute(
+        "INSERT INTO patient_changes (patient_id, operation, changed_at) "
+        "SELECT id, 'created', COALESCE(updated_at, created_at, now()) FROM patients ORDER BY id"
+    )
+
+def downgrade():
+    op.drop_index('ix_patient_changes_patient_id', table_name='patient_changes')
+    op.drop_table('patient_changes')
@@ -0,0 +1,34 @@
+"""Add the patient statistics rollup table
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.infrastructure.repositories.patient_stats_repository import rebuild_statements
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'patient_stats',
+        sa.Column('dimension', sa.String(length=10), nullable=False),
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'key')
+    )
+    op.create_index('ix_patient_stats_dimension_count', 'patient_stats', ['dimension', 'count'])
+    
+    # Fill the rollups with the statements python -m app.cli.rebuild_patient_stats runs.
+    connection = op.get_bind()
+    for statement in rebuild_statements(connection.dialect.name):
+        connection.execute(statement)
+
+def downgrade():
+    op.drop_index('ix_patient_stats_dimension_count', table_name='patient_stats')
+    op.drop_table('patient_stats')
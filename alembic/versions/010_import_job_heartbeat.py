@@ -0,0 +1,20 @@
+"""Add a heartbeat to import jobs
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('import_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+def downgrade():
+    op.drop_column('import_jobs', 'heartbeat_at')
@@ -0,0 +1,27 @@
+"""Order the change log by a visibility horizon instead of a write lock
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('patient_changes', sa.Column('visible_after', sa.BigInteger(), nullable=True))
+    # Rows written under the old lock were committed in seq order.
+    op.execute("UPDATE patient_changes SET visible_after = 0")
+    op.create_index(
+        'ix_patient_changes_unstamped', 'patient_changes', ['seq'],
+        postgresql_where=sa.text('visible_after IS NULL')
+    )
+
+def downgrade():
+    op.drop_index('ix_patient_changes_unstamped', table_name='patient_changes')
+    op.drop_column('patient_changes', 'visible_after')
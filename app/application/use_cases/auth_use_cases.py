@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 from app.domain.entities.user import User
 from app.domain.interfaces import IUserRepository
 from app.config import settings
+from app.infrastructure.monitoring.tracing import traced_class
 
+@traced_class
 class AuthUseCases:
     def __init__(self, user_repository: IUserRepository):
         self._user_repository = user_repository
@@ -58,16 +60,20 @@ class AuthUseCases:
         return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     
     async def get_user_by_token(self, token: str) -> Optional[User]:
+        username = self.username_from_token(token)
+        if username is None:
+            return None
+        
+        return await self._user_repository.get_by_username(username)
+    
+    @staticmethod
+    def username_from_token(token: str) -> Optional[str]:
+        """Verify the token's signature and expiry without touching the database."""
         try:
             payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-            username: str = payload.get("sub")
-            
-            if username is None:
-                return None
-            
-            return await self._user_repository.get_by_username(username)
         except JWTError:
             return None
+        return payload.get("sub")
     
     def _hash_password(self, password: str) -> str:
         return self._pwd_context.hash(password)
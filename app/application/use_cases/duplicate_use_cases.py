@@ -0,0 +1,90 @@
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from app.domain.entities.duplicate import DuplicateCluster, DuplicateMatch, DuplicateScanResult
+from app.domain.interfaces import IDuplicateRepository
+from app.infrastructure.dedup.matching import MatchProfile, blocking_keys, profile_score
+from app.infrastructure.monitoring.tracing import traced_class
+
+logger = logging.getLogger(__name__)
+
+@traced_class
+class DuplicateDetectionUseCases:
+    """Incremental record linkage over the patient table.
+
+    Only patients without blocking keys are processed, so a re-run costs time
+    proportional to the new patients; editing a patient's name, email or
+    phone drops its keys, and the next scan scores it afresh. Each new patient is scored
+    against the members of the blocks it falls into; blocks larger than
+    ``max_block_size`` are skipped, which bounds the work per patient and
+    keeps a full scan near-linear in the number of patients.
+    """
+
+    def __init__(
+        self,
+        duplicate_repository: IDuplicateRepository,
+        threshold: float = 0.85,
+        max_block_size: int = 500,
+        batch_size: int = 1000
+    ):
+        self._duplicate_repository = duplicate_repository
+        self._threshold = threshold
+        self._max_block_size = max_block_size
+        self._batch_size = batch_size
+
+    async def count_pending(self) -> int:
+        return await self._duplicate_repository.count_pending()
+
+    async def get_clusters(self, skip: int = 0, limit: int = 100) -> List[DuplicateCluster]:
+        return await self._duplicate_repository.list_clusters(skip=skip, limit=limit)
+
+    async def scan(self, on_progress: Optional[Callable[[DuplicateScanResult], Awaitable[None]]] = None) -> DuplicateScanResult:
+        result = DuplicateScanResult()
+        after_id = 0
+        while batch := await self._duplicate_repository.next_pending(after_id, self._batch_size):
+            after_id = batch[-1].id
+            await self._duplicate_repository.forget_matches([patient.id for patient in batch])
+            keys = {patient.id: blocking_keys(patient) for patient in batch}
+            await self._duplicate_repository.add_keys(
+                (patient_id, key) for patient_id, patient_keys in keys.items() for key in patient_keys
+            )
+            blocks, oversized = await self._duplicate_repository.find_block_members(
+                set().union(*keys.values()), self._max_block_size
+            )
+
+            profiles: Dict[int, MatchProfile] = {}
+            for block in blocks.values():
+                for member in block:
+                    if member.id not in profiles:
+                        profiles[member.id] = MatchProfile.of(member)
+
+            matches: List[DuplicateMatch] = []
+            compared: Set[Tuple[int, int]] = set()
+            for patient in batch:
+                for key in keys[patient.id]:
+                    for other in blocks.get(key, ()):
+                        pair = (min(patient.id, other.id), max(patient.id, other.id))
+                        if other.id == patient.id or pair in compared:
+                            continue
+                        compared.add(pair)
+                        score = profile_score(profiles[patient.id], profiles[other.id], self._threshold)
+                        if score >= self._threshold:
+                            matches.append(DuplicateMatch(pair[0], pair[1], round(score, 4)))
+            await self._duplicate_repository.record_matches(matches)
+
+            result.processed += len(batch)
+            result.compared += len(compared)
+            result.matched += len(matches)
+            result.oversized_blocks += oversized
+            if on_progress is not None:
+                await on_progress(result)
+
+        logger.info(
+            "Duplicate scan finished",
+            extra={
+                "processed": result.processed,
+                "compared": result.compared,
+                "matched": result.matched,
+                "oversized_blocks": result.oversized_blocks,
+            },
+        )
+        return result
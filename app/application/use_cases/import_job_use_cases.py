@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from app.domain.entities.import_job import ImportJob, ImportJobSource, ImportJobStatus, ImportProgress, MAX_RECORDED_ERRORS
+from app.domain.interfaces import IImportJobRepository
+from app.infrastructure.monitoring.tracing import traced_class
+
+STALE_JOB_ERROR = "Interrupted: the worker running this job stopped"
+
+@traced_class
+class ImportJobUseCases:
+    def __init__(self, job_repository: IImportJobRepository):
+        self._job_repository = job_repository
+    
+    async def enqueue_job(
+        self,
+        requested_count: Optional[int],
+        created_by: Optional[int] = None,
+        source: ImportJobSource = ImportJobSource.EXTERNAL_API
+    ) -> ImportJob:
+        if requested_count is not None and requested_count < 1:
+            raise ValueError("Import count must be positive")
+        
+        job = ImportJob(id=None, requested_count=requested_count, source=source, created_by=created_by)
+        return await self._job_repository.create(job)
+    
+    async def get_job(self, job_id: int) -> Optional[ImportJob]:
+        return await self._job_repository.get_by_id(job_id)
+    
+    async def start_job(self, job_id: int) -> Optional[ImportJob]:
+        return await self._job_repository.update(job_id, {
+            "status": ImportJobStatus.RUNNING,
+            "started_at": datetime.utcnow()
+        })
+    
+    async def record_progress(self, job_id: int, progress: ImportProgress) -> Optional[ImportJob]:
+        return await self._job_repository.update(job_id, self._progress_fields(progress))
+    
+    async def complete_job(self, job_id: int, progress: ImportProgress) -> Optional[ImportJob]:
+        return await self._job_repository.update(job_id, {
+            **self._progress_fields(progress),
+            "status": ImportJobStatus.COMPLETED,
+            "finished_at": datetime.utcnow()
+        })
+    
+    async def fail_job(self, job_id: int, progress: ImportProgress, error: str) -> Optional[ImportJob]:
+        progress.errors.append(error)
+        del progress.errors[:-MAX_RECORDED_ERRORS]
+        return await self._job_repository.update(job_id, {
+            **self._progress_fields(progress),
+            "status": ImportJobStatus.FAILED,
+            "finished_at": datetime.utcnow()
+        })
+    
+    async def keep_alive(self, job_ids: Iterable[int]) -> None:
+        await self._job_repository.touch(job_ids)
+    
+    async def fail_stale_jobs(self, stale_after: float) -> int:
+        """Fail queued or running jobs whose worker stopped refreshing their heartbeat."""
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+        return await self._job_repository.fail_stale(cutoff, STALE_JOB_ERROR)
+    
+    def _progress_fields(self, progress: ImportProgress) -> dict:
+        return {
+            "processed_count": progress.processed,
+            "imported_count": progress.imported,
+            "updated_count": progress.updated,
+            "unchanged_count": progress.unchanged,
+            "skipped_count": progress.skipped,
+            "failed_count": progress.failed,
+            "errors": list(progress.errors)
+        }
@@ -0,0 +1,136 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar, Union
+from app.domain.entities.import_job import ImportProgress, SyncResult
+
+T = TypeVar("T")
+RawRecord = Dict[str, Any]
+
+@dataclass(frozen=True)
+class PipelineLimits:
+    page_size: int = 100
+    fetch_concurrency: int = 4
+    queue_pages: int = 8
+    batch_size: int = 500
+    transform_workers: Optional[int] = None
+
+def _first_error(error: BaseException) -> BaseException:
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+class ImportPipeline(Generic[T]):
+    """Fetch, normalize and write records as three stages joined by bounded queues.
+
+    Each stage blocks when the next one falls behind, so memory is bounded by
+    the queue sizes and one write batch regardless of the import size, while
+    page fetches keep running during database writes.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[List[RawRecord]]],
+        normalize: Callable[[RawRecord], T],
+        write_batch: Callable[[List[T]], Awaitable[Union[int, SyncResult]]],
+        limits: PipelineLimits = PipelineLimits(),
+        on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]] = None
+    ):
+        self._fetch_page = fetch_page
+        self._normalize = normalize
+        self._write_batch = write_batch
+        self._limits = limits
+        self._on_progress = on_progress
+
+    async def run(self, count: int, progress: ImportProgress) -> ImportProgress:
+        raw_pages: "asyncio.Queue[Optional[List[RawRecord]]]" = asyncio.Queue(self._limits.queue_pages)
+        records: "asyncio.Queue[Optional[List[T]]]" = asyncio.Queue(self._limits.queue_pages)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._fetch_stage(count, raw_pages))
+                group.create_task(self._normalize_stage(raw_pages, records, progress))
+                group.create_task(self._write_stage(records, progress))
+        except ExceptionGroup as errors:
+            raise _first_error(errors) from None
+        return progress
+
+    async def _fetch_stage(self, count: int, raw_pages: "asyncio.Queue[Optional[List[RawRecord]]]") -> None:
+        page_size = self._limits.page_size
+        last_page = -(-count // page_size)
+        next_page = 1
+        exhausted = False
+
+        async def fetch_worker() -> None:
+            nonlocal next_page, exhausted
+            while not exhausted and next_page <= last_page:
+                page = next_page
+                next_page += 1
+                rows = await self._fetch_page(page, page_size)
+                if len(rows) < page_size:
+                    exhausted = True
+                remaining = count - (page - 1) * page_size
+                if rows:
+                    await raw_pages.put(rows[:remaining])
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(min(self._limits.fetch_concurrency, last_page)):
+                group.create_task(fetch_worker())
+        await raw_pages.put(None)
+
+    async def _normalize_stage(
+        self,
+        raw_pages: "asyncio.Queue[Optional[List[RawRecord]]]",
+        records: "asyncio.Queue[Optional[List[T]]]",
+        progress: ImportProgress
+    ) -> None:
+        while (page := await raw_pages.get()) is not None:
+            normalized = []
+            for row in page:
+                try:
+                    normalized.append(self._normalize(row))
+                except Exception as e:
+                    progress.processed += 1
+                    progress.record_error(f"{row.get('email')}: {e}")
+            await records.put(normalized)
+        await records.put(None)
+
+    async def _write_stage(self, records: "asyncio.Queue[Optional[List[T]]]", progress: ImportProgress) -> None:
+        batch: List[T] = []
+        while (page := await records.get()) is not None:
+            batch.extend(page)
+            if len(batch) >= self._limits.batch_size:
+                await self._flush(batch, progress)
+                batch = []
+        if batch:
+            await self._flush(batch, progress)
+
+    async def _flush(self, batch: List[T], progress: ImportProgress) -> None:
+        try:
+            outcome = await self._write(batch)
+        except ValueError:
+            # The writer rejected the batch as a whole; retry row by row so
+            # only the offending records fail.
+            outcome = SyncResult()
+            written: List[T] = []
+            for record in batch:
+                try:
+                    result = await self._write([record])
+                except ValueError as e:
+                    progress.processed += 1
+                    progress.record_error(f"{getattr(record, 'email', record)}: {e}")
+                    continue
+                written.append(record)
+                outcome.created += result.created
+                outcome.updated += result.updated
+                outcome.unchanged += result.unchanged
+            batch = written
+        progress.processed += len(batch)
+        progress.imported += outcome.created
+        progress.updated += outcome.updated
+        progress.unchanged += outcome.unchanged
+        progress.skipped += len(batch) - outcome.created - outcome.updated - outcome.unchanged
+        if self._on_progress:
+            await self._on_progress(progress)
+
+    async def _write(self, batch: List[T]) -> SyncResult:
+        outcome = await self._write_batch(batch)
+        return SyncResult(created=outcome) if isinstance(outcome, int) else outcome
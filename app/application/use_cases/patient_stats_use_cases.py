@@ -0,0 +1,27 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+from app.domain.entities.patient_stats import PatientStats
+from app.domain.interfaces import IPatientStatsRepository
+from app.infrastructure.monitoring.tracing import traced_class
+
+@traced_class
+class PatientStatsUseCases:
+    def __init__(self, stats_repository: IPatientStatsRepository):
+        self._stats_repository = stats_repository
+
+    async def get_stats(self, days: int = 30, domains: int = 10, today: Optional[date] = None) -> PatientStats:
+        """Dashboard figures read from the rollups; days without creations count as zero."""
+        today = today or datetime.utcnow().date()
+        first_day = today - timedelta(days=days - 1)
+        per_day = await self._stats_repository.created_per_day(first_day)
+        return PatientStats(
+            active_patients=await self._stats_repository.active_total(),
+            created_per_day=[
+                (first_day + timedelta(days=offset), per_day.get(first_day + timedelta(days=offset), 0))
+                for offset in range(days)
+            ],
+            top_domains=await self._stats_repository.top_domains(domains)
+        )
+
+    async def rebuild(self) -> None:
+        await self._stats_repository.rebuild()
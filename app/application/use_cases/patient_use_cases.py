@@ -1,12 +1,31 @@
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from typing import Awaitable, BinaryIO, Callable, Iterable, List, Optional, Dict, Any
+from pydantic import ValidationError
+from app.domain.entities.import_job import ImportProgress, SyncResult
+from app.application.use_cases.import_pipeline import ImportPipeline, PipelineLimits
 from app.domain.entities.patient import Patient
+from app.domain.entities.patient_change import ChangeFeedPage
 from app.domain.interfaces import IPatientRepository
 from app.infrastructure.external.external_api_service import ExternalApiService
+from app.infrastructure.fhir.bulk_loader import FhirBulkLoader
+from app.infrastructure.fhir.reader import FhirFileReader
+from app.infrastructure.repositories.email_filter import EmailFilter
+from app.infrastructure.monitoring.tracing import traced_class
+from app.schemas.patient import PatientCreate
 
+@traced_class
 class PatientUseCases:
-    def __init__(self, patient_repository: IPatientRepository, external_api_service: ExternalApiService = None):
+    def __init__(
+        self,
+        patient_repository: IPatientRepository,
+        external_api_service: Optional[ExternalApiService] = None,
+        import_limits: PipelineLimits = PipelineLimits(),
+        email_filter: Optional[EmailFilter] = None
+    ):
         self._patient_repository = patient_repository
-        self._external_api_service = external_api_service or ExternalApiService()
+        self._external_api_service = external_api_service
+        self._import_limits = import_limits
+        self._email_filter = email_filter
     
     async def create_patient(self, patient_data: Dict[str, Any]) -> Patient:
         patient = Patient(
@@ -19,8 +38,7 @@ class PatientUseCases:
         if not patient.is_valid_for_creation():
             raise ValueError("Invalid patient data")
         
-        existing_patient = await self._patient_repository.get_by_email(patient.email)
-        if existing_patient:
+        if await self._email_taken(patient.email):
             raise ValueError("Patient with this email already exists")
         
         return await self._patient_repository.create(patient)
@@ -36,10 +54,17 @@ class PatientUseCases:
     ) -> List[Patient]:
         return await self._patient_repository.get_patients(skip, limit, search)
     
+    async def lookup_patients(self, email: Optional[str] = None, phone: Optional[str] = None) -> List[Patient]:
+        if email is None and phone is None:
+            raise ValueError("Provide an email or a phone to look up")
+        return await self._patient_repository.find_by_contact(email=email, phone=phone)
+    
+    async def get_changes(self, since: int = 0, limit: int = 100) -> ChangeFeedPage:
+        return await self._patient_repository.get_changes(since, limit)
+    
     async def update_patient(self, patient_id: int, update_data: Dict[str, Any]) -> Optional[Patient]:
         if "email" in update_data:
-            existing_patient = await self._patient_repository.get_by_email(update_data["email"])
-            if existing_patient and existing_patient.id != patient_id:
+            if await self._email_taken(update_data["email"], exclude_id=patient_id):
                 raise ValueError("Patient with this email already exists")
         
         return await self._patient_repository.update(patient_id, update_data)
@@ -47,17 +72,95 @@ class PatientUseCases:
     async def delete_patient(self, patient_id: int) -> bool:
         return await self._patient_repository.delete(patient_id)
     
-    async def import_external_patients(self, count: int = 10) -> int:
-        external_patients = await self._external_api_service.fetch_patients(count)
-        imported_count = 0
+    async def import_external_patients(
+        self,
+        count: int = 10,
+        on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]] = None,
+        progress: Optional[ImportProgress] = None,
+        sync: bool = False
+    ) -> int:
+        """Import ``count`` external patients.
+        
+        By default records whose email is already known are skipped; with
+        ``sync`` changed records are updated in place, matched by source id.
+        """
+        if self._external_api_service is None:
+            raise ValueError("External API service is not configured")
+        
+        pipeline = ImportPipeline(
+            fetch_page=self._external_api_service.fetch_page,
+            normalize=self._to_new_patient,
+            write_batch=self._sync_batch if sync else self._patient_repository.create_many,
+            limits=self._import_limits,
+            on_progress=on_progress
+        )
+        progress = await pipeline.run(count, progress if progress is not None else ImportProgress())
+        
+        return progress.imported
+    
+    async def load_fhir_patients(
+        self,
+        stream: BinaryIO,
+        fhir_format: str = "auto",
+        on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]] = None,
+        progress: Optional[ImportProgress] = None
+    ) -> int:
+        loader = self._fhir_loader(on_progress)
+        progress = await loader.load(stream, fhir_format, progress if progress is not None else ImportProgress())
+        
+        return progress.imported
+    
+    async def load_fhir_files(
+        self,
+        paths: Iterable[Path],
+        fhir_format: str = "auto",
+        on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]] = None,
+        progress: Optional[ImportProgress] = None
+    ) -> int:
+        """Load many files through one pipeline, so batches span small files."""
+        reader = FhirFileReader(paths, fhir_format)
+        try:
+            progress = await self._fhir_loader(on_progress).load_resources(
+                reader, progress if progress is not None else ImportProgress()
+            )
+        finally:
+            reader.close()
         
-        for patient_data in external_patients:
-            try:
-                existing_patient = await self._patient_repository.get_by_email(patient_data["email"])
-                if not existing_patient:
-                    await self.create_patient(patient_data)
-                    imported_count += 1
-            except Exception:
-                continue
+        return progress.imported
+    
+    def _fhir_loader(self, on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]]) -> FhirBulkLoader:
+        return FhirBulkLoader(
+            write_batch=self._patient_repository.create_many,
+            batch_size=self._import_limits.batch_size,
+            workers=self._import_limits.transform_workers,
+            on_progress=on_progress
+        )
+    
+    async def _email_taken(self, email: str, exclude_id: Optional[int] = None) -> bool:
+        if self._email_filter is not None and not self._email_filter.might_contain(email):
+            return False
         
-        return imported_count
+        existing_patient = await self._patient_repository.get_by_email(email)
+        if existing_patient is None and self._email_filter is not None:
+            self._email_filter.record_false_positive()
+        return existing_patient is not None and existing_patient.id != exclude_id
+    
+    async def _sync_batch(self, patients: List[Patient]) -> SyncResult:
+        return await self._patient_repository.sync_many(ExternalApiService.SOURCE, patients)
+    
+    def _to_new_patient(self, user: Dict[str, Any]) -> Patient:
+        """Check a record against the same rules as ``POST /patients``, so a bad one fails on its own."""
+        try:
+            data = PatientCreate.model_validate(self._external_api_service.to_patient_data(user))
+        except ValidationError as e:
+            raise ValueError("; ".join(
+                f"{' -> '.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()
+            )) from None
+        return Patient(
+            id=None,
+            name=data.name,
+            email=data.email,
+            phone=data.phone,
+            source=ExternalApiService.SOURCE,
+            source_id=str(user["id"])
+        )
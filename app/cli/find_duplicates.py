@@ -0,0 +1,65 @@
+"""Find likely duplicate patients and record them as clusters.
+
+Usage:
+    python -m app.cli.find_duplicates [--threshold 0.85] [--max-block-size 500] [--batch-size 1000]
+
+Only patients not seen by an earlier run, or edited since, are processed, so
+the command can be re-run after every import. It exits with status 1 if
+another scan is already running.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+from app.application.use_cases.duplicate_use_cases import DuplicateDetectionUseCases
+from app.config import settings
+from app.database.connection import AsyncSessionLocal, advisory_lock, engine
+from app.domain.entities.duplicate import DuplicateScanResult
+from app.infrastructure.repositories.duplicate_repository import DuplicateRepository
+from app.models.duplicate import DUPLICATE_SCAN_LOCK_ID
+
+def report(result: DuplicateScanResult, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = result.processed / elapsed if elapsed else 0.0
+    print(
+        f"\rprocessed={result.processed} compared={result.compared} matched={result.matched} "
+        f"oversized_blocks={result.oversized_blocks} ({rate:,.0f}/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+async def find(threshold: float, max_block_size: int, batch_size: int) -> Optional[DuplicateScanResult]:
+    """Run a scan; returns ``None`` without scanning if another one holds the scan lock."""
+    started = time.monotonic()
+
+    async def on_progress(current: DuplicateScanResult) -> None:
+        report(current, started)
+
+    try:
+        async with advisory_lock(AsyncSessionLocal, DUPLICATE_SCAN_LOCK_ID) as acquired:
+            if not acquired:
+                print("Another duplicate scan is running", file=sys.stderr)
+                return None
+            async with AsyncSessionLocal() as db:
+                use_cases = DuplicateDetectionUseCases(DuplicateRepository(db), threshold, max_block_size, batch_size)
+                result = await use_cases.scan(on_progress=on_progress)
+    finally:
+        await engine.dispose()
+    report(result, started)
+    print(file=sys.stderr)
+    return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Detect duplicate patients with blocking and similarity scoring.")
+    parser.add_argument("--threshold", type=float, default=settings.duplicate_match_threshold)
+    parser.add_argument("--max-block-size", type=int, default=settings.duplicate_max_block_size)
+    parser.add_argument("--batch-size", type=int, default=settings.duplicate_scan_batch_size)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(find(args.threshold, args.max_block_size, args.batch_size))
+    return 0 if result is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Bulk-load Patient resources from Synthea FHIR output.
+
+Usage:
+    python -m app.cli.load_fhir output/fhir/ [more files or directories]
+        [--format auto|bundle|ndjson] [--batch-size 1000] [--workers N]
+
+Directories are expanded to the ``*.json`` and ``*.ndjson`` files they contain.
+All files go through one transform pool and one batch pipeline, so batches
+span files (Synthea writes one Bundle per patient).
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+from app.application.use_cases.import_pipeline import PipelineLimits
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.config import settings
+from app.database.connection import AsyncSessionLocal, engine
+from app.domain.entities.import_job import ImportProgress
+from app.infrastructure.fhir.bulk_loader import transform_pool
+from app.infrastructure.fhir.reader import FHIR_FORMATS
+from app.infrastructure.repositories.patient_repository import PatientRepository
+
+def iter_files(paths: List[str]) -> Iterator[Path]:
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            yield from sorted(p for p in path.iterdir() if p.suffix in (".json", ".ndjson"))
+        else:
+            yield path
+
+def report(progress: ImportProgress, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = progress.processed / elapsed if elapsed else 0.0
+    print(
+        f"\rprocessed={progress.processed} imported={progress.imported} "
+        f"skipped={progress.skipped} failed={progress.failed} ({rate:,.0f}/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+async def load(paths: List[str], fhir_format: str, batch_size: int, workers: int) -> ImportProgress:
+    limits = PipelineLimits(batch_size=batch_size, transform_workers=workers)
+    progress = ImportProgress()
+    started = time.monotonic()
+
+    async def on_progress(current: ImportProgress) -> None:
+        report(current, started)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            use_cases = PatientUseCases(PatientRepository(db), import_limits=limits)
+            await use_cases.load_fhir_files(iter_files(paths), fhir_format, on_progress=on_progress, progress=progress)
+    finally:
+        await transform_pool.shutdown()
+        await engine.dispose()
+    report(progress, started)
+    print(file=sys.stderr)
+    return progress
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load FHIR Patient resources from Bundles or NDJSON files.")
+    parser.add_argument("paths", nargs="+", help="FHIR files or directories of files")
+    parser.add_argument("--format", dest="fhir_format", choices=FHIR_FORMATS, default="auto")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    parser.add_argument("--workers", type=int, default=settings.fhir_transform_workers,
+                        help="transform processes (0 transforms inline; defaults to the CPU count)")
+    args = parser.parse_args(argv)
+
+    progress = asyncio.run(load(args.paths, args.fhir_format, args.batch_size, args.workers))
+    for error in progress.errors:
+        print(f"error: {error}", file=sys.stderr)
+    return 1 if progress.failed and not progress.imported else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Recompute the patient statistics rollups from the patients table.
+
+Usage:
+    python -m app.cli.rebuild_patient_stats
+
+The rollups are normally kept current by every repository write; rebuild
+after loads that bypass the repository (``seed_patients``) or to repair drift.
+Writers are paused on PostgreSQL while the rollups are recomputed.
+"""
+import asyncio
+import sys
+import time
+from typing import List, Optional
+from app.application.use_cases.patient_stats_use_cases import PatientStatsUseCases
+from app.database.connection import AsyncSessionLocal, engine
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository
+
+async def rebuild() -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            await PatientStatsUseCases(PatientStatsRepository(db)).rebuild()
+    finally:
+        await engine.dispose()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    started = time.monotonic()
+    asyncio.run(rebuild())
+    print(f"patient stats rebuilt in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Seed the database with a deterministic synthetic patient population.
+
+Usage:
+    python -m app.cli.seed_patients 10000000 [--seed 0] [--batch-size 50000] [--start N]
+
+Rows are tagged ``source='synthetic'`` and ``source_id=<row index>``. Without
+``--start`` the load resumes after the synthetic rows already present, so an
+interrupted run can simply be repeated. Run ``alembic upgrade head`` first.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.database.connection import engine as default_engine
+from app.infrastructure.synthetic.bulk_writer import PatientBulkWriter
+from app.infrastructure.synthetic.population import SyntheticPopulation
+
+def report(written: int, total: int, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = written / elapsed if elapsed else 0.0
+    print(f"\rwritten={written}/{total} ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+
+async def seed(
+    engine: AsyncEngine,
+    count: int,
+    seed: int = 0,
+    batch_size: int = 50_000,
+    start: Optional[int] = None,
+    quiet: bool = False,
+) -> int:
+    """Generate and write ``count`` patients; returns the number written.
+
+    The next batch is generated in a worker thread while the current one is
+    being written, so generation and I/O overlap.
+    """
+    population = SyntheticPopulation(seed)
+    started = time.monotonic()
+    written = 0
+    async with engine.connect() as connection:
+        writer = PatientBulkWriter(connection)
+        position = await writer.count_existing() if start is None else start
+        end = position + count
+        pending = None
+        if position < end:
+            pending = asyncio.create_task(asyncio.to_thread(population.generate, position, min(batch_size, end - position)))
+        while pending is not None:
+            columns = await pending
+            position += len(columns)
+            pending = None
+            if position < end:
+                pending = asyncio.create_task(asyncio.to_thread(population.generate, position, min(batch_size, end - position)))
+            written += await writer.write(columns)
+            if not quiet:
+                report(written, count, started)
+    if not quiet:
+        print(file=sys.stderr)
+    return written
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate and bulk-load synthetic patients.")
+    parser.add_argument("count", type=int, help="number of patients to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--start", type=int, default=None,
+                        help="first row index (defaults to the number of synthetic rows already loaded)")
+    args = parser.parse_args(argv)
+
+    async def run() -> int:
+        try:
+            return await seed(default_engine, args.count, args.seed, args.batch_size, args.start)
+        finally:
+            await default_engine.dispose()
+
+    written = asyncio.run(run())
+    print(f"seeded {written} patients", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
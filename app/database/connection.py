@@ -1,4 +1,8 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Tuple, TypeVar
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncTransaction
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -10,6 +14,69 @@ AsyncSessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+T = TypeVar("T")
+
+def get_session_factory() -> sessionmaker:
+    return AsyncSessionLocal
+
+async def complete_on_cancel(operation: Awaitable[T]) -> T:
+    """Await ``operation`` to the end even if the caller is cancelled meanwhile.
+
+    A query cancelled mid-flight can leave its pooled connection inside a
+    transaction (on SQLite, holding the database lock). Background readers
+    let the current query finish and re-raise the cancellation afterwards.
+    """
+    task = asyncio.ensure_future(operation)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+@asynccontextmanager
+async def savepoint_session(session_factory: sessionmaker) -> AsyncIterator[Tuple[AsyncSession, AsyncTransaction]]:
+    """A session joined to one outer transaction, its commits releasing savepoints.
+
+    Repositories commit and roll back as usual; the caller keeps or discards
+    all of it through the returned transaction, which is rolled back if left
+    open.
+    """
+    async with session_factory.kw["bind"].connect() as connection:
+        transaction = await connection.begin()
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN until the first write, which would make
+            # the first SAVEPOINT the outermost transaction.
+            await connection.exec_driver_sql("BEGIN")
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            yield session, transaction
+        finally:
+            await session.close()
+            if transaction.is_active:
+                await transaction.rollback()
+
+@asynccontextmanager
+async def advisory_lock(session_factory: sessionmaker, lock_id: int) -> AsyncIterator[bool]:
+    """Try to hold a PostgreSQL advisory lock for the duration of the block.
+
+    Yields whether the lock was taken; it is not waited for. The lock lives on
+    a connection of its own, since sessions hand theirs back to the pool on
+    every commit. Other databases always yield ``True``.
+    """
+    bind = session_factory.kw["bind"]
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+    async with bind.connect() as connection:
+        acquired = await connection.scalar(select(func.pg_try_advisory_lock(lock_id)))
+        await connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await connection.execute(select(func.pg_advisory_unlock(lock_id)))
+                await connection.commit()
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
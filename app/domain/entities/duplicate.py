@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import List
+from app.domain.entities.patient import Patient
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """A scored candidate pair, stored with ``patient_id < matched_patient_id``."""
+    patient_id: int
+    matched_patient_id: int
+    score: float
+
+@dataclass
+class DuplicateCluster:
+    """Patients believed to be the same person; ``cluster_id`` is the smallest member id."""
+    cluster_id: int
+    patients: List[Patient] = field(default_factory=list)
+    matches: List[DuplicateMatch] = field(default_factory=list)
+
+@dataclass
+class DuplicateScanResult:
+    processed: int = 0
+    compared: int = 0
+    matched: int = 0
+    oversized_blocks: int = 0
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+MAX_RECORDED_ERRORS = 20
+
+class ImportJobSource(str, Enum):
+    EXTERNAL_API = "external_api"
+    FHIR = "fhir"
+
+class ImportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+@dataclass
+class SyncResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+@dataclass
+class ImportProgress:
+    processed: int = 0
+    imported: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    
+    def record_error(self, message: str) -> None:
+        self.failed += 1
+        self.errors.append(message)
+        del self.errors[:-MAX_RECORDED_ERRORS]
+
+@dataclass
+class ImportJob:
+    id: Optional[int]
+    requested_count: Optional[int]
+    source: ImportJobSource = ImportJobSource.EXTERNAL_API
+    status: ImportJobStatus = ImportJobStatus.QUEUED
+    processed_count: int = 0
+    imported_count: int = 0
+    updated_count: int = 0
+    unchanged_count: int = 0
+    skipped_count: int = 0
+    failed_count: int = 0
+    errors: List[str] = field(default_factory=list)
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ImportJobStatus.COMPLETED, ImportJobStatus.FAILED)
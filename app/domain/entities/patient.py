@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
@@ -10,6 +11,9 @@ class Patient:
     phone: str
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    source: Optional[str] = None
+    source_id: Optional[str] = None
+    content_hash: Optional[str] = None
     
     def is_valid_for_creation(self) -> bool:
         return bool(
@@ -17,3 +21,8 @@ class Patient:
             self.email and 
             self.phone
         )
+    
+    def compute_content_hash(self) -> str:
+        """Fingerprint of the source-controlled fields, used to detect upstream changes."""
+        payload = "\x1f".join((self.name, self.email, self.phone))
+        return hashlib.sha256(payload.encode()).hexdigest()
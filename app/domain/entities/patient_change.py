@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from app.domain.entities.patient import Patient
+
+class ChangeOperation(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+@dataclass
+class PatientChange:
+    """One entry of the change feed; ``patient`` is the current row, absent for deletions."""
+    seq: int
+    patient_id: int
+    operation: ChangeOperation
+    changed_at: Optional[datetime] = None
+    patient: Optional[Patient] = None
+
+@dataclass
+class ChangeFeedPage:
+    """``next_cursor`` is the last seq read, which may belong to a change that was folded away."""
+    next_cursor: int
+    has_more: bool = False
+    changes: List[PatientChange] = field(default_factory=list)
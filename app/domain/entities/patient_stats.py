@@ -0,0 +1,9 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Tuple
+
+@dataclass
+class PatientStats:
+    active_patients: int = 0
+    created_per_day: List[Tuple[date, int]] = field(default_factory=list)
+    top_domains: List[Tuple[str, int]] = field(default_factory=list)
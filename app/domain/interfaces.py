@@ -1,13 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
 from app.domain.entities.patient import Patient
 from app.domain.entities.user import User
+from app.domain.entities.import_job import ImportJob, SyncResult
+from app.domain.entities.duplicate import DuplicateCluster, DuplicateMatch
+from app.domain.entities.patient_change import ChangeFeedPage
 
 class IPatientRepository(ABC):
     @abstractmethod
     async def create(self, patient: Patient) -> Patient:
         pass
     
+    @abstractmethod
+    async def create_many(self, patients: List[Patient]) -> int:
+        pass
+    
+    @abstractmethod
+    async def sync_many(self, source: str, patients: List[Patient]) -> SyncResult:
+        pass
+    
     @abstractmethod
     async def get_by_id(self, patient_id: int) -> Optional[Patient]:
         pass
@@ -16,6 +28,10 @@ class IPatientRepository(ABC):
     async def get_by_email(self, email: str) -> Optional[Patient]:
         pass
     
+    @abstractmethod
+    async def find_by_contact(self, email: Optional[str] = None, phone: Optional[str] = None, limit: int = 100) -> List[Patient]:
+        pass
+    
     @abstractmethod
     async def get_patients(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[Patient]:
         pass
@@ -27,6 +43,31 @@ class IPatientRepository(ABC):
     @abstractmethod
     async def delete(self, patient_id: int) -> bool:
         pass
+    
+    @abstractmethod
+    async def get_changes(self, since: int = 0, limit: int = 100) -> ChangeFeedPage:
+        pass
+    
+    @abstractmethod
+    async def last_change_seq(self) -> int:
+        pass
+
+class IPatientStatsRepository(ABC):
+    @abstractmethod
+    async def active_total(self) -> int:
+        pass
+    
+    @abstractmethod
+    async def created_per_day(self, since: date) -> Dict[date, int]:
+        pass
+    
+    @abstractmethod
+    async def top_domains(self, limit: int = 10) -> List[Tuple[str, int]]:
+        pass
+    
+    @abstractmethod
+    async def rebuild(self) -> None:
+        pass
 
 class IUserRepository(ABC):
     @abstractmethod
@@ -44,3 +85,62 @@ class IUserRepository(ABC):
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         pass
+
+class IImportJobRepository(ABC):
+    @abstractmethod
+    async def create(self, job: ImportJob) -> ImportJob:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, job_id: int) -> Optional[ImportJob]:
+        pass
+    
+    @abstractmethod
+    async def update(self, job_id: int, job_data: Dict[str, Any]) -> Optional[ImportJob]:
+        pass
+    
+    @abstractmethod
+    async def touch(self, job_ids: Iterable[int]) -> None:
+        pass
+    
+    @abstractmethod
+    async def fail_stale(self, heartbeat_before: datetime, error: str) -> int:
+        pass
+
+class IDuplicateRepository(ABC):
+    @abstractmethod
+    async def count_pending(self) -> int:
+        pass
+    
+    @abstractmethod
+    async def next_pending(self, after_id: int, limit: int) -> List[Patient]:
+        pass
+    
+    @abstractmethod
+    async def mark_stale(self, patient_ids: List[int]) -> None:
+        pass
+    
+    @abstractmethod
+    async def forget_matches(self, patient_ids: List[int]) -> None:
+        pass
+    
+    @abstractmethod
+    async def add_keys(self, keys: Iterable[Tuple[int, str]]) -> None:
+        pass
+    
+    @abstractmethod
+    async def find_block_members(self, keys: Set[str], max_block_size: int) -> Tuple[Dict[str, List[Patient]], int]:
+        pass
+    
+    @abstractmethod
+    async def record_matches(self, matches: List[DuplicateMatch]) -> None:
+        pass
+    
+    @abstractmethod
+    async def list_clusters(self, skip: int = 0, limit: int = 100) -> List[DuplicateCluster]:
+        pass
+
+class ISyntheaService(ABC):
+    @abstractmethod
+    async def fetch_patients(self, count: int = 10) -> List[Dict[str, Any]]:
+        pass
@@ -0,0 +1,22 @@
+import re
+
+DEFAULT_COUNTRY_CODE = "1"
+NATIONAL_NUMBER_DIGITS = 10
+
+_NON_DIGIT = re.compile(r"\D")
+
+def normalize_email(email: str) -> str:
+    """Case-folded email used for uniqueness and lookups."""
+    return email.strip().lower()
+
+def normalize_phone(phone: str, default_country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """E.164-style ``+<digits>`` form of a phone number.
+
+    Formatting is dropped, and a bare national number (ten digits) gets the
+    default country code, so ``(555) 123-4567`` and ``+1 555.123.4567``
+    normalize alike. Longer numbers are assumed to carry their country code.
+    """
+    digits = _NON_DIGIT.sub("", phone)
+    if len(digits) == NATIONAL_NUMBER_DIGITS:
+        digits = default_country_code + digits
+    return "+" + digits
@@ -0,0 +1,136 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Set
+from app.domain.entities.patient import Patient
+
+NAME_WEIGHT = 0.6
+PHONE_WEIGHT = 0.3
+EMAIL_WEIGHT = 0.1
+PHONE_KEY_DIGITS = 10
+MIN_PHONE_KEY_DIGITS = 7
+
+_TITLES = frozenset({"mr", "mrs", "ms", "miss", "dr", "prof", "jr", "sr"})
+_NON_DIGIT = re.compile(r"\D")
+_TOKEN = re.compile(r"[a-z]+")
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+def name_tokens(name: str) -> List[str]:
+    """Lower-case ASCII name tokens without titles; accents are folded."""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return [token for token in _TOKEN.findall(folded.replace("'", "")) if token not in _TITLES]
+
+def phone_digits(phone: str) -> str:
+    """The last ten digits of a phone number, which drops country prefixes."""
+    return _NON_DIGIT.sub("", phone)[-PHONE_KEY_DIGITS:]
+
+def soundex(token: str) -> str:
+    if not token:
+        return ""
+    code = [token[0].upper()]
+    previous = _SOUNDEX_CODES.get(token[0], "")
+    for char in token[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code.append(digit)
+        if char not in "hw":
+            previous = digit
+    return ("".join(code) + "000")[:4]
+
+def blocking_keys(patient: Patient) -> Set[str]:
+    """Keys under which a patient is compared with others.
+
+    Two patients are only scored against each other when they share a key:
+    the same first/last name tokens (in either order), the same Soundex codes
+    for those tokens, or the same phone digits. Every patient gets at least
+    one key.
+    """
+    tokens = name_tokens(patient.name)
+    keys = set()
+    if tokens:
+        outer = sorted({tokens[0], tokens[-1]})
+        keys.add("n:" + ":".join(outer))
+        keys.add("s:" + ":".join(sorted({soundex(token) for token in outer})))
+    else:
+        keys.add("n:")
+    digits = phone_digits(patient.phone)
+    if len(digits) >= MIN_PHONE_KEY_DIGITS:
+        keys.add("p:" + digits)
+    return keys
+
+def jaro_winkler(left: str, right: str, prefix_scale: float = 0.1) -> float:
+    if left == right:
+        return 1.0
+    if not left or not right:
+        return 0.0
+    window = max(0, max(len(left), len(right)) // 2 - 1)
+    left_matched = [False] * len(left)
+    right_matched = [False] * len(right)
+    matches = 0
+    for i, char in enumerate(left):
+        for j in range(max(0, i - window), min(len(right), i + window + 1)):
+            if not right_matched[j] and right[j] == char:
+                left_matched[i] = right_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+
+    transpositions = 0
+    j = 0
+    for i, char in enumerate(left):
+        if left_matched[i]:
+            while not right_matched[j]:
+                j += 1
+            if char != right[j]:
+                transpositions += 1
+            j += 1
+    jaro = (matches / len(left) + matches / len(right) + (matches - transpositions / 2) / matches) / 3
+
+    prefix = 0
+    for a, b in zip(left[:4], right[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+@dataclass(frozen=True)
+class MatchProfile:
+    """The normalized fields ``match_score`` compares, computed once per patient."""
+    name: str
+    phone: str
+    email: str
+
+    @classmethod
+    def of(cls, patient: Patient) -> "MatchProfile":
+        return cls(
+            name=" ".join(sorted(name_tokens(patient.name))),
+            phone=phone_digits(patient.phone),
+            email=(patient.email or "").split("@", 1)[0].lower(),
+        )
+
+def profile_score(left: MatchProfile, right: MatchProfile, minimum: float = 0.0) -> float:
+    """Weighted similarity in [0, 1] of name, phone and email local part.
+
+    Names are compared with their tokens sorted so "Smith John" matches
+    "John Smith"; phones only count when their digits are identical. Once
+    the score provably cannot reach ``minimum`` the remaining comparisons are
+    skipped and a value below ``minimum`` is returned.
+    """
+    phone = PHONE_WEIGHT if left.phone and left.phone == right.phone else 0.0
+    if phone + NAME_WEIGHT + EMAIL_WEIGHT < minimum:
+        return phone
+    score = phone + NAME_WEIGHT * jaro_winkler(left.name, right.name)
+    if score + EMAIL_WEIGHT < minimum:
+        return score
+    return score + EMAIL_WEIGHT * jaro_winkler(left.email, right.email)
+
+def match_score(left: Patient, right: Patient) -> float:
+    return profile_score(MatchProfile.of(left), MatchProfile.of(right))
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from typing import Callable, Optional, Set, Tuple, Union
+from prometheus_client import Gauge
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import complete_on_cancel
+from app.domain.entities.patient_change import ChangeFeedPage, PatientChange
+from app.domain.interfaces import IPatientRepository
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "patient_changes"
+FETCH_BATCH_SIZE = 1000
+RECONNECT_DELAY = 5.0
+
+PATIENT_STREAM_SUBSCRIBERS = Gauge(
+    "patient_stream_subscribers",
+    "Open patient change stream subscriptions",
+    multiprocess_mode="livesum",
+)
+
+HEARTBEAT = object()
+CLOSED = object()
+
+Event = Tuple[int, bytes]
+
+class Subscription:
+    """A subscriber's queue; ``position`` is the last seq delivered to the hub before it joined."""
+
+    __slots__ = ("queue", "position")
+
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[Union[Event, object]]" = asyncio.Queue(queue_size)
+        self.position = 0
+
+class PatientEventHub:
+    """Per-worker fan-out of the patient change log to stream subscribers.
+
+    Writers only signal that the log moved: through ``NOTIFY`` on PostgreSQL,
+    which reaches every worker over one shared listener connection, or
+    in-process through ``changed()`` elsewhere. On a signal the hub reads the
+    new entries once, encodes each once and puts the bytes on every
+    subscriber's queue, so idle subscribers hold a queue and nothing else.
+    Heartbeats come from a single timer. A subscriber that falls
+    ``queue_size`` events behind is closed and resumes with ``Last-Event-ID``.
+    """
+
+    def __init__(self):
+        self.queue_size = 1000
+        self._subscribers: Set[Subscription] = set()
+        self._signal: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._last_seq: Optional[int] = None
+        self._listening = False
+        self._session_factory: Optional[sessionmaker] = None
+        self._repository_factory: Optional[Callable[[AsyncSession], IPatientRepository]] = None
+        self._encode: Optional[Callable[[PatientChange], bytes]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._session_factory is not None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def changed(self) -> None:
+        """Called after a local commit; with a live listener ``NOTIFY`` covers it."""
+        if self._signal is not None and not self._listening:
+            self._signal.set()
+
+    async def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        PATIENT_STREAM_SUBSCRIBERS.inc()
+        try:
+            async with self._lock:
+                if self._last_seq is None:
+                    async with self._session_factory() as db:
+                        self._last_seq = await self._repository_factory(db).last_change_seq()
+                subscription.position = self._last_seq
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            PATIENT_STREAM_SUBSCRIBERS.dec()
+
+    def encode(self, change: PatientChange) -> bytes:
+        return self._encode(change)
+
+    async def run(
+        self,
+        session_factory: sessionmaker,
+        repository_factory: Callable[[AsyncSession], IPatientRepository],
+        encode: Callable[[PatientChange], bytes],
+        heartbeat_interval: float,
+    ) -> None:
+        # Created here so they belong to the loop the hub runs on.
+        self._signal = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._session_factory = session_factory
+        self._repository_factory = repository_factory
+        self._encode = encode
+        tasks = [asyncio.create_task(self._pump()), asyncio.create_task(self._heartbeat(heartbeat_interval))]
+        engine = session_factory.kw["bind"]
+        if engine.dialect.name == "postgresql":
+            tasks.append(asyncio.create_task(self._listen(engine)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._session_factory = None
+            self._signal = None
+            self._last_seq = None
+            for subscription in list(self._subscribers):
+                self._close(subscription)
+
+    async def _pump(self) -> None:
+        while True:
+            await self._signal.wait()
+            self._signal.clear()
+            try:
+                await self._deliver()
+            except Exception:
+                logger.exception("Patient change delivery failed")
+                await asyncio.sleep(1.0)
+                self._signal.set()
+
+    async def _deliver(self) -> None:
+        async with self._lock:
+            if not self._subscribers:
+                # Nobody to deliver to; the next subscriber re-reads the position.
+                self._last_seq = None
+                return
+            while True:
+                page = await complete_on_cancel(self._read_changes(self._last_seq))
+                for change in page.changes:
+                    self._broadcast((change.seq, self._encode(change)))
+                self._last_seq = page.next_cursor
+                if not page.has_more:
+                    return
+
+    async def _read_changes(self, since: int) -> ChangeFeedPage:
+        async with self._session_factory() as db:
+            return await self._repository_factory(db).get_changes(since, FETCH_BATCH_SIZE)
+
+    def _broadcast(self, event: Event) -> None:
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Closing lagging patient stream subscriber", extra={"position": subscription.position})
+                self._close(subscription)
+
+    def _close(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(CLOSED)
+
+    async def _heartbeat(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for subscription in list(self._subscribers):
+                if subscription.queue.empty():
+                    subscription.queue.put_nowait(HEARTBEAT)
+
+    async def _listen(self, engine) -> None:
+        """Hold one pooled connection on ``LISTEN``, reconnecting when it drops."""
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw = await connection.get_raw_connection()
+                    driver = raw.driver_connection
+                    lost = asyncio.Event()
+                    driver.add_termination_listener(lambda _: lost.set())
+                    await driver.add_listener(CHANNEL, self._on_notify)
+                    self._listening = True
+                    # Catch up on anything committed while nobody was listening.
+                    self._signal.set()
+                    try:
+                        await lost.wait()
+                    finally:
+                        self._listening = False
+                        if not driver.is_closed():
+                            await driver.remove_listener(CHANNEL, self._on_notify)
+            except Exception:
+                logger.exception("Patient change listener failed")
+            self._signal.set()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self._signal.set()
+
+patient_events = PatientEventHub()
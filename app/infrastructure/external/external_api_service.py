@@ -1,36 +1,45 @@
 import httpx
-import re
 from typing import List, Dict, Any
+from app.infrastructure.external.http_cache import cached_json
+from app.infrastructure.external.normalization import clean_name, clean_phone
+from app.infrastructure.monitoring.metrics import track_external_call
+from app.infrastructure.monitoring.tracing import traced_class
 
+@traced_class
 class ExternalApiService:
-    def __init__(self):
+    SOURCE = "jsonplaceholder"
+    
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
         self._base_url = "https://jsonplaceholder.typicode.com"
-        self._timeout = httpx.Timeout(30.0)
 
     async def fetch_patients(self, count: int = 10) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(f"{self._base_url}/users")
+        with track_external_call("jsonplaceholder"):
+            response = await self._client.get(f"{self._base_url}/users")
+            response.raise_for_status()
+        users = cached_json(response)[:count]
+        
+        return [self.to_patient_data(user) for user in users]
+    
+    async def fetch_page(self, page: int, page_size: int) -> List[Dict[str, Any]]:
+        """Fetch one page of raw users; a short page means the source is exhausted."""
+        with track_external_call("jsonplaceholder"):
+            response = await self._client.get(
+                f"{self._base_url}/users",
+                params={"_page": page, "_limit": page_size}
+            )
             response.raise_for_status()
-            users = response.json()[:count]
-            
-            return [
-                {
-                    "name": self._clean_name(user["name"]),
-                    "email": user["email"],
-                    "phone": self._clean_phone(user["phone"])
-                }
-                for user in users
-            ]
+        return cached_json(response)
+    
+    def to_patient_data(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": self._clean_name(user["name"]),
+            "email": user["email"],
+            "phone": self._clean_phone(user["phone"])
+        }
     
     def _clean_name(self, name: str) -> str:
-        """Clean name to match validation requirements: only letters, spaces, hyphens, apostrophes"""
-        name = re.sub(r'\b(Mr|Mrs|Ms|Dr|Prof)\.?\s*', '', name)
-        name = re.sub(r'\s+[A-Z]\.?$', '', name)
-        name = re.sub(r'[^a-zA-Z\s\'-]', '', name)
-        name = re.sub(r'\s+', ' ', name).strip()
-        return name
+        return clean_name(name)
     
     def _clean_phone(self, phone: str) -> str:
-        """Extract main phone number without extensions"""
-        phone = re.sub(r'\s*x\d+.*$', '', phone)
-        return phone.split()[0] if phone else phone
+        return clean_phone(phone)
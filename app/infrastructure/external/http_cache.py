@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from prometheus_client import Counter
+
+HTTP_CACHE_REQUESTS = Counter(
+    "external_http_cache_requests_total",
+    "External GET requests by cache outcome",
+    ["result"],
+)
+
+STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+MAX_PARSED_ENTRIES = 32
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    stored_at: float
+    body: bytes
+
+class DiskCache:
+    """Bounded response store on the local filesystem.
+
+    One file per URL (header line of JSON metadata, then the body), written
+    atomically with ``os.replace`` so every worker can share the directory.
+    When the store grows past ``max_bytes`` the least recently used files are
+    removed; reads refresh a file's mtime.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / hashlib.sha256(url.encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        path = self._path(url)
+        try:
+            with open(path, "rb") as file:
+                metadata = json.loads(file.readline())
+                body = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if metadata.get("url") != url:
+            return None
+        return CachedResponse(url, metadata["status_code"], metadata["headers"], metadata["stored_at"], body)
+
+    def set(self, entry: CachedResponse) -> None:
+        path = self._path(entry.url)
+        metadata = {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+        }
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(json.dumps(metadata).encode() + b"\n")
+            file.write(entry.body)
+        os.replace(tmp_path, path)
+        self._evict(keep=path)
+
+    def _evict(self, keep: Path) -> None:
+        files = []
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """HTTP cache for idempotent GETs made through the shared client.
+
+    Fresh entries (younger than ``ttl`` seconds) are served without touching
+    the network. Stale entries are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` so an unchanged resource costs a 304, and are served
+    as-is when the upstream cannot be reached.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: DiskCache, ttl: float):
+        self._transport = transport
+        self._cache = cache
+        self._ttl = ttl
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        url = str(request.url)
+        entry = await asyncio.to_thread(self._cache.get, url)
+        if entry is not None and time.time() - entry.stored_at < self._ttl:
+            HTTP_CACHE_REQUESTS.labels("hit").inc()
+            return self._from_cache(entry, "hit")
+
+        if entry is not None:
+            if "etag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["last-modified"]
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            if entry is None:
+                raise
+            HTTP_CACHE_REQUESTS.labels("stale").inc()
+            return self._from_cache(entry, "stale")
+
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            entry.stored_at = time.time()
+            await asyncio.to_thread(self._cache.set, entry)
+            HTTP_CACHE_REQUESTS.labels("revalidated").inc()
+            return self._from_cache(entry, "revalidated")
+
+        if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+            HTTP_CACHE_REQUESTS.labels("bypass").inc()
+            return response
+
+        body = await response.aread()
+        await response.aclose()
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        entry = CachedResponse(url, response.status_code, headers, time.time(), body)
+        await asyncio.to_thread(self._cache.set, entry)
+        HTTP_CACHE_REQUESTS.labels("miss").inc()
+        return self._from_cache(entry, "miss")
+
+    @staticmethod
+    def _from_cache(entry: CachedResponse, status: str) -> httpx.Response:
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.body,
+            extensions={"cache_status": status},
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+_parsed_bodies: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+def cached_json(response: httpx.Response) -> Any:
+    """Parse a JSON body once per (URL, ETag) and reuse it on 304s and hits.
+
+    Callers must treat the returned value as read-only.
+    """
+    etag = response.headers.get("etag")
+    if etag is None:
+        return response.json()
+
+    key = (str(response.request.url), etag)
+    if key in _parsed_bodies:
+        _parsed_bodies.move_to_end(key)
+        return _parsed_bodies[key]
+
+    parsed = response.json()
+    _parsed_bodies[key] = parsed
+    if len(_parsed_bodies) > MAX_PARSED_ENTRIES:
+        _parsed_bodies.popitem(last=False)
+    return parsed
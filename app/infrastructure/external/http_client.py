@@ -0,0 +1,48 @@
+import httpx
+from app.config import settings
+from app.infrastructure.external.http_cache import CachingTransport, DiskCache
+from app.infrastructure.external.resilience import ResilientTransport, circuit_breakers
+from app.infrastructure.monitoring.tracing import TracingTransport
+
+USER_AGENT = "nuvie-backend/2.0.0"
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the application-wide client for external data sources.
+
+    One client is created per worker by the FastAPI lifespan and shared by
+    every service, so connections, DNS results and TLS sessions are reused
+    across requests instead of being set up on each call.
+
+    Transports are layered outermost first: cache, resilience (retries,
+    circuit breaker, hedging), tracing, connection pool, so every attempt gets
+    its own span and cache hits never touch the breaker.
+    """
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        http2=settings.http2_enabled,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+    )
+    transport = TracingTransport(transport)
+    circuit_breakers.configure(settings.circuit_failure_threshold, settings.circuit_recovery_timeout)
+    transport = ResilientTransport(
+        transport,
+        circuit_breakers,
+        max_attempts=settings.http_retry_attempts,
+        base_delay=settings.http_retry_base_delay,
+        max_delay=settings.http_retry_max_delay,
+        attempt_timeout=settings.http_attempt_timeout,
+        hedging=settings.http_hedging_enabled,
+        hedge_min_delay=settings.http_hedge_min_delay,
+    )
+    if settings.http_cache_enabled:
+        cache = DiskCache(settings.http_cache_dir, settings.http_cache_max_mb * 2**20)
+        transport = CachingTransport(transport, cache, settings.http_cache_ttl)
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        headers={"User-Agent": USER_AGENT},
+    )
@@ -0,0 +1,19 @@
+import re
+
+_TITLE = re.compile(r'\b(Mr|Mrs|Ms|Dr|Prof)\.?\s*')
+_TRAILING_INITIAL = re.compile(r'\s+[A-Z]\.?$')
+_NAME_INVALID = re.compile(r'[^a-zA-Z\s\'-]')
+_WHITESPACE = re.compile(r'\s+')
+_PHONE_EXTENSION = re.compile(r'\s*x\d+.*$')
+
+def clean_name(name: str) -> str:
+    """Clean name to match validation requirements: only letters, spaces, hyphens, apostrophes"""
+    name = _TITLE.sub('', name)
+    name = _TRAILING_INITIAL.sub('', name)
+    name = _NAME_INVALID.sub('', name)
+    return _WHITESPACE.sub(' ', name).strip()
+
+def clean_phone(phone: str) -> str:
+    """Extract main phone number without extensions"""
+    phone = _PHONE_EXTENSION.sub('', phone)
+    return phone.split()[0] if phone else phone
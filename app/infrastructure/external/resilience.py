@@ -0,0 +1,323 @@
+import asyncio
+import random
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+import httpx
+from prometheus_client import Counter, Gauge
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+EXTERNAL_HTTP_RETRIES = Counter(
+    "external_http_retries_total",
+    "Retried external HTTP attempts",
+    ["host", "reason"],
+)
+EXTERNAL_CIRCUIT_STATE = Gauge(
+    "external_circuit_state",
+    "Circuit breaker state per host (0 closed, 1 half-open, 2 open)",
+    ["host"],
+    multiprocess_mode="liveall",
+)
+EXTERNAL_CIRCUIT_REJECTIONS = Counter(
+    "external_circuit_rejections_total",
+    "External requests failed fast by an open circuit",
+    ["host"],
+)
+EXTERNAL_HEDGED_REQUESTS = Counter(
+    "external_hedged_requests_total",
+    "Hedged external requests by which attempt answered first",
+    ["host", "winner"],
+)
+
+class CircuitOpenError(httpx.TransportError):
+    pass
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one upstream host.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast. Once ``recovery_timeout`` has passed a single probe is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._publish()
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.OPEN:
+            return False
+        now = self._clock()
+        # A probe whose outcome was never recorded (e.g. cancelled) expires.
+        if self._probe_started is None or now - self._probe_started >= self.recovery_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probe_started = None
+        self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_started = None
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self._set_state(CircuitState.OPEN)
+
+    def record_latency(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def latency_quantile(self, quantile: float) -> Optional[float]:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * quantile))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        p95 = self.latency_quantile(0.95)
+        return {
+            "host": self.name,
+            "state": state.value,
+            "consecutive_failures": self._failures,
+            "retry_in_seconds": (
+                round(max(0.0, self.recovery_timeout - (self._clock() - self._opened_at)), 3)
+                if state is CircuitState.OPEN else None
+            ),
+            "latency_p95_ms": round(p95 * 1000, 3) if p95 is not None else None,
+        }
+
+    def _set_state(self, state: CircuitState) -> None:
+        self._state = state
+        self._publish()
+
+    def _publish(self) -> None:
+        EXTERNAL_CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[self._state])
+
+class CircuitBreakerRegistry:
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._clock = clock
+        self.configure(failure_threshold, recovery_timeout)
+
+    def configure(self, failure_threshold: int, recovery_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        for breaker in self._breakers.values():
+            breaker.failure_threshold = failure_threshold
+            breaker.recovery_timeout = recovery_timeout
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.failure_threshold, self.recovery_timeout, self._clock)
+            self._breakers[host] = breaker
+        return breaker
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [breaker.snapshot() for _, breaker in sorted(self._breakers.items())]
+
+circuit_breakers = CircuitBreakerRegistry()
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Retries, per-host circuit breaking and optional hedging for outbound calls.
+
+    Idempotent requests are retried on transport errors and 429/502/503/504
+    with full-jitter exponential backoff. With hedging on, a second attempt is
+    started when the first has not answered within the host's recent p95
+    latency, and the first usable answer wins: a retryable status only wins
+    once no other attempt is left. Every attempt sends its own copy of the
+    request, since the transports below it mutate requests.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        breakers: CircuitBreakerRegistry = circuit_breakers,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        attempt_timeout: Optional[float] = None,
+        hedging: bool = False,
+        hedge_min_delay: float = 0.05,
+    ):
+        self._transport = transport
+        self._breakers = breakers
+        self._max_attempts = max(1, max_attempts)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._attempt_timeout = attempt_timeout
+        self._hedging = hedging
+        self._hedge_min_delay = hedge_min_delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        breaker = self._breakers.get(host)
+        if self._attempt_timeout is not None:
+            timeout = dict(request.extensions.get("timeout", {}))
+            timeout["read"] = min(timeout.get("read") or self._attempt_timeout, self._attempt_timeout)
+            request.extensions = {**request.extensions, "timeout": timeout}
+
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempts = self._max_attempts if idempotent else 1
+        if attempts > 1 or (idempotent and self._hedging):
+            await request.aread()
+        template = self._copy(request)
+        for attempt in range(1, attempts + 1):
+            if not breaker.allow_request():
+                EXTERNAL_CIRCUIT_REJECTIONS.labels(host).inc()
+                raise CircuitOpenError(f"Circuit open for {host}", request=request)
+
+            try:
+                response = await self._attempt(
+                    request if attempt == 1 else self._copy(template),
+                    breaker,
+                    hedge=idempotent and self._hedging,
+                    template=template
+                )
+            except httpx.TransportError as exc:
+                breaker.record_failure()
+                if attempt == attempts:
+                    raise
+                reason = type(exc).__name__
+                retry_after = None
+            else:
+                if response.status_code < 500 and response.status_code != 429:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt == attempts or response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                reason = str(response.status_code)
+                retry_after = self._retry_after(response)
+                await response.aclose()
+
+            EXTERNAL_HTTP_RETRIES.labels(host, reason).inc()
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        raise AssertionError("unreachable")
+
+    async def _attempt(self, request: httpx.Request, breaker: CircuitBreaker, hedge: bool, template: httpx.Request) -> httpx.Response:
+        hedge_delay = self._hedge_delay(breaker) if hedge else None
+        started = time.monotonic()
+        if hedge_delay is None:
+            response = await self._transport.handle_async_request(request)
+            breaker.record_latency(time.monotonic() - started)
+            return response
+
+        primary = asyncio.create_task(self._transport.handle_async_request(request))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            response = primary.result()
+            breaker.record_latency(time.monotonic() - started)
+            return response
+
+        hedged = asyncio.create_task(self._transport.handle_async_request(self._copy(template)))
+        names = {primary: "primary", hedged: "hedge"}
+        pending = {primary, hedged}
+        error: Optional[BaseException] = None
+        winner: Optional["asyncio.Task[httpx.Response]"] = None
+        # The latest retryable answer, returned only if no attempt does better.
+        fallback: Optional["asyncio.Task[httpx.Response]"] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif winner is not None:
+                        await task.result().aclose()
+                    elif task.result().status_code not in RETRYABLE_STATUS_CODES:
+                        winner = task
+                    else:
+                        if fallback is not None:
+                            await fallback.result().aclose()
+                        fallback = task
+            if winner is None and fallback is None:
+                raise error
+            if winner is None:
+                winner = fallback
+            elif fallback is not None:
+                await fallback.result().aclose()
+            EXTERNAL_HEDGED_REQUESTS.labels(breaker.name, names[winner]).inc()
+            breaker.record_latency(time.monotonic() - started)
+            return winner.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _copy(request: httpx.Request) -> httpx.Request:
+        """A fresh request with the same method, URL, headers, body and extensions.
+
+        Only for requests whose body has been read; a streaming body cannot be
+        sent twice, which is why only idempotent requests are ever repeated.
+        """
+        try:
+            content = request.content
+        except httpx.RequestNotRead:
+            return request
+        return httpx.Request(
+            request.method,
+            request.url,
+            headers=request.headers.copy(),
+            content=content,
+            extensions=dict(request.extensions)
+        )
+
+    def _hedge_delay(self, breaker: CircuitBreaker) -> Optional[float]:
+        p95 = breaker.latency_quantile(0.95)
+        return None if p95 is None else max(p95, self._hedge_min_delay)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._max_delay))
+        return delay
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers["retry-after"])
+        except (KeyError, ValueError):
+            return None
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
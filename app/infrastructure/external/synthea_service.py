@@ -1,36 +1,37 @@
 import httpx
-import asyncio
 from typing import List, Dict, Any
-from datetime import datetime, date
+from datetime import datetime
 from app.domain.entities.patient import Patient
 from app.domain.interfaces import ISyntheaService
 from app.config import settings
+from app.infrastructure.fhir.mapping import patient_from_fhir
+from app.infrastructure.monitoring.metrics import track_external_call
 import random
 
 class SyntheaService(ISyntheaService):
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
         self._base_url = "https://jsonplaceholder.typicode.com"
-        self._timeout = 30
     
     async def fetch_patients(self, count: int = 10) -> List[Dict[str, Any]]:
         """Fetch real data from JSONPlaceholder API and transform to patient-like data"""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            try:
-                response = await client.get(f"{self._base_url}/users")
+        try:
+            with track_external_call("synthea"):
+                response = await self._client.get(f"{self._base_url}/users")
                 response.raise_for_status()
-                users_data = response.json()
-                
-                transformed_patients = []
-                for i, user in enumerate(users_data[:count]):
-                    patient_data = await self._transform_user_to_patient(user, i)
-                    transformed_patients.append(patient_data)
-                
-                return transformed_patients
-                
-            except httpx.HTTPError as e:
-                raise Exception(f"Failed to fetch data from external API: {str(e)}")
-            except Exception as e:
-                raise Exception(f"Error processing external data: {str(e)}")
+            users_data = response.json()
+            
+            transformed_patients = []
+            for i, user in enumerate(users_data[:count]):
+                patient_data = await self._transform_user_to_patient(user, i)
+                transformed_patients.append(patient_data)
+            
+            return transformed_patients
+            
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to fetch data from external API: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error processing external data: {str(e)}")
     
     async def _transform_user_to_patient(self, user_data: Dict[str, Any], index: int) -> Dict[str, Any]:
         """Transform JSONPlaceholder user data to patient format"""
@@ -94,60 +95,5 @@ class SyntheaService(ISyntheaService):
             ]
         }
 
-    async def transform_fhir_to_patient(self, fhir_data: Dict[str, Any]) -> Patient:
-        names = fhir_data.get("name", [{}])[0]
-        first_name = " ".join(names.get("given", []))
-        last_name = names.get("family", "")
-        
-        birth_date_str = fhir_data.get("birthDate", "")
-        birth_date = datetime.strptime(birth_date_str, "%Y-%m-%d").date() if birth_date_str else date.today()
-        
-        address = fhir_data.get("address", [{}])[0] if fhir_data.get("address") else {}
-        address_line = " ".join(address.get("line", [])) if address.get("line") else None
-        
-        telecoms = fhir_data.get("telecom", [])
-        phone = None
-        email = None
-        
-        for telecom in telecoms:
-            if telecom.get("system") == "phone":
-                phone = telecom.get("value")
-            elif telecom.get("system") == "email":
-                email = telecom.get("value")
-        
-        extensions = fhir_data.get("extension", [])
-        race = None
-        ethnicity = None
-        
-        for ext in extensions:
-            if "us-core-race" in ext.get("url", ""):
-                race_coding = ext.get("valueCodeableConcept", {}).get("coding", [{}])[0]
-                race = race_coding.get("display")
-            elif "us-core-ethnicity" in ext.get("url", ""):
-                ethnicity_coding = ext.get("valueCodeableConcept", {}).get("coding", [{}])[0]
-                ethnicity = ethnicity_coding.get("display")
-        
-        identifiers = fhir_data.get("identifier", [])
-        ssn = None
-        
-        for identifier in identifiers:
-            if identifier.get("type", {}).get("coding", [{}])[0].get("code") == "SS":
-                ssn = identifier.get("value")
-        
-        return Patient(
-            id=None,
-            first_name=first_name,
-            last_name=last_name,
-            date_of_birth=birth_date,
-            gender=fhir_data.get("gender", "unknown"),
-            ssn=ssn,
-            address=address_line,
-            city=address.get("city"),
-            state=address.get("state"),
-            zip_code=address.get("postalCode"),
-            phone=phone,
-            email=email,
-            synthea_id=fhir_data.get("id"),
-            race=race,
-            ethnicity=ethnicity
-        )
+    def transform_fhir_to_patient(self, fhir_data: Dict[str, Any]) -> Patient:
+        return patient_from_fhir(fhir_data)
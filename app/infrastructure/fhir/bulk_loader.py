@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, BinaryIO, Callable, List, Optional, Protocol, Set, Tuple
+from app.domain.entities.import_job import ImportProgress
+from app.domain.entities.patient import Patient
+from app.infrastructure.fhir.mapping import transform_batch
+from app.infrastructure.fhir.reader import FhirResourceReader, ResourceItem
+
+TransformResult = Tuple[List[Patient], List[str]]
+
+class ResourceReader(Protocol):
+    def next_batch(self, size: int) -> List[ResourceItem]: ...
+
+class TransformPool:
+    """The process pool shared by every FHIR load in this process.
+
+    Spawning interpreters costs far more than a small load, so the pool is
+    created on first use, sized by that caller, and kept until ``shutdown``.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def get(self, workers: int) -> Optional[ProcessPoolExecutor]:
+        if workers == 0:
+            return None
+        # A worker killed mid-task breaks the whole executor; start a new one.
+        if self._pool is None or getattr(self._pool, "_broken", False):
+            # spawn, not fork: the parent runs an event loop and logging threads
+            self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+class FhirBulkLoader:
+    """Load Patient resources from a FHIR Bundle or NDJSON stream in batches.
+
+    Parsing runs in a thread, the FHIR-to-patient transform is fanned out to
+    the shared process pool (``workers=0`` transforms inline), and at most two
+    batches per worker are in flight so memory stays bounded on large files.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Patient]], Awaitable[int]],
+        batch_size: int = 1000,
+        workers: Optional[int] = None,
+        on_progress: Optional[Callable[[ImportProgress], Awaitable[None]]] = None
+    ):
+        self._write_batch = write_batch
+        self._batch_size = batch_size
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._on_progress = on_progress
+
+    async def load(self, stream: BinaryIO, fhir_format: str = "auto", progress: Optional[ImportProgress] = None) -> ImportProgress:
+        return await self.load_resources(FhirResourceReader(stream, fhir_format), progress)
+
+    async def load_resources(self, reader: ResourceReader, progress: Optional[ImportProgress] = None) -> ImportProgress:
+        progress = progress if progress is not None else ImportProgress()
+        pool = transform_pool.get(self._workers)
+        pending: Set["asyncio.Future[TransformResult]"] = set()
+        max_in_flight = max(1, self._workers) * 2
+        try:
+            while batch := await asyncio.to_thread(reader.next_batch, self._batch_size):
+                pending.add(self._transform(pool, batch))
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        await self._write(future.result(), progress)
+            for future in asyncio.as_completed(pending):
+                await self._write(await future, progress)
+        finally:
+            for future in pending:
+                future.cancel()
+        return progress
+
+    def _transform(self, pool: Optional[ProcessPoolExecutor], batch: list) -> "asyncio.Future[TransformResult]":
+        loop = asyncio.get_running_loop()
+        if pool is None:
+            future = loop.create_future()
+            future.set_result(transform_batch(batch))
+            return future
+        return loop.run_in_executor(pool, transform_batch, batch)
+
+    async def _write(self, result: TransformResult, progress: ImportProgress) -> None:
+        patients, errors = result
+        for error in errors:
+            progress.processed += 1
+            progress.record_error(error)
+        try:
+            inserted = await self._write_batch(patients) if patients else 0
+        except ValueError:
+            # One bad row rejects the batch; write row by row so only it fails.
+            inserted = 0
+            written = []
+            for patient in patients:
+                try:
+                    inserted += await self._write_batch([patient])
+                except ValueError as e:
+                    progress.processed += 1
+                    progress.record_error(f"{patient.email}: {e}")
+                    continue
+                written.append(patient)
+            patients = written
+        progress.processed += len(patients)
+        progress.imported += inserted
+        progress.skipped += len(patients) - inserted
+        if self._on_progress:
+            await self._on_progress(progress)
+
+transform_pool = TransformPool()
@@ -0,0 +1,61 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+from app.domain.entities.patient import Patient
+from app.infrastructure.external.normalization import clean_name, clean_phone
+
+FALLBACK_EMAIL_DOMAIN = "synthea.example"
+FHIR_SOURCE = "fhir"
+
+def _telecom(resource: Dict[str, Any], system: str) -> Optional[str]:
+    for telecom in resource.get("telecom", []):
+        if telecom.get("system") == system and telecom.get("value"):
+            return telecom["value"]
+    return None
+
+def _display_name(resource: Dict[str, Any]) -> str:
+    names = resource.get("name") or [{}]
+    name = next((n for n in names if n.get("use") == "official"), names[0])
+    if name.get("text"):
+        return clean_name(name["text"])
+    return clean_name(" ".join([*name.get("given", []), name.get("family", "")]))
+
+def patient_from_fhir(resource: Dict[str, Any]) -> Patient:
+    """Map a FHIR R4 Patient resource onto our patient entity.
+
+    Synthea patients rarely carry an email, so one is derived from the
+    resource id on a reserved example domain to keep the email column unique.
+    """
+    email = _telecom(resource, "email")
+    if email is None and resource.get("id"):
+        email = f"{resource['id']}@{FALLBACK_EMAIL_DOMAIN}"
+    phone = _telecom(resource, "phone")
+    
+    patient = Patient(
+        id=None,
+        name=_display_name(resource),
+        email=email or "",
+        phone=clean_phone(phone) if phone else "",
+        source=FHIR_SOURCE,
+        source_id=resource.get("id")
+    )
+    if not patient.is_valid_for_creation():
+        raise ValueError(f"Patient/{resource.get('id')} is missing name, email or phone")
+    return patient
+
+def transform_batch(items: List[Union[bytes, str, Dict[str, Any]]]) -> Tuple[List[Patient], List[str]]:
+    """Decode and map a batch of Patient resources; runs inside worker processes.
+
+    Items are raw NDJSON lines or already-decoded resources. Non-Patient
+    resources are dropped; invalid ones are reported rather than raised.
+    """
+    patients: List[Patient] = []
+    errors: List[str] = []
+    for item in items:
+        try:
+            resource = json.loads(item) if isinstance(item, (bytes, str)) else item
+            if resource.get("resourceType") != "Patient":
+                continue
+            patients.append(patient_from_fhir(resource))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append(str(e))
+    return patients, errors
@@ -0,0 +1,96 @@
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+import ijson
+
+FHIR_FORMATS = ("auto", "bundle", "ndjson")
+DETECTION_LINE_LIMIT = 65536
+
+ResourceItem = Union[bytes, Dict[str, Any]]
+
+def detect_format(stream: BinaryIO) -> str:
+    """Tell a Bundle from NDJSON by whether the first line is a whole non-Bundle resource."""
+    position = stream.tell()
+    first_line = stream.readline(DETECTION_LINE_LIMIT)
+    stream.seek(position)
+    try:
+        document = json.loads(first_line)
+    except ValueError:
+        return "bundle"
+    return "bundle" if document.get("resourceType") == "Bundle" else "ndjson"
+
+class FhirResourceReader:
+    """Incrementally read resources from a FHIR Bundle or NDJSON stream.
+
+    Bundles are parsed with ijson so only the current entry is in memory and
+    only ``Patient`` resources are yielded. NDJSON lines are yielded undecoded
+    so the JSON parsing happens in the transform workers.
+    """
+
+    def __init__(self, stream: BinaryIO, fhir_format: str = "auto"):
+        if fhir_format not in FHIR_FORMATS:
+            raise ValueError(f"Unsupported FHIR format: {fhir_format}")
+        if fhir_format == "auto":
+            fhir_format = detect_format(stream)
+        self.format = fhir_format
+        self._items = self._iter_bundle(stream) if fhir_format == "bundle" else self._iter_ndjson(stream)
+
+    def _iter_bundle(self, stream: BinaryIO) -> Iterator[ResourceItem]:
+        for resource in ijson.items(stream, "entry.item.resource", use_float=True):
+            if resource.get("resourceType") == "Patient":
+                yield resource
+
+    def _iter_ndjson(self, stream: BinaryIO) -> Iterator[ResourceItem]:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+
+    def next_batch(self, size: int) -> List[ResourceItem]:
+        return list(islice(self._items, size))
+
+class FhirFileReader:
+    """Read resources from many files as one stream, opening one file at a time.
+
+    Batches run across file boundaries, so an export with one small Bundle
+    per patient still produces full batches.
+    """
+
+    def __init__(self, paths: Iterable[Path], fhir_format: str = "auto"):
+        if fhir_format not in FHIR_FORMATS:
+            raise ValueError(f"Unsupported FHIR format: {fhir_format}")
+        self._paths = iter(paths)
+        self._format = fhir_format
+        self._stream: Optional[BinaryIO] = None
+        self._reader: Optional[FhirResourceReader] = None
+
+    def next_batch(self, size: int) -> List[ResourceItem]:
+        batch: List[ResourceItem] = []
+        while len(batch) < size:
+            if self._reader is None and not self._open_next():
+                break
+            wanted = size - len(batch)
+            items = self._reader.next_batch(wanted)
+            batch.extend(items)
+            if len(items) < wanted:
+                self.close()
+        return batch
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+        self._stream = None
+        self._reader = None
+
+    def _open_next(self) -> bool:
+        path = next(self._paths, None)
+        if path is None:
+            return False
+        self._stream = open(path, "rb")
+        try:
+            self._reader = FhirResourceReader(self._stream, self._format)
+        except BaseException:
+            self.close()
+            raise
+        return True
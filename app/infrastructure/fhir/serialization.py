@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from json.encoder import encode_basestring_ascii
+from typing import Iterable, List, Optional
+from app.domain.entities.patient import Patient
+
+FHIR_MEDIA_TYPE = "application/fhir+json"
+PATIENT_IDENTIFIER_SYSTEM = "urn:nuvie:patient"
+
+_PATIENT_OPEN = b'{"resourceType":"Patient","id":"'
+_META = b'","meta":{"lastUpdated":"'
+_IDENTIFIER = b'"},"identifier":[{"system":"' + PATIENT_IDENTIFIER_SYSTEM.encode() + b'","value":"'
+_NAME = b'"}],"name":[{"use":"official","text":'
+_FAMILY = b',"family":'
+_GIVEN = b',"given":['
+_GIVEN_CLOSE = b']'
+_PHONE = b'}],"telecom":[{"system":"phone","value":'
+_EMAIL = b'},{"system":"email","value":'
+_PATIENT_CLOSE = b'}]}'
+
+_BUNDLE_OPEN = b'{"resourceType":"Bundle","type":"searchset","link":['
+_BUNDLE_ENTRIES = b'],"entry":['
+_BUNDLE_CLOSE = b']}'
+_ENTRY_CLOSE = b',"search":{"mode":"match"}}'
+
+def _quote(value: str) -> bytes:
+    return encode_basestring_ascii(value).encode("ascii")
+
+def _instant(value: Optional[datetime]) -> bytes:
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat(timespec="seconds").encode("ascii")
+
+class FhirPatientSerializer:
+    """Encode patients as FHIR R4 JSON from pre-encoded byte fragments.
+
+    The static parts of the Patient resource and the searchset Bundle are
+    encoded once; per patient only the variable values are escaped and joined,
+    so no intermediate dict tree is built for ``json.dumps``.
+    """
+
+    def __init__(self, base_url: str):
+        self._entry_open = b'{"fullUrl":' + _quote(base_url.rstrip("/") + "/Patient/")[:-1]
+
+    def resource(self, patient: Patient) -> bytes:
+        patient_id = str(patient.id).encode("ascii")
+        *given, family = patient.name.split() or [""]
+        return b"".join((
+            _PATIENT_OPEN, patient_id,
+            _META, _instant(patient.updated_at or patient.created_at),
+            _IDENTIFIER, patient_id,
+            _NAME, _quote(patient.name),
+            _FAMILY, _quote(family),
+            _GIVEN + b",".join(_quote(part) for part in given) + _GIVEN_CLOSE if given else b"",
+            _PHONE, _quote(patient.phone),
+            _EMAIL, _quote(patient.email),
+            _PATIENT_CLOSE,
+        ))
+
+    def searchset(self, patients: Iterable[Patient], links: List[tuple]) -> bytes:
+        """Build a searchset Bundle; ``links`` is a list of (relation, url) pairs."""
+        entries = b",".join(
+            b"".join((
+                self._entry_open, str(patient.id).encode("ascii"),
+                b'","resource":', self.resource(patient), _ENTRY_CLOSE,
+            ))
+            for patient in patients
+        )
+        encoded_links = b",".join(
+            b'{"relation":' + _quote(relation) + b',"url":' + _quote(url) + b"}"
+            for relation, url in links
+        )
+        if not entries:
+            return b"".join((_BUNDLE_OPEN, encoded_links, b"]}"))
+        return b"".join((_BUNDLE_OPEN, encoded_links, _BUNDLE_ENTRIES, entries, _BUNDLE_CLOSE))
+
+    @staticmethod
+    def operation_outcome(code: str, diagnostics: str) -> bytes:
+        return b"".join((
+            b'{"resourceType":"OperationOutcome","issue":[{"severity":"error","code":',
+            _quote(code), b',"diagnostics":', _quote(diagnostics), b"}]}",
+        ))
@@ -0,0 +1,67 @@
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+from prometheus_client import Gauge
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_JOBS = Gauge(
+    "background_jobs",
+    "Background jobs held by this worker",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+class JobExecutor:
+    """Runs background jobs inside the worker, at most ``max_concurrency`` at once.
+
+    Jobs start from an empty context so they do not inherit the submitting
+    request's query tracking, trace span or request id. A job submitted with a
+    ``key`` is listed in ``keys`` while queued or running.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict["asyncio.Task[None]", Optional[Hashable]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def keys(self) -> List[Hashable]:
+        return [key for key in self._tasks.values() if key is not None]
+
+    def submit(self, job: Callable[[], Awaitable[None]], key: Optional[Hashable] = None) -> "asyncio.Task[None]":
+        task = contextvars.Context().run(asyncio.create_task, self._run(job))
+        self._tasks[task] = key
+        task.add_done_callback(lambda done: self._tasks.pop(done, None))
+        return task
+
+    async def _run(self, job: Callable[[], Awaitable[None]]) -> None:
+        queued = BACKGROUND_JOBS.labels("queued")
+        queued.inc()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            queued.dec()
+
+        running = BACKGROUND_JOBS.labels("running")
+        running.inc()
+        try:
+            await job()
+        except Exception:
+            logger.exception("Background job failed")
+        finally:
+            running.dec()
+            self._semaphore.release()
+
+    async def shutdown(self, timeout: float) -> None:
+        """Give running jobs ``timeout`` seconds to finish, then cancel the rest."""
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
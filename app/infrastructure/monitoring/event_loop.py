@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from prometheus_client import Counter, Histogram
+from app.infrastructure.monitoring.request_context import request_context_for_task
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event-loop wakeup and when it actually ran",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Times the event loop was blocked for longer than the threshold",
+)
+
+MAX_STACK_FRAMES = 30
+
+class EventLoopMonitor:
+    """Measure event-loop lag and name the code that blocks the loop.
+
+    A coroutine on the loop wakes every ``interval`` seconds, records how late
+    it woke up and refreshes a heartbeat. A watchdog thread checks the
+    heartbeat; once it is older than ``interval + threshold`` the loop is stuck
+    in synchronous code, so the thread captures the loop thread's current stack
+    and the request owning the running task, and logs them once per stall.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        try:
+            while True:
+                expected = self._loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                EVENT_LOOP_LAG.observe(max(0.0, self._loop.time() - expected))
+                self._heartbeat = time.monotonic()
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        reported = False
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            stalled = time.monotonic() - self._heartbeat
+            if stalled < self.interval + self.threshold:
+                reported = False
+            elif not reported:
+                reported = True
+                EVENT_LOOP_BLOCKED.inc()
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=MAX_STACK_FRAMES)) if frame else "<unavailable>"
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        context = request_context_for_task(task)
+
+        logger.warning(
+            "Event loop blocked for over %.0f ms in %s (request_id=%s %s %s)\n%s",
+            stalled * 1000,
+            task.get_name() if task else "<no task>",
+            context.request_id if context else "-",
+            context.method if context else "-",
+            context.path if context else "-",
+            stack,
+        )
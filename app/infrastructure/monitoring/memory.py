@@ -0,0 +1,155 @@
+import asyncio
+import gc
+import logging
+import os
+import signal
+import threading
+import tracemalloc
+from collections import Counter as TypeCounter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import psutil
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+WORKER_RSS_WATERMARK = Gauge(
+    "worker_rss_watermark_bytes",
+    "RSS at which a worker is recycled",
+    multiprocess_mode="liveall",
+)
+WORKER_RECYCLES = Counter(
+    "worker_recycles_total",
+    "Workers recycled for crossing the RSS watermark",
+)
+
+@dataclass
+class StoredSnapshot:
+    id: int
+    taken_at: datetime
+    snapshot: tracemalloc.Snapshot
+    traced_current: int
+    traced_peak: int
+
+class MemoryDiagnostics:
+    """Per-worker tracemalloc snapshots and object census.
+
+    Tracing starts with the first snapshot and costs memory and CPU while it
+    runs, so it is stopped again with :meth:`reset` once triage is done.
+    """
+
+    def __init__(self, max_snapshots: int = 10, traceback_frames: int = 10):
+        self.max_snapshots = max_snapshots
+        self.traceback_frames = traceback_frames
+        self._snapshots: Dict[int, StoredSnapshot] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def take_snapshot(self) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            stored = StoredSnapshot(self._next_id, datetime.utcnow(), snapshot, current, peak)
+            self._snapshots[stored.id] = stored
+            self._next_id += 1
+            while len(self._snapshots) > self.max_snapshots:
+                del self._snapshots[min(self._snapshots)]
+
+        return self._describe(stored)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._describe(stored) for stored in self._snapshots.values()]
+
+    def diff(self, from_id: int, to_id: int, group_by: str = "lineno", limit: int = 25) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            older = self._snapshots.get(from_id)
+            newer = self._snapshots.get(to_id)
+        if older is None or newer is None:
+            return None
+
+        stats = newer.snapshot.compare_to(older.snapshot, group_by)
+        return [
+            {
+                "location": self._format_traceback(stat.traceback, group_by),
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def object_counts(self, limit: int = 25) -> List[Dict[str, Any]]:
+        counts = TypeCounter(type(obj).__qualname__ for obj in gc.get_objects())
+        return [{"type": name, "count": count} for name, count in counts.most_common(limit)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def _describe(stored: StoredSnapshot) -> Dict[str, Any]:
+        return {
+            "id": stored.id,
+            "pid": os.getpid(),
+            "taken_at": stored.taken_at.isoformat(),
+            "traced_current_bytes": stored.traced_current,
+            "traced_peak_bytes": stored.traced_peak,
+        }
+
+    @staticmethod
+    def _format_traceback(traceback: tracemalloc.Traceback, group_by: str) -> str:
+        if group_by == "traceback":
+            return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+        frame = traceback[0]
+        return frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+
+memory_diagnostics = MemoryDiagnostics()
+
+class RssWatchdog:
+    """Recycle the worker once its RSS stays above the watermark.
+
+    The worker sends itself SIGTERM, which uvicorn treats as a graceful
+    shutdown: it stops accepting connections and drains in-flight requests.
+    The process manager (gunicorn in production) then starts a replacement.
+    """
+
+    def __init__(self, max_rss_bytes: int, interval: float = 30.0, consecutive_checks: int = 2):
+        self.max_rss_bytes = max_rss_bytes
+        self.interval = interval
+        self.consecutive_checks = consecutive_checks
+        self._process = psutil.Process()
+
+    def check(self) -> bool:
+        return self._process.memory_info().rss > self.max_rss_bytes
+
+    async def run(self) -> None:
+        WORKER_RSS_WATERMARK.set(self.max_rss_bytes)
+        over_watermark = 0
+        while True:
+            await asyncio.sleep(self.interval)
+            over_watermark = over_watermark + 1 if self.check() else 0
+            if over_watermark >= self.consecutive_checks:
+                self.recycle()
+                return
+
+    def recycle(self) -> None:
+        rss = self._process.memory_info().rss
+        logger.warning(
+            "Worker %s RSS %.1f MiB exceeds watermark %.1f MiB, recycling",
+            os.getpid(), rss / 2**20, self.max_rss_bytes / 2**20,
+        )
+        WORKER_RECYCLES.inc()
+        os.kill(os.getpid(), signal.SIGTERM)
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+import psutil
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Gauges use live* modes so values from dead workers drop out of the aggregate
+# when PROMETHEUS_MULTIPROC_DIR is set; counters and histograms are summed.
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections_open",
+    "Database connections currently open",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+EXTERNAL_API_DURATION = Histogram(
+    "external_api_request_duration_seconds",
+    "External API call latency by service and outcome",
+    ["service", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+WORKER_RESIDENT_MEMORY = Gauge(
+    "worker_resident_memory_bytes",
+    "Resident set size of the worker process",
+    multiprocess_mode="liveall",
+)
+WORKER_CPU_SECONDS = Gauge(
+    "worker_cpu_seconds",
+    "User and system CPU time consumed by the worker process",
+    multiprocess_mode="liveall",
+)
+
+def is_multiprocess() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+def render_metrics() -> Tuple[bytes, str]:
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_worker_dead() -> None:
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+@contextmanager
+def track_external_call(service: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        EXTERNAL_API_DURATION.labels(service, outcome).observe(time.perf_counter() - started)
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    pool = engine.sync_engine.pool
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.set(pool.size())
+
+    event.listen(pool, "connect", lambda *args: DB_POOL_CONNECTIONS.inc())
+    event.listen(pool, "close", lambda *args: DB_POOL_CONNECTIONS.dec())
+    event.listen(pool, "close_detached", lambda *args: DB_POOL_CONNECTIONS.dec())
+    event.listen(pool, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+
+def sample_process_metrics() -> None:
+    process = psutil.Process()
+    cpu = process.cpu_times()
+    WORKER_RESIDENT_MEMORY.set(process.memory_info().rss)
+    WORKER_CPU_SECONDS.set(cpu.user + cpu.system)
+
+async def run_process_sampler(interval: float) -> None:
+    while True:
+        sample_process_metrics()
+        await asyncio.sleep(interval)
@@ -0,0 +1,43 @@
+import asyncio
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+@dataclass(frozen=True)
+class RequestContext:
+    request_id: str
+    method: str
+    path: str
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+# Other threads (the event-loop watchdog) cannot read a task's context
+# variables, so the running task is mapped to its request as well.
+_task_requests: "WeakKeyDictionary[asyncio.Task, RequestContext]" = WeakKeyDictionary()
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+def get_request_context() -> Optional[RequestContext]:
+    return _current_request.get()
+
+def bind_request_context(context: RequestContext) -> Token:
+    task = _current_task()
+    if task is not None:
+        _task_requests[task] = context
+    return _current_request.set(context)
+
+def unbind_request_context(token: Token) -> None:
+    task = _current_task()
+    if task is not None:
+        _task_requests.pop(task, None)
+    _current_request.reset(token)
+
+def request_context_for_task(task: Optional[asyncio.Task]) -> Optional[RequestContext]:
+    if task is None:
+        return None
+    return _task_requests.get(task)
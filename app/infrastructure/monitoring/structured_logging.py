@@ -0,0 +1,186 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+from prometheus_client import Counter
+from app.infrastructure.monitoring.request_context import get_request_context
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped by sampling, rate limiting or a full queue",
+    ["reason"],
+)
+
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the standard fields plus any ``extra``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request id.
+
+    Runs on the calling thread, before the record is queued, since the writer
+    thread has no access to the request's context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = get_request_context()
+        if context is not None and not hasattr(record, "request_id"):
+            record.request_id = context.request_id
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records tagged with ``route``/``status_code``.
+
+    Rules are looked up from most to least specific: ``"<route> <status>"``,
+    ``"<status>"`` then ``"<status class>"`` (e.g. ``"4xx"``). Records are
+    kept deterministically, one in every ``1 / rate``.
+    """
+
+    def __init__(self, rules: Dict[str, float]):
+        super().__init__()
+        self.rules = rules
+        self._seen: Dict[str, int] = {}
+
+    def _rule(self, record: logging.LogRecord) -> Optional[Tuple[str, float]]:
+        status = getattr(record, "status_code", None)
+        if status is None:
+            return None
+        route = getattr(record, "route", None)
+        for key in (f"{route} {status}", str(status), f"{str(status)[0]}xx"):
+            if key in self.rules:
+                return key, self.rules[key]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rule = self._rule(record)
+        if rule is None:
+            return True
+        key, rate = rule
+        if rate >= 1:
+            return True
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if rate > 0 and seen % round(1 / rate) == 0:
+            return True
+        LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return False
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most ``limit`` records per message template per window.
+
+    The first record of the next window carries ``suppressed`` with the number
+    of repeats that were dropped.
+    """
+
+    MAX_KEYS = 10000
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._windows: Dict[Tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg), getattr(record, "route", None), getattr(record, "status_code", None))
+        now = time.monotonic()
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            if len(self._windows) >= self.MAX_KEYS:
+                self._windows.clear()
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+        state[2] += 1
+        LOG_RECORDS_DROPPED.labels("rate_limited").inc()
+        return False
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue records for a background writer, dropping them when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge msg and args here; exception and JSON formatting happen on
+        # the writer thread so the request path does not pay for them.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+_listener: Optional[QueueListener] = None
+
+def configure_logging(
+    level: str = "INFO",
+    json_output: bool = True,
+    queue_size: int = 10000,
+    sampling_rules: Optional[Dict[str, float]] = None,
+    rate_limit: int = 20,
+    rate_limit_window: float = 10.0,
+) -> None:
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if json_output else logging.Formatter(
+        "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    ))
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(sampling_rules or {}))
+    handler.addFilter(RateLimitFilter(rate_limit, rate_limit_window))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, NonBlockingQueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
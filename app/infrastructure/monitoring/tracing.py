@@ -0,0 +1,145 @@
+import functools
+import inspect
+from typing import Any, Callable, Dict, Optional, Union
+import httpx
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode, Tracer
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+from app.config import settings
+
+SERVICE_NAME = "nuvie-backend"
+MAX_STATEMENT_LENGTH = 1000
+
+propagator = TraceContextTextMapPropagator()
+
+def _otlp_exporter() -> SpanExporter:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.otlp_endpoint)
+
+EXPORTERS: Dict[str, Callable[[], SpanExporter]] = {
+    "console": ConsoleSpanExporter,
+    "memory": InMemorySpanExporter,
+    "otlp": _otlp_exporter,
+}
+
+_provider: Optional[TracerProvider] = None
+_tracer: Optional[Tracer] = None
+
+def register_exporter(name: str, factory: Callable[[], SpanExporter]) -> None:
+    EXPORTERS[name] = factory
+
+def configure_tracing(exporter: Union[str, SpanExporter], sample_ratio: float = 1.0) -> Optional[SpanExporter]:
+    """Install a tracer provider, or disable tracing when ``exporter`` is "none".
+
+    Sampling is decided once per trace (parent-based), so an unsampled request
+    creates no spans below the root. Returns the exporter in use.
+    """
+    global _provider, _tracer
+    shutdown_tracing()
+
+    if exporter == "none":
+        return None
+
+    span_exporter = EXPORTERS[exporter]() if isinstance(exporter, str) else exporter
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    processor_class = SimpleSpanProcessor if isinstance(span_exporter, InMemorySpanExporter) else BatchSpanProcessor
+    _provider.add_span_processor(processor_class(span_exporter))
+    _tracer = _provider.get_tracer(__name__)
+    return span_exporter
+
+def shutdown_tracing() -> None:
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+def extract_context(headers: Dict[str, str]) -> Context:
+    return propagator.extract(headers)
+
+def traced_class(cls: type) -> type:
+    """Wrap every public coroutine method of ``cls`` in a span named ``Class.method``."""
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attribute):
+            setattr(cls, name, _traced_coroutine(f"{cls.__name__}.{name}", attribute))
+    return cls
+
+def _traced_coroutine(span_name: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _tracer is None:
+            return await func(*args, **kwargs)
+        with _tracer.start_as_current_span(span_name):
+            return await func(*args, **kwargs)
+    return wrapper
+
+def start_sql_span(statement: str, dialect: str) -> Optional[Span]:
+    if _tracer is None or not trace.get_current_span().is_recording():
+        return None
+    operation = statement.lstrip().split(" ", 1)[0].upper()
+    return _tracer.start_span(
+        f"SQL {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": dialect,
+            "db.operation": operation,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        },
+    )
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if span is None:
+        return
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, str(error)))
+    span.end()
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """Record a client span per outgoing request and propagate ``traceparent``."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _tracer is None:
+            return await self._transport.handle_async_request(request)
+
+        with _tracer.start_as_current_span(
+            f"HTTP {request.method}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.method": request.method,
+                "http.url": str(request.url.copy_with(query=None)),
+                "net.peer.name": request.url.host,
+            },
+        ) as span:
+            carrier: Dict[str, str] = {}
+            propagator.inject(carrier)
+            request.headers.update(carrier)
+
+            response = await self._transport.handle_async_request(request)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,33 @@
+"""Keeping the patient change log in order on PostgreSQL without a write lock.
+
+``seq`` is drawn from a sequence, so concurrent writers can commit out of seq
+order. Each writer stamps its rows with ``visible_after``, the xmax of a
+snapshot taken after the rows got their seqs. Every transaction that drew a
+lower seq already had an xid by then, so once the oldest running xid has
+reached ``visible_after`` nothing can still appear below that row. Readers
+stop at the highest such seq, so a long transaction delays the feed rather
+than the other writers.
+"""
+from sqlalchemy import Executable, func, select, update
+from app.infrastructure.events.patient_events import CHANNEL as CHANGE_CHANNEL
+from app.models.patient_change import PatientChange
+
+def open_changes() -> Executable:
+    """Run before inserting change rows: assigns the transaction's xid and queues the commit notification."""
+    return select(func.txid_current(), func.pg_notify(CHANGE_CHANNEL, ""))
+
+def stamp_changes() -> Executable:
+    """Run after inserting change rows; unstamped rows of other writers are not visible to it."""
+    return (
+        update(PatientChange)
+        .where(PatientChange.visible_after.is_(None))
+        .values(visible_after=func.txid_snapshot_xmax(func.txid_current_snapshot()))
+    )
+
+def visible_horizon():
+    """The highest seq below which no change can still appear, as a scalar subquery."""
+    return (
+        select(func.coalesce(func.max(PatientChange.seq), 0))
+        .where(PatientChange.visible_after <= func.txid_snapshot_xmin(func.txid_current_snapshot()))
+        .scalar_subquery()
+    )
@@ -0,0 +1,237 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+from sqlalchemy import delete, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.entities.duplicate import DuplicateCluster, DuplicateMatch
+from app.domain.entities.patient import Patient as PatientEntity
+from app.domain.interfaces import IDuplicateRepository
+from app.models.duplicate import (
+    DuplicateCluster as DuplicateClusterModel,
+    DuplicateMatch as DuplicateMatchModel,
+    PatientBlockingKey,
+)
+from app.models.patient import Patient as PatientModel
+from app.infrastructure.monitoring.tracing import traced_class
+
+@traced_class
+class DuplicateRepository(IDuplicateRepository):
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def count_pending(self) -> int:
+        return await self._db.scalar(
+            select(func.count()).select_from(PatientModel).where(~self._has_keys())
+        )
+
+    async def next_pending(self, after_id: int, limit: int) -> List[PatientEntity]:
+        """Patients with id above ``after_id`` that have no blocking keys."""
+        result = await self._db.execute(
+            select(PatientModel)
+            .where(PatientModel.id > after_id, ~self._has_keys())
+            .order_by(PatientModel.id)
+            .limit(limit)
+        )
+        return [self._to_entity(row) for row in result.scalars()]
+
+    async def mark_stale(self, patient_ids: List[int]) -> None:
+        """Drop the blocking keys of edited patients so the next scan keys and scores them again.
+
+        Staged in the caller's transaction, next to the patient write.
+        """
+        if patient_ids:
+            await self._db.execute(delete(PatientBlockingKey).where(PatientBlockingKey.patient_id.in_(patient_ids)))
+
+    async def forget_matches(self, patient_ids: List[int]) -> None:
+        """Drop the matches of patients about to be scored again and split the clusters they were in.
+
+        The other members' matches are folded back into clusters, so a cluster
+        an edited patient was holding together falls apart. Staged in the
+        current transaction; new patients have no cluster and cost one lookup.
+        """
+        cluster_ids = (await self._db.scalars(
+            select(DuplicateClusterModel.cluster_id)
+            .where(DuplicateClusterModel.patient_id.in_(patient_ids))
+            .distinct()
+        )).all()
+        if not cluster_ids:
+            return
+
+        await self._db.execute(
+            delete(DuplicateMatchModel).where(or_(
+                DuplicateMatchModel.patient_id.in_(patient_ids),
+                DuplicateMatchModel.matched_patient_id.in_(patient_ids)
+            ))
+        )
+        members = select(DuplicateClusterModel.patient_id).where(DuplicateClusterModel.cluster_id.in_(cluster_ids))
+        remaining = [
+            DuplicateMatch(match.patient_id, match.matched_patient_id, match.score)
+            for match in await self._db.scalars(select(DuplicateMatchModel).where(DuplicateMatchModel.patient_id.in_(members)))
+        ]
+        await self._db.execute(delete(DuplicateClusterModel).where(DuplicateClusterModel.cluster_id.in_(cluster_ids)))
+        if remaining:
+            await self._merge_clusters(remaining)
+
+    async def add_keys(self, keys: Iterable[Tuple[int, str]]) -> None:
+        """Stage blocking keys in the current transaction; ``record_matches`` commits."""
+        rows = [{"patient_id": patient_id, "key": key} for patient_id, key in keys]
+        if rows:
+            await self._db.execute(self._insert(PatientBlockingKey).on_conflict_do_nothing(), rows)
+
+    async def find_block_members(self, keys: Set[str], max_block_size: int) -> Tuple[Dict[str, List[PatientEntity]], int]:
+        """Members of each block, skipping blocks larger than ``max_block_size``.
+
+        Returns the blocks and how many were skipped for being oversized.
+        """
+        if not keys:
+            return {}, 0
+        sizes = await self._db.execute(
+            select(PatientBlockingKey.key, func.count())
+            .where(PatientBlockingKey.key.in_(keys))
+            .group_by(PatientBlockingKey.key)
+        )
+        allowed = []
+        oversized = 0
+        for key, size in sizes:
+            if size > max_block_size:
+                oversized += 1
+            elif size > 1:
+                allowed.append(key)
+
+        blocks: Dict[str, List[PatientEntity]] = defaultdict(list)
+        if allowed:
+            # Plain columns instead of ORM instances: a batch can touch far
+            # more block members than it has patients.
+            result = await self._db.execute(
+                select(PatientBlockingKey.key, PatientModel.id, PatientModel.name, PatientModel.email, PatientModel.phone)
+                .join(PatientModel, PatientModel.id == PatientBlockingKey.patient_id)
+                .where(PatientBlockingKey.key.in_(allowed))
+            )
+            members: Dict[int, PatientEntity] = {}
+            for key, patient_id, name, email, phone in result:
+                member = members.get(patient_id)
+                if member is None:
+                    member = members[patient_id] = PatientEntity(id=patient_id, name=name, email=email, phone=phone)
+                blocks[key].append(member)
+        return blocks, oversized
+
+    async def record_matches(self, matches: List[DuplicateMatch]) -> None:
+        """Store matches, fold them into clusters and commit the batch."""
+        if matches:
+            await self._db.execute(
+                self._insert(DuplicateMatchModel).on_conflict_do_nothing(),
+                [
+                    {"patient_id": match.patient_id, "matched_patient_id": match.matched_patient_id, "score": match.score}
+                    for match in matches
+                ]
+            )
+            await self._merge_clusters(matches)
+        await self._db.commit()
+
+    async def list_clusters(self, skip: int = 0, limit: int = 100) -> List[DuplicateCluster]:
+        cluster_ids = (
+            select(DuplicateClusterModel.cluster_id)
+            .distinct()
+            .order_by(DuplicateClusterModel.cluster_id)
+            .offset(skip)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = await self._db.execute(
+            select(DuplicateClusterModel.cluster_id, PatientModel)
+            .join(PatientModel, PatientModel.id == DuplicateClusterModel.patient_id)
+            .where(DuplicateClusterModel.cluster_id.in_(cluster_ids))
+            .order_by(DuplicateClusterModel.cluster_id, PatientModel.id)
+        )
+        clusters: Dict[int, DuplicateCluster] = {}
+        members: Dict[int, int] = {}
+        for cluster_id, patient in result:
+            cluster = clusters.setdefault(cluster_id, DuplicateCluster(cluster_id))
+            cluster.patients.append(self._to_entity(patient))
+            members[patient.id] = cluster_id
+        if not members:
+            return []
+
+        matches = await self._db.execute(
+            select(DuplicateMatchModel)
+            .where(DuplicateMatchModel.patient_id.in_(list(members)))
+            .order_by(DuplicateMatchModel.patient_id, DuplicateMatchModel.matched_patient_id)
+        )
+        for match in matches.scalars():
+            if match.matched_patient_id in members:
+                clusters[members[match.patient_id]].matches.append(
+                    DuplicateMatch(match.patient_id, match.matched_patient_id, match.score)
+                )
+        return list(clusters.values())
+
+    async def _merge_clusters(self, matches: List[DuplicateMatch]) -> None:
+        """Union the matched pairs with the clusters their patients already belong to.
+
+        A cluster is identified by its smallest patient id, so merging two
+        clusters relabels the members of the one with the larger id.
+        """
+        involved = {match.patient_id for match in matches} | {match.matched_patient_id for match in matches}
+        existing = dict((await self._db.execute(
+            select(DuplicateClusterModel.patient_id, DuplicateClusterModel.cluster_id)
+            .where(DuplicateClusterModel.patient_id.in_(involved))
+        )).all())
+
+        parent: Dict[int, int] = {}
+
+        def find(node: int) -> int:
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def union(left: int, right: int) -> None:
+            left, right = find(left), find(right)
+            if left != right:
+                parent[max(left, right)] = min(left, right)
+
+        for patient_id, cluster_id in existing.items():
+            union(patient_id, cluster_id)
+        for match in matches:
+            union(match.patient_id, match.matched_patient_id)
+
+        relabel: Dict[int, int] = {}
+        for cluster_id in set(existing.values()):
+            root = find(cluster_id)
+            if root != cluster_id:
+                relabel[cluster_id] = root
+        for old, new in relabel.items():
+            await self._db.execute(
+                update(DuplicateClusterModel)
+                .where(DuplicateClusterModel.cluster_id == old)
+                .values(cluster_id=new)
+            )
+
+        new_members = [
+            {"patient_id": patient_id, "cluster_id": find(patient_id)}
+            for patient_id in sorted(involved - existing.keys())
+        ]
+        if new_members:
+            await self._db.execute(self._insert(DuplicateClusterModel).on_conflict_do_nothing(), new_members)
+
+    def _insert(self, model):
+        dialect = self._db.get_bind().dialect.name
+        return (postgresql_insert if dialect == "postgresql" else sqlite_insert)(model)
+
+    @staticmethod
+    def _has_keys():
+        return exists().where(PatientBlockingKey.patient_id == PatientModel.id)
+
+    def _to_entity(self, db_patient: PatientModel) -> PatientEntity:
+        return PatientEntity(
+            id=db_patient.id,
+            name=db_patient.name,
+            email=db_patient.email,
+            phone=db_patient.phone,
+            created_at=db_patient.created_at,
+            updated_at=db_patient.updated_at,
+            source=db_patient.source,
+            source_id=db_patient.source_id,
+            content_hash=db_patient.content_hash
+        )
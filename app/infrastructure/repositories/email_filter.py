@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Iterable, Iterator, Optional
+from prometheus_client import Counter, Gauge
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import complete_on_cancel
+from app.domain.normalization import normalize_email
+from app.models.patient import Patient as PatientModel
+
+logger = logging.getLogger(__name__)
+
+EMAIL_FILTER_LOOKUPS = Counter(
+    "email_filter_lookups_total",
+    "Email existence checks answered by the in-memory filter",
+    ["result"],
+)
+EMAIL_FILTER_FALSE_POSITIVES = Counter(
+    "email_filter_false_positives_total",
+    "Filter answered maybe-present but the database had no such email",
+)
+EMAIL_FILTER_BYTES = Gauge(
+    "email_filter_bytes",
+    "Memory held by the email filter bit array",
+    multiprocess_mode="livesum",
+)
+EMAIL_FILTER_ITEMS = Gauge(
+    "email_filter_items",
+    "Emails inserted into the filter since its last rebuild",
+    multiprocess_mode="liveall",
+)
+EMAIL_FILTER_ESTIMATED_FPR = Gauge(
+    "email_filter_estimated_false_positive_rate",
+    "Theoretical false-positive rate at the current fill level",
+    multiprocess_mode="liveall",
+)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one BLAKE2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+class EmailFilter:
+    """Per-worker answer to "could this email already exist?".
+
+    A "no" is definite and lets callers skip the database lookup; a "maybe"
+    falls through to the database, and the unique constraint on
+    ``patients.email`` stays authoritative for writes made by other workers.
+    Until the first build finishes every answer is "maybe".
+    """
+
+    def __init__(self, error_rate: float = 0.01, min_capacity: int = 100_000):
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self._filter: Optional[BloomFilter] = None
+        self._building: Optional[BloomFilter] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self._filter is not None and self._filter.count > self._filter.capacity
+
+    def might_contain(self, email: str) -> bool:
+        if self._filter is None:
+            return True
+        present = normalize_email(email) in self._filter
+        EMAIL_FILTER_LOOKUPS.labels("maybe_present" if present else "absent").inc()
+        return present
+
+    def record_false_positive(self) -> None:
+        if self._filter is not None:
+            EMAIL_FILTER_FALSE_POSITIVES.inc()
+
+    def add(self, email: str) -> None:
+        self.add_many((email,))
+
+    def add_many(self, emails: Iterable[str]) -> None:
+        targets = [bloom for bloom in (self._filter, self._building) if bloom is not None]
+        if not targets:
+            return
+        for email in emails:
+            email = normalize_email(email)
+            for bloom in targets:
+                bloom.add(email)
+        self._publish()
+
+    async def rebuild(self, session_factory: sessionmaker, batch_size: int = 10_000) -> None:
+        """Build a fresh filter from ``patients.email`` and swap it in.
+
+        Emails are read in primary-key pages so no transaction stays open for
+        the whole scan; writes made meanwhile land in the filter being built.
+        """
+        started = time.monotonic()
+
+        async def count() -> int:
+            async with session_factory() as db:
+                return await db.scalar(select(func.count()).select_from(PatientModel))
+
+        async def read_page(last_id: int):
+            async with session_factory() as db:
+                return (await db.execute(
+                    select(PatientModel.id, PatientModel.email_normalized)
+                    .where(PatientModel.id > last_id)
+                    .order_by(PatientModel.id)
+                    .limit(batch_size)
+                )).all()
+
+        total = await complete_on_cancel(count())
+        building = BloomFilter(max(self.min_capacity, int(total * 1.5)), self.error_rate)
+        self._building = building
+        try:
+            last_id = 0
+            while True:
+                rows = await complete_on_cancel(read_page(last_id))
+                for _, email in rows:
+                    building.add(email)
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1].id
+        finally:
+            self._building = None
+        self._filter = building
+        self._publish()
+        logger.info(
+            "Email filter built",
+            extra={"items": building.count, "bytes": building.nbytes, "duration_ms": round((time.monotonic() - started) * 1000, 1)},
+        )
+
+    async def run(self, session_factory: sessionmaker, rebuild_interval: float, check_interval: float = 30.0) -> None:
+        """Build at startup, then rebuild when over capacity or every ``rebuild_interval`` seconds."""
+        last_build = -math.inf
+        while True:
+            if not self.ready or self.needs_rebuild or time.monotonic() - last_build >= rebuild_interval:
+                try:
+                    await self.rebuild(session_factory)
+                    last_build = time.monotonic()
+                except Exception:
+                    logger.exception("Email filter build failed")
+            await asyncio.sleep(check_interval)
+
+    def _publish(self) -> None:
+        if self._filter is None:
+            return
+        EMAIL_FILTER_BYTES.set(self._filter.nbytes)
+        EMAIL_FILTER_ITEMS.set(self._filter.count)
+        EMAIL_FILTER_ESTIMATED_FPR.set(self._filter.estimated_false_positive_rate)
+
+email_filter = EmailFilter()
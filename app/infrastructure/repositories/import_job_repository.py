@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select, update
+from app.domain.entities.import_job import ImportJob as ImportJobEntity, ImportJobSource, ImportJobStatus, MAX_RECORDED_ERRORS
+from app.domain.interfaces import IImportJobRepository
+from app.models.import_job import ImportJob as ImportJobModel
+from app.infrastructure.monitoring.tracing import traced_class
+
+@traced_class
+class ImportJobRepository(IImportJobRepository):
+    def __init__(self, db: AsyncSession):
+        self._db = db
+    
+    async def create(self, job: ImportJobEntity) -> ImportJobEntity:
+        db_job = ImportJobModel(
+            status=job.status.value,
+            source=job.source.value,
+            requested_count=job.requested_count,
+            errors=list(job.errors),
+            created_by=job.created_by,
+            heartbeat_at=datetime.utcnow()
+        )
+        
+        self._db.add(db_job)
+        await self._db.commit()
+        await self._db.refresh(db_job)
+        
+        return self._to_entity(db_job)
+    
+    async def get_by_id(self, job_id: int) -> Optional[ImportJobEntity]:
+        result = await self._db.execute(
+            select(ImportJobModel).where(ImportJobModel.id == job_id)
+        )
+        db_job = result.scalar_one_or_none()
+        
+        return self._to_entity(db_job) if db_job else None
+    
+    async def update(self, job_id: int, job_data: Dict[str, Any]) -> Optional[ImportJobEntity]:
+        result = await self._db.execute(
+            select(ImportJobModel).where(ImportJobModel.id == job_id)
+        )
+        db_job = result.scalar_one_or_none()
+        
+        if not db_job:
+            return None
+        
+        for field, value in job_data.items():
+            if isinstance(value, ImportJobStatus):
+                value = value.value
+            setattr(db_job, field, value)
+        db_job.heartbeat_at = datetime.utcnow()
+        
+        await self._db.commit()
+        
+        return self._to_entity(db_job)
+    
+    async def touch(self, job_ids: Iterable[int]) -> None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        await self._db.execute(
+            update(ImportJobModel)
+            .where(ImportJobModel.id.in_(job_ids))
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        await self._db.commit()
+    
+    async def fail_stale(self, heartbeat_before: datetime, error: str) -> int:
+        result = await self._db.execute(
+            select(ImportJobModel).where(
+                ImportJobModel.status.in_([ImportJobStatus.QUEUED.value, ImportJobStatus.RUNNING.value]),
+                or_(ImportJobModel.heartbeat_at.is_(None), ImportJobModel.heartbeat_at < heartbeat_before)
+            )
+        )
+        stale = result.scalars().all()
+        now = datetime.utcnow()
+        for db_job in stale:
+            db_job.status = ImportJobStatus.FAILED.value
+            db_job.finished_at = now
+            db_job.errors = [*(db_job.errors or []), error][-MAX_RECORDED_ERRORS:]
+        await self._db.commit()
+        
+        return len(stale)
+    
+    def _to_entity(self, db_job: ImportJobModel) -> ImportJobEntity:
+        return ImportJobEntity(
+            id=db_job.id,
+            requested_count=db_job.requested_count,
+            source=ImportJobSource(db_job.source),
+            status=ImportJobStatus(db_job.status),
+            processed_count=db_job.processed_count,
+            imported_count=db_job.imported_count,
+            updated_count=db_job.updated_count,
+            unchanged_count=db_job.unchanged_count,
+            skipped_count=db_job.skipped_count,
+            failed_count=db_job.failed_count,
+            errors=list(db_job.errors or []),
+            created_by=db_job.created_by,
+            created_at=db_job.created_at,
+            started_at=db_job.started_at,
+            finished_at=db_job.finished_at
+        )
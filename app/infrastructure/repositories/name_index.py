@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from prometheus_client import Gauge
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import complete_on_cancel
+from app.infrastructure.dedup.matching import name_tokens
+from app.models.patient import Patient as PatientModel
+from app.models.patient_change import PatientChange as PatientChangeModel
+
+logger = logging.getLogger(__name__)
+
+NAME_INDEX_PATIENTS = Gauge(
+    "name_index_patients",
+    "Patients held by the autocomplete prefix index",
+    multiprocess_mode="liveall",
+)
+NAME_INDEX_TOKENS = Gauge(
+    "name_index_tokens",
+    "Distinct name tokens in the autocomplete prefix index",
+    multiprocess_mode="liveall",
+)
+
+class PrefixIndex:
+    """Sorted name tokens with their posting sets, searched by prefix with bisect.
+
+    A ``bulk`` index only fills the postings, since inserting each new token
+    into the sorted list is linear; ``seal()`` sorts them once and makes it
+    searchable.
+    """
+
+    def __init__(self, bulk: bool = False):
+        self.names: Dict[int, str] = {}
+        self._tokens: Optional[List[str]] = None if bulk else []
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def token_count(self) -> int:
+        return len(self._postings)
+
+    def seal(self) -> None:
+        self._tokens = sorted(self._postings)
+
+    def add(self, patient_id: int, name: str) -> None:
+        self.remove(patient_id)
+        self.names[patient_id] = name
+        for token in set(name_tokens(name)):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                if self._tokens is not None:
+                    insort(self._tokens, token)
+            posting.add(patient_id)
+
+    def remove(self, patient_id: int) -> None:
+        name = self.names.pop(patient_id, None)
+        if name is None:
+            return
+        for token in set(name_tokens(name)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(patient_id)
+            if not posting:
+                del self._postings[token]
+                if self._tokens is not None:
+                    del self._tokens[bisect_left(self._tokens, token)]
+
+    def ids_with_prefix(self, prefix: str) -> Iterator[int]:
+        """Ids whose name has a token starting with ``prefix``, token by token in sorted order."""
+        position = bisect_left(self._tokens, prefix)
+        while position < len(self._tokens) and self._tokens[position].startswith(prefix):
+            yield from self._postings[self._tokens[position]]
+            position += 1
+
+class NameIndex:
+    """Per-worker type-ahead over patient names, answered without the database.
+
+    Every token of the query must prefix some token of the name, in any
+    order, so "jo sm" finds "Smith, John". Writes keep the index current;
+    writes made by other workers are applied from the patient change log
+    every few seconds, and a periodic rebuild catches anything written
+    around the log. Until the first build finishes the index is not ready.
+    """
+
+    def __init__(self):
+        self._index: Optional[PrefixIndex] = None
+        self._building: Optional[PrefixIndex] = None
+        self._removed_while_building: Set[int] = set()
+        self._cursor = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        index = self._index
+        query = name_tokens(prefix)
+        if index is None or not query:
+            return []
+        # Scan the postings of the most selective (longest) query token and
+        # check the remaining tokens against each candidate's name.
+        anchor = max(query, key=len)
+        others = list(query)
+        others.remove(anchor)
+        results: List[Tuple[int, str]] = []
+        seen: Set[int] = set()
+        for patient_id in index.ids_with_prefix(anchor):
+            if patient_id in seen:
+                continue
+            seen.add(patient_id)
+            name = index.names[patient_id]
+            if others and not self._matches_all(others, name_tokens(name)):
+                continue
+            results.append((patient_id, name))
+            if len(results) >= limit:
+                break
+        return sorted(results, key=lambda result: (result[1].lower(), result[0]))
+
+    def add(self, patient_id: int, name: str) -> None:
+        self.add_many(((patient_id, name),))
+
+    def add_many(self, patients: Iterable[Tuple[int, str]]) -> None:
+        targets = self._targets()
+        if not targets:
+            return
+        for patient_id, name in patients:
+            for index in targets:
+                index.add(patient_id, name)
+        self._publish()
+
+    def remove(self, patient_id: int) -> None:
+        for index in self._targets():
+            index.remove(patient_id)
+        if self._building is not None:
+            self._removed_while_building.add(patient_id)
+        self._publish()
+
+    async def reload(self, session_factory: sessionmaker, patient_ids: Iterable[int]) -> None:
+        """Re-read these patients, after writes the index saw were rolled back."""
+        patient_ids = set(patient_ids)
+        if not patient_ids:
+            return
+        async with session_factory() as db:
+            names = dict((await db.execute(
+                select(PatientModel.id, PatientModel.name).where(PatientModel.id.in_(patient_ids))
+            )).all())
+        for patient_id in patient_ids - names.keys():
+            self.remove(patient_id)
+        self.add_many(names.items())
+
+    async def rebuild(self, session_factory: sessionmaker, batch_size: int = 10_000) -> None:
+        started = time.monotonic()
+
+        async def read_page(last_id: int):
+            async with session_factory() as db:
+                return (await db.execute(
+                    select(PatientModel.id, PatientModel.name)
+                    .where(PatientModel.id > last_id)
+                    .order_by(PatientModel.id)
+                    .limit(batch_size)
+                )).all()
+
+        async def read_cursor() -> int:
+            async with session_factory() as db:
+                return await db.scalar(select(func.coalesce(func.max(PatientChangeModel.seq), 0)))
+
+        building = PrefixIndex(bulk=True)
+        self._building = building
+        self._removed_while_building = set()
+        try:
+            # Changes logged from here on are applied again by ``refresh``.
+            cursor = await complete_on_cancel(read_cursor())
+            last_id = 0
+            while True:
+                rows = await complete_on_cancel(read_page(last_id))
+                for patient_id, name in rows:
+                    # Skip rows deleted after this page was read; rows already
+                    # added through ``add_many`` are simply refreshed.
+                    if patient_id not in self._removed_while_building:
+                        building.add(patient_id, name)
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1].id
+                await asyncio.sleep(0)
+        finally:
+            self._building = None
+            self._removed_while_building = set()
+        building.seal()
+        self._index = building
+        self._cursor = cursor
+        self._publish()
+        logger.info(
+            "Name index built",
+            extra={"patients": len(building), "tokens": building.token_count, "duration_ms": round((time.monotonic() - started) * 1000, 1)},
+        )
+
+    async def refresh(self, session_factory: sessionmaker, batch_size: int = 10_000) -> int:
+        """Apply the change log since the last build or refresh; returns the entries read."""
+        if self._index is None:
+            return 0
+
+        async def read_changes(since: int):
+            async with session_factory() as db:
+                return (await db.execute(
+                    select(PatientChangeModel.seq, PatientChangeModel.patient_id, PatientModel.name)
+                    .outerjoin(PatientModel, PatientModel.id == PatientChangeModel.patient_id)
+                    .where(PatientChangeModel.seq > since)
+                    .order_by(PatientChangeModel.seq)
+                    .limit(batch_size)
+                )).all()
+
+        read = 0
+        while True:
+            rows = await complete_on_cancel(read_changes(self._cursor))
+            # Each patient ends up as its current row: gone if it was deleted
+            # since, whatever the logged operation.
+            latest: Dict[int, Optional[str]] = {patient_id: name for _, patient_id, name in rows}
+            for patient_id, name in latest.items():
+                if name is None:
+                    self.remove(patient_id)
+            names = self._index.names
+            self.add_many(
+                (patient_id, name) for patient_id, name in latest.items()
+                if name is not None and names.get(patient_id) != name
+            )
+            read += len(rows)
+            if rows:
+                self._cursor = rows[-1].seq
+            if len(rows) < batch_size:
+                return read
+
+    async def run(self, session_factory: sessionmaker, rebuild_interval: float, refresh_interval: float) -> None:
+        """Build at startup, apply the change log every ``refresh_interval`` seconds and rebuild every ``rebuild_interval``."""
+        last_build = -math.inf
+        while True:
+            if time.monotonic() - last_build >= rebuild_interval or not self.ready:
+                try:
+                    await self.rebuild(session_factory)
+                    last_build = time.monotonic()
+                except Exception:
+                    logger.exception("Name index build failed")
+            else:
+                try:
+                    await self.refresh(session_factory)
+                except Exception:
+                    logger.exception("Name index refresh failed")
+            await asyncio.sleep(min(rebuild_interval, refresh_interval))
+
+    @staticmethod
+    def _matches_all(query: List[str], tokens: List[str]) -> bool:
+        return all(any(token.startswith(part) for token in tokens) for part in query)
+
+    def _targets(self) -> List[PrefixIndex]:
+        return [index for index in (self._index, self._building) if index is not None]
+
+    def _publish(self) -> None:
+        if self._index is None:
+            return
+        NAME_INDEX_PATIENTS.set(len(self._index))
+        NAME_INDEX_TOKENS.set(self._index.token_count)
+
+name_index = NameIndex()
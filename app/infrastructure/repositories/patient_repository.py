@@ -1,14 +1,36 @@
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, NoReturn, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DataError, IntegrityError
 from datetime import datetime
+from app.domain.entities.import_job import SyncResult
 from app.domain.entities.patient import Patient as PatientEntity
+from app.domain.entities.patient_change import ChangeFeedPage, ChangeOperation, PatientChange
 from app.domain.interfaces import IPatientRepository
+from app.domain.normalization import normalize_email, normalize_phone
 from app.models.patient import Patient as PatientModel
+from app.models.patient_change import PatientChange as PatientChangeModel
+from app.infrastructure.events.patient_events import patient_events
+from app.infrastructure.monitoring.tracing import traced_class
+from app.infrastructure.repositories.change_log import open_changes, stamp_changes, visible_horizon
+from app.infrastructure.repositories.duplicate_repository import DuplicateRepository
+from app.infrastructure.repositories.email_filter import email_filter
+from app.infrastructure.repositories.name_index import name_index
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository, StatDeltas
 
+DUPLICATE_EMAIL_MESSAGE = "Patient with this email already exists"
+# Session.info key holding the change log rows and rollup deltas collected
+# while changes are deferred.
+DEFERRED_CHANGES = "deferred_patient_changes"
+
+@traced_class
 class PatientRepository(IPatientRepository):
     def __init__(self, db: AsyncSession):
         self._db = db
+        self._stats = PatientStatsRepository(db)
+        self._duplicates = DuplicateRepository(db)
     
     async def create(self, patient: PatientEntity) -> PatientEntity:
         db_patient = PatientModel(
@@ -18,11 +40,153 @@ class PatientRepository(IPatientRepository):
         )
         
         self._db.add(db_patient)
-        await self._db.commit()
+        deltas = StatDeltas()
+        deltas.created(db_patient.email_normalized)
+        await self._commit_unique_email(db_patient, ChangeOperation.CREATED, deltas)
         await self._db.refresh(db_patient)
+        email_filter.add(db_patient.email)
+        name_index.add(db_patient.id, db_patient.name)
+        patient_events.changed()
         
         return self._to_entity(db_patient)
     
+    async def create_many(self, patients: List[PatientEntity]) -> int:
+        """Insert patients in one statement, skipping emails or source ids that already exist.
+        
+        Returns the number of rows actually inserted. A row the database
+        rejects fails the whole batch with ``ValueError``.
+        """
+        try:
+            inserted = await self._insert_new(patients)
+            deltas = StatDeltas()
+            for _, _, email_normalized in inserted:
+                deltas.created(email_normalized)
+            await self._record_changes(((patient_id, ChangeOperation.CREATED) for patient_id, _, _ in inserted), deltas)
+            await self._db.commit()
+        except (DataError, IntegrityError) as e:
+            await self._reject_batch(e)
+        email_filter.add_many(patient.email for patient in patients)
+        name_index.add_many((patient_id, name) for patient_id, name, _ in inserted)
+        if inserted:
+            patient_events.changed()
+        
+        return len(inserted)
+    
+    async def sync_many(self, source: str, patients: List[PatientEntity]) -> SyncResult:
+        """Apply a batch from ``source`` with one lookup, one insert and one update.
+        
+        Rows are matched on (source, source_id), falling back to unclaimed rows
+        with the same email. Rows whose content hash is unchanged are left alone.
+        """
+        incoming = {patient.source_id: patient for patient in patients}
+        if not incoming:
+            return SyncResult()
+        
+        result = await self._db.execute(
+            select(
+                PatientModel.id,
+                PatientModel.source,
+                PatientModel.source_id,
+                PatientModel.email_normalized,
+                PatientModel.content_hash
+            )
+            .where(or_(
+                and_(PatientModel.source == source, PatientModel.source_id.in_(list(incoming))),
+                PatientModel.email_normalized.in_([normalize_email(patient.email) for patient in incoming.values()])
+            ))
+        )
+        rows = result.all()
+        by_email = {row.email_normalized: row for row in rows}
+        by_source_id = {row.source_id: row for row in rows if row.source == source and row.source_id in incoming}
+        
+        outcome = SyncResult()
+        to_insert: List[PatientEntity] = []
+        to_update: List[Dict[str, Any]] = []
+        deltas = StatDeltas()
+        now = datetime.utcnow()
+        for source_id, patient in incoming.items():
+            content_hash = patient.content_hash or patient.compute_content_hash()
+            email = normalize_email(patient.email)
+            row = by_source_id.get(source_id)
+            if row is None:
+                row = by_email.get(email)
+                if row is not None and row.source_id is not None:
+                    continue
+            if row is None:
+                to_insert.append(patient)
+            elif row.content_hash == content_hash and row.source_id == source_id:
+                outcome.unchanged += 1
+            elif by_email.get(email, row).id != row.id:
+                continue
+            else:
+                deltas.email_changed(row.email_normalized, email)
+                to_update.append({
+                    "id": row.id,
+                    "name": patient.name,
+                    "email": patient.email,
+                    "phone": patient.phone,
+                    **self._contact_columns(patient),
+                    "source": source,
+                    "source_id": source_id,
+                    "content_hash": content_hash,
+                    "updated_at": now
+                })
+        
+        try:
+            inserted = await self._insert_new(to_insert, source)
+            outcome.created = len(inserted)
+            for _, _, email_normalized in inserted:
+                deltas.created(email_normalized)
+            if to_update:
+                await self._db.execute(update(PatientModel), to_update)
+                await self._duplicates.mark_stale([row["id"] for row in to_update])
+                outcome.updated = len(to_update)
+            await self._record_changes(
+                [(patient_id, ChangeOperation.CREATED) for patient_id, _, _ in inserted]
+                + [(row["id"], ChangeOperation.UPDATED) for row in to_update],
+                deltas
+            )
+            await self._db.commit()
+        except (DataError, IntegrityError) as e:
+            await self._reject_batch(e)
+        email_filter.add_many(patient.email for patient in to_insert)
+        email_filter.add_many(row["email"] for row in to_update)
+        name_index.add_many((patient_id, name) for patient_id, name, _ in inserted)
+        name_index.add_many((row["id"], row["name"]) for row in to_update)
+        if inserted or to_update:
+            patient_events.changed()
+        
+        return outcome
+    
+    async def _insert_new(self, patients: List[PatientEntity], source: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """Insert the patients that do not conflict; returns (id, name, normalized email) of the rows written."""
+        if not patients:
+            return []
+        
+        dialect = self._db.get_bind().dialect.name
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = (
+            insert(PatientModel)
+            .on_conflict_do_nothing()
+            .returning(PatientModel.id, PatientModel.name, PatientModel.email_normalized)
+        )
+        result = await self._db.execute(
+            statement,
+            [
+                {
+                    "name": patient.name,
+                    "email": patient.email,
+                    "phone": patient.phone,
+                    **self._contact_columns(patient),
+                    "source": source or patient.source,
+                    "source_id": patient.source_id,
+                    "content_hash": patient.content_hash or patient.compute_content_hash()
+                }
+                for patient in patients
+            ]
+        )
+        return [tuple(row) for row in result.all()]
+    
     async def get_by_id(self, patient_id: int) -> Optional[PatientEntity]:
         result = await self._db.execute(
             select(PatientModel).where(PatientModel.id == patient_id)
@@ -33,19 +197,35 @@ class PatientRepository(IPatientRepository):
     
     async def get_by_email(self, email: str) -> Optional[PatientEntity]:
         result = await self._db.execute(
-            select(PatientModel).where(PatientModel.email == email)
+            select(PatientModel).where(PatientModel.email_normalized == normalize_email(email))
         )
         db_patient = result.scalar_one_or_none()
         
         return self._to_entity(db_patient) if db_patient else None
     
+    async def find_by_contact(
+        self,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        limit: int = 100
+    ) -> List[PatientEntity]:
+        """Indexed lookup on the normalized email and/or phone columns."""
+        query = select(PatientModel)
+        if email is not None:
+            query = query.where(PatientModel.email_normalized == normalize_email(email))
+        if phone is not None:
+            query = query.where(PatientModel.phone_normalized == normalize_phone(phone))
+        result = await self._db.execute(query.order_by(PatientModel.id).limit(limit))
+        
+        return [self._to_entity(db_patient) for db_patient in result.scalars()]
+    
     async def get_patients(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[PatientEntity]:
         query = select(PatientModel)
         
         if search:
             query = query.where(PatientModel.name.ilike(f"%{search}%"))
         
-        query = query.offset(skip).limit(limit).order_by(PatientModel.created_at.desc())
+        query = query.offset(skip).limit(limit).order_by(PatientModel.created_at.desc(), PatientModel.id.desc())
         result = await self._db.execute(query)
         db_patients = result.scalars().all()
         
@@ -60,13 +240,22 @@ class PatientRepository(IPatientRepository):
         if not db_patient:
             return None
         
+        previous_email = db_patient.email_normalized
+        previous_contact = (db_patient.name, db_patient.email, db_patient.phone)
         for field, value in patient_data.items():
             if hasattr(db_patient, field) and value is not None:
                 setattr(db_patient, field, value)
         
+        if (db_patient.name, db_patient.email, db_patient.phone) != previous_contact:
+            await self._duplicates.mark_stale([patient_id])
         db_patient.updated_at = datetime.utcnow()
-        await self._db.commit()
+        deltas = StatDeltas()
+        deltas.email_changed(previous_email, db_patient.email_normalized)
+        await self._commit_unique_email(db_patient, ChangeOperation.UPDATED, deltas)
         await self._db.refresh(db_patient)
+        email_filter.add(db_patient.email)
+        name_index.add(db_patient.id, db_patient.name)
+        patient_events.changed()
         
         return self._to_entity(db_patient)
     
@@ -80,10 +269,120 @@ class PatientRepository(IPatientRepository):
             return False
         
         await self._db.delete(db_patient)
+        deltas = StatDeltas()
+        deltas.removed(db_patient.email_normalized, db_patient.created_at)
+        await self._record_changes([(patient_id, ChangeOperation.DELETED)], deltas)
         await self._db.commit()
+        name_index.remove(patient_id)
+        patient_events.changed()
         
         return True
     
+    async def get_changes(self, since: int = 0, limit: int = 100) -> ChangeFeedPage:
+        """Up to ``limit`` changes with a seq above ``since``, oldest first, with the patients' current rows.
+        
+        Within the page only the latest change of each patient is kept, and
+        writes to patients deleted since are left to their tombstone.
+        """
+        statement = (
+            select(PatientChangeModel, PatientModel)
+            .outerjoin(PatientModel, PatientModel.id == PatientChangeModel.patient_id)
+            .where(PatientChangeModel.seq > since)
+            .order_by(PatientChangeModel.seq)
+            .limit(limit + 1)
+        )
+        if self._is_postgresql():
+            statement = statement.where(PatientChangeModel.seq <= visible_horizon())
+        result = await self._db.execute(statement)
+        rows = result.all()
+        page = ChangeFeedPage(next_cursor=since, has_more=len(rows) > limit)
+        latest: Dict[int, PatientChange] = {}
+        for change, db_patient in rows[:limit]:
+            page.next_cursor = change.seq
+            operation = ChangeOperation(change.operation)
+            if operation != ChangeOperation.DELETED and db_patient is None:
+                continue
+            latest.pop(change.patient_id, None)
+            latest[change.patient_id] = PatientChange(
+                seq=change.seq,
+                patient_id=change.patient_id,
+                operation=operation,
+                changed_at=change.changed_at,
+                patient=self._to_entity(db_patient) if db_patient is not None else None
+            )
+        page.changes = list(latest.values())
+        return page
+    
+    async def last_change_seq(self) -> int:
+        if self._is_postgresql():
+            return await self._db.scalar(select(visible_horizon()))
+        return await self._db.scalar(select(func.coalesce(func.max(PatientChangeModel.seq), 0)))
+    
+    def defer_changes(self) -> None:
+        """Collect the session's change log rows and rollup deltas until ``record_deferred_changes``.
+        
+        For a session whose commits only release savepoints: the rollup rows
+        are then locked only for the end of the outer transaction.
+        """
+        self._db.info[DEFERRED_CHANGES] = ([], StatDeltas())
+    
+    async def record_deferred_changes(self) -> None:
+        """Write what was collected since ``defer_changes`` and commit."""
+        rows, deltas = self._db.info.pop(DEFERRED_CHANGES)
+        await self._write_changes(rows, deltas)
+        await self._db.commit()
+    
+    async def _commit_unique_email(self, db_patient: PatientModel, operation: ChangeOperation, deltas: StatDeltas) -> None:
+        """Log the change, update the rollups and commit, mapping a unique-email violation to the same error the pre-check raises.
+        
+        The email filter lets callers skip the pre-check, so the constraint is
+        what finally rejects duplicates written by another worker.
+        """
+        try:
+            await self._db.flush()
+            await self._record_changes([(db_patient.id, operation)], deltas)
+            await self._db.commit()
+        except IntegrityError:
+            await self._db.rollback()
+            raise ValueError(DUPLICATE_EMAIL_MESSAGE)
+    
+    async def _reject_batch(self, error: Exception) -> NoReturn:
+        """Roll back a batch the database refused and raise ``ValueError`` so importers can retry row by row."""
+        await self._db.rollback()
+        reason = str(getattr(error, "orig", error)).splitlines()[0]
+        raise ValueError(f"Rejected by the database: {reason}") from error
+    
+    async def _record_changes(self, changes: Iterable[Tuple[int, ChangeOperation]], deltas: StatDeltas) -> None:
+        """Append to the change log and apply the rollup deltas inside the caller's transaction, or collect them while deferred."""
+        rows = [{"patient_id": patient_id, "operation": operation.value} for patient_id, operation in changes]
+        deferred = self._db.info.get(DEFERRED_CHANGES)
+        if deferred is not None:
+            deferred[0].extend(rows)
+            deferred[1].update(deltas)
+        else:
+            await self._write_changes(rows, deltas)
+    
+    async def _write_changes(self, rows: List[Dict[str, Any]], deltas: StatDeltas) -> None:
+        if not rows:
+            return
+        if self._is_postgresql():
+            await self._db.execute(open_changes())
+            await self._db.execute(insert(PatientChangeModel), rows)
+            await self._db.execute(stamp_changes())
+        else:
+            await self._db.execute(insert(PatientChangeModel), rows)
+        await self._stats.apply(deltas)
+    
+    def _is_postgresql(self) -> bool:
+        return self._db.get_bind().dialect.name == "postgresql"
+    
+    @staticmethod
+    def _contact_columns(patient: PatientEntity) -> Dict[str, str]:
+        return {
+            "email_normalized": normalize_email(patient.email),
+            "phone_normalized": normalize_phone(patient.phone)
+        }
+    
     def _to_entity(self, db_patient: PatientModel) -> PatientEntity:
         return PatientEntity(
             id=db_patient.id,
@@ -91,5 +390,8 @@ class PatientRepository(IPatientRepository):
             email=db_patient.email,
             phone=db_patient.phone,
             created_at=db_patient.created_at,
-            updated_at=db_patient.updated_at
+            updated_at=db_patient.updated_at,
+            source=db_patient.source,
+            source_id=db_patient.source_id,
+            content_hash=db_patient.content_hash
         )
@@ -0,0 +1,143 @@
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import ColumnElement, Executable, Select, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.interfaces import IPatientStatsRepository
+from app.models.patient import Patient as PatientModel
+from app.models.patient_stats import PatientStat
+from app.infrastructure.monitoring.tracing import traced_class
+
+DAY = "day"
+DOMAIN = "domain"
+TOTAL = "total"
+ACTIVE = "active"
+
+def email_domain(email_normalized: str) -> str:
+    return email_normalized.rpartition("@")[2]
+
+def utc_day(moment: Optional[datetime]) -> str:
+    if moment is None:
+        moment = datetime.utcnow()
+    elif moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date().isoformat()
+
+def rebuild_statements(dialect: str) -> List[Executable]:
+    """Statements recomputing every rollup from ``patients``; migration 009 runs them too."""
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    columns = [PatientStat.dimension, PatientStat.key, PatientStat.count]
+    return [delete(PatientStat)] + [insert(PatientStat).from_select(columns, counts) for counts in _counts(dialect)]
+
+def increment_statements(dialect: str, *criteria: ColumnElement[bool]) -> List[Executable]:
+    """Statements adding the patients matching ``criteria`` to the rollups, for loads that bypass the repository."""
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    columns = [PatientStat.dimension, PatientStat.key, PatientStat.count]
+    return [add_counts(insert(PatientStat).from_select(columns, counts)) for counts in _counts(dialect, *criteria)]
+
+def add_counts(statement):
+    """Make an insert into ``patient_stats`` add its counts to the existing rows."""
+    return statement.on_conflict_do_update(
+        index_elements=[PatientStat.dimension, PatientStat.key],
+        set_={"count": PatientStat.count + statement.excluded.count}
+    )
+
+def _counts(dialect: str, *criteria: ColumnElement[bool]) -> List[Select]:
+    """(dimension, key, count) selects over the matching patients, one per dimension."""
+    if dialect == "postgresql":
+        day = func.to_char(func.timezone("UTC", PatientModel.created_at), "YYYY-MM-DD")
+        domain = func.split_part(PatientModel.email_normalized, "@", 2)
+    else:
+        day = func.strftime("%Y-%m-%d", PatientModel.created_at)
+        domain = func.substr(PatientModel.email_normalized, func.instr(PatientModel.email_normalized, "@") + 1)
+
+    # Rows are written in key order, the order StatDeltas are applied in, so
+    # concurrent increments cannot deadlock.
+    counts = [
+        select(literal(dimension), key, func.count()).select_from(PatientModel).where(*criteria).group_by(key).order_by(key)
+        for dimension, key in ((DAY, day), (DOMAIN, domain))
+    ]
+    counts.append(select(literal(TOTAL), literal(ACTIVE), func.count()).select_from(PatientModel).where(*criteria))
+    return counts
+
+class StatDeltas(Counter):
+    """Counter increments keyed by (dimension, key), collected for one transaction.
+
+    Every counter describes the patients that exist, so a deletion also
+    decrements the day its patient was created, matching what a rebuild
+    from ``patients`` yields.
+    """
+
+    def created(self, email_normalized: str, created_at: Optional[datetime] = None) -> None:
+        self[DAY, utc_day(created_at)] += 1
+        self[DOMAIN, email_domain(email_normalized)] += 1
+        self[TOTAL, ACTIVE] += 1
+
+    def removed(self, email_normalized: str, created_at: Optional[datetime]) -> None:
+        self[DAY, utc_day(created_at)] -= 1
+        self[DOMAIN, email_domain(email_normalized)] -= 1
+        self[TOTAL, ACTIVE] -= 1
+
+    def email_changed(self, old: str, new: str) -> None:
+        if email_domain(old) != email_domain(new):
+            self[DOMAIN, email_domain(old)] -= 1
+            self[DOMAIN, email_domain(new)] += 1
+
+@traced_class
+class PatientStatsRepository(IPatientStatsRepository):
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def apply(self, deltas: StatDeltas) -> None:
+        """Add the increments inside the caller's transaction, in one statement."""
+        rows = [
+            {"dimension": dimension, "key": key, "count": count}
+            for (dimension, key), count in sorted(deltas.items())
+            if count
+        ]
+        if not rows:
+            return
+        await self._db.execute(add_counts(self._insert()), rows)
+
+    async def active_total(self) -> int:
+        total = await self._db.scalar(
+            select(PatientStat.count).where(PatientStat.dimension == TOTAL, PatientStat.key == ACTIVE)
+        )
+        return total or 0
+
+    async def created_per_day(self, since: date) -> Dict[date, int]:
+        result = await self._db.execute(
+            select(PatientStat.key, PatientStat.count)
+            .where(PatientStat.dimension == DAY, PatientStat.key >= since.isoformat())
+        )
+        return {date.fromisoformat(key): count for key, count in result}
+
+    async def top_domains(self, limit: int = 10) -> List[Tuple[str, int]]:
+        result = await self._db.execute(
+            select(PatientStat.key, PatientStat.count)
+            .where(PatientStat.dimension == DOMAIN, PatientStat.count > 0)
+            .order_by(PatientStat.count.desc(), PatientStat.key)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result]
+
+    async def rebuild(self) -> None:
+        """Recompute every rollup from ``patients`` and commit.
+
+        On PostgreSQL ``patients`` is locked in SHARE mode first, which waits
+        for running writes and holds new ones off until the commit: writes
+        committed before it are counted here, later ones add their increments
+        on top.
+        """
+        dialect = self._db.get_bind().dialect.name
+        if dialect == "postgresql":
+            await self._db.execute(text(f"LOCK TABLE {PatientModel.__tablename__} IN SHARE MODE"))
+        for statement in rebuild_statements(dialect):
+            await self._db.execute(statement)
+        await self._db.commit()
+
+    def _insert(self):
+        dialect = self._db.get_bind().dialect.name
+        return (postgresql_insert if dialect == "postgresql" else sqlite_insert)(PatientStat)
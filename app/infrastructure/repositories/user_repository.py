@@ -4,7 +4,9 @@ from sqlalchemy import select
 from app.domain.entities.user import User as UserEntity
 from app.domain.interfaces import IUserRepository
 from app.models.user import User as UserModel
+from app.infrastructure.monitoring.tracing import traced_class
 
+@traced_class
 class UserRepository(IUserRepository):
     def __init__(self, db: AsyncSession):
         self._db = db
@@ -0,0 +1,124 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+
+SYNTHETIC_SOURCE = "synthetic"
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example"
+BLOCK_SIZE = 1 << 16
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Dorothy", "George", "Melissa", "Timothy", "Deborah",
+    "Ronald", "Stephanie", "Edward", "Rebecca", "Jason", "Sharon", "Jeffrey", "Laura", "Ryan", "Cynthia",
+    "Jacob", "Kathleen", "Gary", "Amy", "Nicholas", "Angela", "Eric", "Shirley", "Jonathan", "Anna",
+    "Stephen", "Brenda", "Larry", "Pamela", "Justin", "Emma", "Scott", "Nicole", "Brandon", "Helen",
+    "Benjamin", "Samantha", "Samuel", "Katherine", "Gregory", "Christine", "Alexander", "Debra", "Frank", "Rachel",
+    "Lucas", "Ana", "Pedro", "Mariana", "Rafael", "Juliana", "Mateus", "Beatriz", "Thiago", "Camila",
+])
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Gomez", "Phillips", "Evans", "Turner", "Diaz", "Parker", "Cruz", "Edwards", "Collins", "Reyes",
+    "Stewart", "Morris", "Morales", "Murphy", "Cook", "Rogers", "Gutierrez", "Ortiz", "Morgan", "Cooper",
+    "Peterson", "Bailey", "Reed", "Kelly", "Howard", "Ramos", "Kim", "Cox", "Ward", "Richardson",
+    "Watson", "Brooks", "Chavez", "Wood", "James", "Bennett", "Gray", "Mendoza", "Ruiz", "Hughes",
+    "O'Brien", "O'Connor", "D'Angelo", "Smith-Jones", "Silva", "Santos", "Oliveira", "Souza", "Costa", "Pereira",
+])
+
+def _email_slugs(names: np.ndarray) -> np.ndarray:
+    return np.char.replace(np.char.replace(np.char.lower(names), "'", ""), "-", "")
+
+FIRST_SLUGS = _email_slugs(FIRST_NAMES)
+LAST_SLUGS = _email_slugs(LAST_NAMES)
+
+@dataclass
+class PatientColumns:
+    """Column-oriented batch of generated patients, ready for COPY or executemany."""
+    source_ids: List[str]
+    names: List[str]
+    emails: List[str]
+    phones: List[str]
+    normalized_phones: List[str]
+    content_hashes: List[str]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Iterator[Tuple[str, ...]]:
+        """Rows in ``COPY_COLUMNS`` order; generated emails are already lower-case."""
+        return zip(
+            self.names, self.emails, self.phones, self.emails, self.normalized_phones,
+            [SYNTHETIC_SOURCE] * len(self), self.source_ids, self.content_hashes,
+        )
+
+COPY_COLUMNS = ("name", "email", "phone", "email_normalized", "phone_normalized", "source", "source_id", "content_hash")
+
+class SyntheticPopulation:
+    """Deterministic synthetic patients that pass ``PatientBase`` validation.
+
+    Row ``i`` depends only on ``seed`` and ``i``: each block of ``BLOCK_SIZE``
+    rows draws from its own generator seeded with ``(seed, block)``, so any
+    range can be generated independently and in any batch size. Emails embed
+    the row index, which keeps them unique across the whole population.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._cached: Optional[Tuple[int, Tuple[np.ndarray, ...]]] = None
+
+    def generate(self, start: int, count: int) -> PatientColumns:
+        parts = []
+        end = start + count
+        position = start
+        while position < end:
+            block, offset = divmod(position, BLOCK_SIZE)
+            take = min(BLOCK_SIZE - offset, end - position)
+            parts.append(tuple(column[offset:offset + take] for column in self._block(block)))
+            position += take
+
+        columns = PatientColumns([], [], [], [], [], [])
+        for source_ids, names, emails, phones, normalized_phones in parts:
+            columns.source_ids.extend(source_ids.tolist())
+            columns.names.extend(names.tolist())
+            columns.emails.extend(emails.tolist())
+            columns.phones.extend(phones.tolist())
+            columns.normalized_phones.extend(normalized_phones.tolist())
+        columns.content_hashes = [
+            hashlib.sha256(f"{name}\x1f{email}\x1f{phone}".encode()).hexdigest()
+            for name, email, phone in zip(columns.names, columns.emails, columns.phones)
+        ]
+        return columns
+
+    def _block(self, block: int) -> Tuple[np.ndarray, ...]:
+        if self._cached is not None and self._cached[0] == block:
+            return self._cached[1]
+        rng = np.random.default_rng([self.seed, block])
+        first = rng.integers(len(FIRST_NAMES), size=BLOCK_SIZE)
+        last = rng.integers(len(LAST_NAMES), size=BLOCK_SIZE)
+        area = rng.integers(201, 1000, size=BLOCK_SIZE)
+        exchange = rng.integers(200, 1000, size=BLOCK_SIZE)
+        line = rng.integers(0, 10000, size=BLOCK_SIZE)
+        source_ids = np.arange(block * BLOCK_SIZE, (block + 1) * BLOCK_SIZE).astype(str)
+
+        names = np.char.add(np.char.add(FIRST_NAMES[first], " "), LAST_NAMES[last])
+        local_parts = np.char.add(np.char.add(FIRST_SLUGS[first], "."), LAST_SLUGS[last])
+        emails = np.char.add(
+            np.char.add(np.char.add(local_parts, "."), source_ids),
+            "@" + SYNTHETIC_EMAIL_DOMAIN,
+        )
+        area, exchange, line = area.astype(str), exchange.astype(str), np.char.zfill(line.astype(str), 4)
+        phones = np.char.add(
+            np.char.add(np.char.add("+1-", area), np.char.add("-", exchange)),
+            np.char.add("-", line),
+        )
+        normalized_phones = np.char.add(np.char.add("+1", area), np.char.add(exchange, line))
+        columns = (source_ids, names, emails, phones, normalized_phones)
+        self._cached = (block, columns)
+        return columns
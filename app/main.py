@@ -1,16 +1,105 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.openapi.utils import get_openapi
 from pydantic import ValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
+from app.config import settings
+from app.database.connection import engine
+from app.infrastructure.external.http_client import create_http_client
+from app.infrastructure.fhir.bulk_loader import transform_pool
+from app.infrastructure.jobs.executor import JobExecutor
+from app.infrastructure.repositories.email_filter import email_filter
+from app.infrastructure.repositories.name_index import name_index
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.events.patient_events import patient_events
+from app.infrastructure.monitoring.metrics import (
+    instrument_pool,
+    mark_worker_dead,
+    render_metrics,
+    run_process_sampler,
+)
+from app.infrastructure.monitoring.event_loop import EventLoopMonitor
+from app.infrastructure.monitoring.memory import RssWatchdog
+from app.infrastructure.monitoring.sql import instrument_engine
+from app.infrastructure.monitoring.structured_logging import configure_logging
+from app.infrastructure.monitoring.tracing import configure_tracing, shutdown_tracing
+from app.presentation.dependencies import app_session_factory
+from app.presentation.middleware.metrics import PrometheusMiddleware, route_template
+from app.presentation.middleware.profiler import ProfilerMiddleware
+from app.presentation.middleware.request_context import RequestContextMiddleware
+from app.presentation.middleware.tracing import TracingMiddleware
+from app.presentation.middleware.sql import QueryStatsMiddleware
 
-logging.basicConfig(level=logging.INFO)
+configure_logging(
+    level=settings.log_level,
+    json_output=settings.log_json,
+    queue_size=settings.log_queue_size,
+    sampling_rules=settings.log_sampling,
+    rate_limit=settings.log_rate_limit,
+    rate_limit_window=settings.log_rate_limit_window,
+)
 logger = logging.getLogger(__name__)
 
+instrument_pool(engine)
+instrument_engine(engine)
+configure_tracing(settings.tracing_exporter, settings.tracing_sample_ratio)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = create_http_client()
+    app.state.job_executor = JobExecutor(settings.import_job_concurrency)
+    background_tasks = [
+        asyncio.create_task(run_process_sampler(settings.process_metrics_interval)),
+        asyncio.create_task(patient_controller.watch_import_jobs(
+            app_session_factory(app),
+            app.state.job_executor,
+            settings.import_job_heartbeat_interval,
+            settings.import_job_stale_after
+        )),
+    ]
+    if settings.event_loop_monitor_enabled:
+        monitor = EventLoopMonitor(settings.event_loop_monitor_interval, settings.event_loop_block_threshold)
+        background_tasks.append(asyncio.create_task(monitor.run()))
+    if settings.max_worker_rss_mb:
+        watchdog = RssWatchdog(settings.max_worker_rss_mb * 2**20, settings.rss_watchdog_interval)
+        background_tasks.append(asyncio.create_task(watchdog.run()))
+    if settings.email_filter_enabled:
+        email_filter.error_rate = settings.email_filter_error_rate
+        background_tasks.append(asyncio.create_task(
+            email_filter.run(app_session_factory(app), settings.email_filter_rebuild_interval)
+        ))
+    if settings.name_index_enabled:
+        background_tasks.append(asyncio.create_task(
+            name_index.run(
+                app_session_factory(app),
+                settings.name_index_rebuild_interval,
+                settings.name_index_refresh_interval
+            )
+        ))
+    patient_events.queue_size = settings.patient_stream_queue_size
+    background_tasks.append(asyncio.create_task(patient_events.run(
+        app_session_factory(app),
+        PatientRepository,
+        patient_stream_controller.encode_change_event,
+        settings.patient_stream_heartbeat_interval
+    )))
+    yield
+    await app.state.job_executor.shutdown(settings.import_job_shutdown_timeout)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await transform_pool.shutdown()
+    await app.state.http_client.aclose()
+    shutdown_tracing()
+    mark_worker_dead()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Nuvie Backend Challenge",
     description="Sistema para gerenciamento de dados de pacientes com integração Synthea",
     version="2.0.0",
@@ -32,6 +121,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
+def _log_fields(request: Request, status_code: int, **fields) -> dict:
+    return {
+        "method": request.method,
+        "route": route_template(request.scope),
+        "status_code": status_code,
+        **fields
+    }
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -41,7 +143,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         message = error["msg"]
         errors.append(f"{field}: {message}")
     
-    logger.warning(f"Validation error on {request.url}: {errors}")
+    logger.warning("Request validation failed", extra=_log_fields(request, 400, errors=errors))
     return JSONResponse(
         status_code=400,
         content={
@@ -59,7 +161,7 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
         message = error["msg"]
         errors.append(f"{field}: {message}")
     
-    logger.warning(f"Pydantic validation error on {request.url}: {errors}")
+    logger.warning("Pydantic validation failed", extra=_log_fields(request, 400, errors=errors))
     return JSONResponse(
         status_code=400,
         content={
@@ -71,18 +173,23 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    logger.error(f"HTTP error {exc.status_code} on {request.url}: {exc.detail}")
+    logger.log(
+        logging.ERROR if exc.status_code >= 500 else logging.WARNING,
+        "HTTP error response",
+        extra=_log_fields(request, exc.status_code, detail=exc.detail)
+    )
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "error": f"HTTP {exc.status_code}",
             "message": exc.detail
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unexpected error on {request.url}: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception", exc_info=exc, extra=_log_fields(request, 500))
     return JSONResponse(
         status_code=500,
         content={
@@ -91,10 +198,15 @@ async def general_exception_handler(request: Request, exc: Exception):
         }
     )
 
-from app.presentation.controllers import patient_controller, auth_controller
+from app.presentation.controllers import patient_controller, auth_controller, admin_controller, fhir_controller, duplicate_controller, patient_stream_controller, batch_controller
 
 app.include_router(auth_controller.router, prefix="/auth", tags=["authentication"])
+app.include_router(duplicate_controller.router, prefix="/patients/duplicates", tags=["patients"])
+app.include_router(patient_stream_controller.router, prefix="/patients/stream", tags=["patients"])
 app.include_router(patient_controller.router, prefix="/patients", tags=["patients"])
+app.include_router(admin_controller.router, prefix="/admin", tags=["admin"])
+app.include_router(fhir_controller.router, prefix="/fhir", tags=["fhir"])
+app.include_router(batch_controller.router, prefix="/batch", tags=["batch"])
 
 def custom_openapi():
     if app.openapi_schema:
@@ -116,7 +228,7 @@ def custom_openapi():
         }
     }
     
-    protected_paths = ["/patients", "/auth/me"]
+    protected_paths = ["/patients", "/auth/me", "/admin", "/fhir", "/batch"]
     for path, path_item in openapi_schema["paths"].items():
         if any(protected_path in path for protected_path in protected_paths):
             for method, operation in path_item.items():
@@ -145,11 +257,7 @@ async def health_check():
         "version": "2.0.0"
     }
 
-@app.get("/metrics")
+@app.get("/metrics", include_in_schema=False)
 async def metrics():
-    return {
-        "service": "nuvie-backend",
-        "uptime": "healthy",
-        "database": "connected",
-        "memory_usage": "optimal"
-    }
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,5 +1,9 @@
 from .patient import Patient
 from .user import User
+from .import_job import ImportJob
+from .duplicate import PatientBlockingKey, DuplicateMatch, DuplicateCluster
+from .patient_change import PatientChange
+from .patient_stats import PatientStat
 from .base import Base
 
-__all__ = ["Patient", "User", "Base"]
+__all__ = ["Patient", "User", "ImportJob", "PatientBlockingKey", "DuplicateMatch", "DuplicateCluster", "PatientChange", "PatientStat", "Base"]
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+# PostgreSQL advisory lock held by a running duplicate scan, so workers and
+# the CLI never scan at the same time.
+DUPLICATE_SCAN_LOCK_ID = 0x64757073
+
+class PatientBlockingKey(Base):
+    __tablename__ = "patient_blocking_keys"
+
+    key = Column(String(80), primary_key=True)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+class DuplicateMatch(Base):
+    __tablename__ = "duplicate_matches"
+
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True)
+    matched_patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True, index=True)
+    score = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class DuplicateCluster(Base):
+    __tablename__ = "duplicate_clusters"
+
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True)
+    cluster_id = Column(Integer, nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,13 +1,33 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
+from app.domain.normalization import normalize_email, normalize_phone
 from app.models.base import Base
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (UniqueConstraint("source", "source_id", name="uq_patients_source_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, index=True)
     email = Column(String(100), nullable=False, unique=True, index=True)
     phone = Column(String(20), nullable=False)
+    email_normalized = Column(String(100), nullable=False, unique=True, index=True)
+    phone_normalized = Column(String(16), nullable=False, index=True)
+    source = Column(String(50), nullable=True)
+    source_id = Column(String(100), nullable=True)
+    content_hash = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Keeps the lookup columns in step for ORM writes; Core inserts and bulk
+    # updates set them explicitly.
+    @validates("email")
+    def _normalize_email(self, key, value):
+        self.email_normalized = normalize_email(value)
+        return value
+    
+    @validates("phone")
+    def _normalize_phone(self, key, value):
+        self.phone_normalized = normalize_phone(value)
+        return value
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, text
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class PatientChange(Base):
+    """Append-only log of patient writes; ``seq`` is the change feed cursor.
+
+    There is no foreign key to ``patients`` so tombstones outlive the rows
+    they describe.
+    """
+    __tablename__ = "patient_changes"
+    __table_args__ = (
+        Index("ix_patient_changes_unstamped", "seq", postgresql_where=text("visible_after IS NULL")),
+        # SQLite would otherwise reuse the highest seq after it is deleted.
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    patient_id = Column(Integer, nullable=False, index=True)
+    operation = Column(String(10), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # PostgreSQL only: the xid horizon after which the row is final, see
+    # app.infrastructure.repositories.change_log.
+    visible_after = Column(BigInteger, nullable=True)
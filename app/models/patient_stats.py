@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Index, String
+from app.models.base import Base
+
+class PatientStat(Base):
+    """Rollup counters kept current by the patient repository.
+
+    One row per (dimension, key) over the patients that exist: per UTC
+    creation day (``day``/``YYYY-MM-DD``), per email domain
+    (``domain``/``example.com``) and in total (``total``/``active``).
+    """
+    __tablename__ = "patient_stats"
+    __table_args__ = (Index("ix_patient_stats_dimension_count", "dimension", "count"),)
+
+    dimension = Column(String(10), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
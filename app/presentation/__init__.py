@@ -1,3 +1,3 @@
-from .controllers import patient_controller, auth_controller
+from .controllers import patient_controller, auth_controller, admin_controller, fhir_controller
 
-__all__ = ["patient_controller", "auth_controller"]
+__all__ = ["patient_controller", "auth_controller", "admin_controller", "fhir_controller"]
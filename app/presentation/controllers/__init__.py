@@ -1,4 +1,6 @@
 from .patient_controller import router as patient_router
 from .auth_controller import router as auth_router
+from .admin_controller import router as admin_router
+from .fhir_controller import router as fhir_router
 
-__all__ = ["patient_router", "auth_router"]
+__all__ = ["patient_router", "auth_router", "admin_router", "fhir_router"]
@@ -0,0 +1,87 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from pathlib import Path
+from typing import Any, Dict, List
+from app.config import settings
+from app.infrastructure.external.resilience import circuit_breakers
+from app.infrastructure.monitoring.memory import memory_diagnostics
+from app.schemas.user import User
+from app.presentation.dependencies import get_current_superuser
+from app.presentation.middleware.profiler import PROFILE_ID_PATTERN, profile_path
+
+router = APIRouter()
+
+@router.get("/profiles", response_model=List[str])
+async def list_profiles(
+    current_user: User = Depends(get_current_superuser)
+):
+    directory = Path(settings.profiler_output_dir)
+    if not directory.is_dir():
+        return []
+    return sorted(
+        (path.name for path in directory.iterdir() if PROFILE_ID_PATTERN.match(path.name)),
+        reverse=True
+    )
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_superuser)
+):
+    path = profile_path(profile_id)
+    if path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    media_type = "text/html" if path.suffix == ".html" else "application/json"
+    return FileResponse(path, media_type=media_type, filename=profile_id)
+
+@router.post("/memory/snapshots", status_code=status.HTTP_201_CREATED)
+async def take_memory_snapshot(
+    current_user: User = Depends(get_current_superuser)
+) -> Dict[str, Any]:
+    return await asyncio.to_thread(memory_diagnostics.take_snapshot)
+
+@router.get("/memory/snapshots")
+async def list_memory_snapshots(
+    current_user: User = Depends(get_current_superuser)
+) -> List[Dict[str, Any]]:
+    return memory_diagnostics.list_snapshots()
+
+@router.get("/memory/snapshots/diff")
+async def diff_memory_snapshots(
+    from_id: int = Query(..., description="Older snapshot id"),
+    to_id: int = Query(..., description="Newer snapshot id"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(25, ge=1, le=500),
+    current_user: User = Depends(get_current_superuser)
+) -> List[Dict[str, Any]]:
+    stats = await asyncio.to_thread(memory_diagnostics.diff, from_id, to_id, group_by, limit)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found on this worker"
+        )
+    return stats
+
+@router.delete("/memory/snapshots")
+async def reset_memory_snapshots(
+    current_user: User = Depends(get_current_superuser)
+):
+    memory_diagnostics.reset()
+    return {"message": "Memory tracing stopped and snapshots cleared"}
+
+@router.get("/memory/objects")
+async def memory_object_counts(
+    limit: int = Query(25, ge=1, le=500),
+    current_user: User = Depends(get_current_superuser)
+) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(memory_diagnostics.object_counts, limit)
+
+@router.get("/external/circuits")
+async def list_circuit_breakers(
+    current_user: User = Depends(get_current_superuser)
+) -> List[Dict[str, Any]]:
+    return circuit_breakers.snapshot()
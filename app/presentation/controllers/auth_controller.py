@@ -6,6 +6,7 @@ from app.schemas.user import Token, User, UserCreate, UserLogin
 from app.application.use_cases.auth_use_cases import AuthUseCases
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.presentation.dependencies import get_current_user
+from app.presentation.middleware.sql import query_budget
 from app.config import settings
 
 router = APIRouter()
@@ -15,6 +16,7 @@ async def get_auth_use_cases(db: AsyncSession = Depends(get_db)) -> AuthUseCases
     return AuthUseCases(user_repository)
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
+@query_budget(4)
 async def register_user(
     user: UserCreate,
     auth_use_cases: AuthUseCases = Depends(get_auth_use_cases)
@@ -29,6 +31,7 @@ async def register_user(
         )
 
 @router.post("/token", response_model=Token)
+@query_budget(1)
 async def login_for_access_token(
     login_data: UserLogin,
     auth_use_cases: AuthUseCases = Depends(get_auth_use_cases)
@@ -50,6 +53,7 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=User)
+@query_budget(1)
 async def read_users_me(
     current_user: User = Depends(get_current_user)
 ):
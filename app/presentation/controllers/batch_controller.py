@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.config import settings
+from app.database.connection import get_session_factory, savepoint_session
+from app.infrastructure.events.patient_events import patient_events
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.repositories.name_index import name_index
+from app.presentation.controllers.patient_controller import build_patient_use_cases
+from app.presentation.dependencies import authenticate_credentials, security
+from app.schemas.batch import BatchItem, BatchItemResponse, BatchRequest, BatchResponse, PatientListParams
+from app.schemas.patient import Patient, PatientCreate, PatientUpdate
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+Handler = Callable[[PatientUseCases, Optional[int], Dict[str, str], Any], Awaitable[Tuple[int, Any]]]
+
+def error_body(status_code: int, message: str) -> Dict[str, Any]:
+    return {"error": f"HTTP {status_code}", "message": message}
+
+def validation_body(exc: ValidationError, location: str) -> Dict[str, Any]:
+    details = [
+        f"{' -> '.join(str(loc) for loc in (location, *error['loc']))}: {error['msg']}"
+        for error in exc.errors()
+    ]
+    return {"error": "Validation failed", "message": "The request contains invalid data", "details": details}
+
+def patient_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
+
+def dump_patient(patient) -> Dict[str, Any]:
+    return Patient.model_validate(patient).model_dump(mode="json")
+
+async def list_patients(use_cases: PatientUseCases, patient_id: Optional[int], query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    try:
+        params = PatientListParams.model_validate(query)
+    except ValidationError as e:
+        return status.HTTP_400_BAD_REQUEST, validation_body(e, "query")
+    patients = await use_cases.get_patients(skip=params.skip, limit=params.limit, search=params.search)
+    return status.HTTP_200_OK, [dump_patient(patient) for patient in patients]
+
+async def create_patient(use_cases: PatientUseCases, patient_id: Optional[int], query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    try:
+        patient = PatientCreate.model_validate(body)
+    except ValidationError as e:
+        return status.HTTP_400_BAD_REQUEST, validation_body(e, "body")
+    try:
+        created = await use_cases.create_patient(patient.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return status.HTTP_201_CREATED, dump_patient(created)
+
+async def get_patient(use_cases: PatientUseCases, patient_id: Optional[int], query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    patient = await use_cases.get_patient_by_id(patient_id)
+    if patient is None:
+        raise patient_not_found()
+    return status.HTTP_200_OK, dump_patient(patient)
+
+async def update_patient(use_cases: PatientUseCases, patient_id: Optional[int], query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    try:
+        patient_update = PatientUpdate.model_validate(body)
+    except ValidationError as e:
+        return status.HTTP_400_BAD_REQUEST, validation_body(e, "body")
+    try:
+        patient = await use_cases.update_patient(patient_id, patient_update.model_dump(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if patient is None:
+        raise patient_not_found()
+    return status.HTTP_200_OK, dump_patient(patient)
+
+async def delete_patient(use_cases: PatientUseCases, patient_id: Optional[int], query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    if not await use_cases.delete_patient(patient_id):
+        raise patient_not_found()
+    return status.HTTP_200_OK, {"message": "Patient deleted successfully"}
+
+# The patient routes a batch can address, mirroring patient_controller.
+ROUTES: List[Tuple[re.Pattern, Dict[str, Handler]]] = [
+    (re.compile(r"^/patients/?$"), {"GET": list_patients, "POST": create_patient}),
+    (re.compile(r"^/patients/(?P<patient_id>\d+)$"), {"GET": get_patient, "PUT": update_patient, "DELETE": delete_patient}),
+]
+
+async def run_request(db: AsyncSession, use_cases: PatientUseCases, item: BatchItem) -> BatchItemResponse:
+    url = urlsplit(item.path)
+    for pattern, handlers in ROUTES:
+        match = pattern.match(url.path)
+        if match is None:
+            continue
+        handler = handlers.get(item.method)
+        if handler is None:
+            return BatchItemResponse(id=item.id, status=405, body=error_body(405, "Method Not Allowed"))
+        patient_id = match.groupdict().get("patient_id")
+        try:
+            status_code, body = await handler(
+                use_cases,
+                int(patient_id) if patient_id is not None else None,
+                dict(parse_qsl(url.query)),
+                item.body
+            )
+        except HTTPException as e:
+            status_code, body = e.status_code, error_body(e.status_code, e.detail)
+        except Exception:
+            logger.exception("Batch request failed", extra={"method": item.method, "path": url.path})
+            await db.rollback()
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            body = {"error": "Internal server error", "message": "An unexpected error occurred. Please try again later."}
+        return BatchItemResponse(id=item.id, status=status_code, body=body)
+    return BatchItemResponse(id=item.id, status=404, body=error_body(404, "Not Found"))
+
+def written_patient_id(item: BatchItem, response: BatchItemResponse) -> Optional[int]:
+    if item.method == "GET" or response.status >= 400:
+        return None
+    if item.method == "POST":
+        return response.body["id"]
+    return int(urlsplit(item.path).path.rsplit("/", 1)[1])
+
+async def run_atomic(session_factory: sessionmaker, items: List[BatchItem]) -> List[BatchItemResponse]:
+    """Run the items in order on one transaction, stopping at the first failure.
+
+    Repository commits only release savepoints, so either every write is
+    committed at the end or none is. The change log rows and rollup deltas
+    are collected and written once, right before the commit, so the shared
+    ``patient_stats`` rows are not held for the whole batch. Change signals
+    fire before the commit, so the event hub is signalled again once the
+    batch is committed. After a rollback the failed item keeps its response
+    and every other one reports 424.
+    """
+    responses: List[BatchItemResponse] = []
+    async with savepoint_session(session_factory) as (db, transaction):
+        patients = PatientRepository(db)
+        patients.defer_changes()
+        use_cases = build_patient_use_cases(db)
+        for item in items:
+            response = await run_request(db, use_cases, item)
+            responses.append(response)
+            if response.status >= 400:
+                break
+        else:
+            await patients.record_deferred_changes()
+            await transaction.commit()
+            patient_events.changed()
+            return responses
+        await transaction.rollback()
+
+    failed = responses[-1]
+    # The name index already applied the discarded writes; the email filter
+    # may keep their addresses, which only costs a database check later.
+    written: Set[int] = set()
+    for item, response in zip(items, responses[:-1]):
+        patient_id = written_patient_id(item, response)
+        if patient_id is not None:
+            written.add(patient_id)
+    await name_index.reload(session_factory, written)
+
+    reason = f"Not applied: request {failed.id or len(responses) - 1} of the atomic batch failed"
+    return [
+        failed if index == len(responses) - 1 else BatchItemResponse(
+            id=item.id,
+            status=status.HTTP_424_FAILED_DEPENDENCY,
+            body=error_body(status.HTTP_424_FAILED_DEPENDENCY, reason)
+        )
+        for index, item in enumerate(items)
+    ]
+
+async def run_concurrently(session_factory: sessionmaker, items: List[BatchItem], concurrency: int) -> List[BatchItemResponse]:
+    """Run the items on up to ``concurrency`` workers, each with one session for all its items.
+
+    An ``AsyncSession`` runs one statement at a time, so workers cannot share
+    one; with a concurrency of 1 the whole batch runs in order on one session.
+    """
+    responses: List[Optional[BatchItemResponse]] = [None] * len(items)
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        async with session_factory() as db:
+            use_cases = build_patient_use_cases(db)
+            for index, item in pending:
+                responses[index] = await run_request(db, use_cases, item)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+    return responses
+
+# No query budget: a batch runs its requests' statements plus one
+# authentication query.
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session_factory: sessionmaker = Depends(get_session_factory)
+):
+    await authenticate_credentials(credentials, session_factory)
+    if len(batch.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.batch_max_requests} requests"
+        )
+
+    if batch.atomic:
+        responses = await run_atomic(session_factory, batch.requests)
+    else:
+        concurrency = min(batch.concurrency, settings.batch_max_concurrency)
+        responses = await run_concurrently(session_factory, batch.requests, concurrency)
+    return BatchResponse(responses=responses)
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, Query, status
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.application.use_cases.duplicate_use_cases import DuplicateDetectionUseCases
+from app.config import settings
+from app.database.connection import advisory_lock, get_db, get_session_factory
+from app.infrastructure.jobs.executor import JobExecutor
+from app.infrastructure.repositories.duplicate_repository import DuplicateRepository
+from app.models.duplicate import DUPLICATE_SCAN_LOCK_ID
+from app.schemas.duplicate import DuplicateCluster, DuplicateScan
+from app.schemas.user import User
+from app.presentation.dependencies import get_current_user, get_job_executor
+from app.presentation.middleware.sql import query_budget
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Scans in one worker run one at a time; a second request just queues behind.
+# On PostgreSQL an advisory lock also covers other workers and the CLI: a scan
+# that finds it taken is skipped, and the next one picks up what it left.
+_scan_lock = asyncio.Lock()
+
+def build_duplicate_use_cases(db: AsyncSession) -> DuplicateDetectionUseCases:
+    return DuplicateDetectionUseCases(
+        DuplicateRepository(db),
+        threshold=settings.duplicate_match_threshold,
+        max_block_size=settings.duplicate_max_block_size,
+        batch_size=settings.duplicate_scan_batch_size
+    )
+
+async def get_duplicate_use_cases(db: AsyncSession = Depends(get_db)) -> DuplicateDetectionUseCases:
+    return build_duplicate_use_cases(db)
+
+async def run_duplicate_scan(session_factory: sessionmaker) -> None:
+    async with _scan_lock:
+        try:
+            async with advisory_lock(session_factory, DUPLICATE_SCAN_LOCK_ID) as acquired:
+                if not acquired:
+                    logger.info("Duplicate scan skipped: another scan is running")
+                    return
+                async with session_factory() as db:
+                    await build_duplicate_use_cases(db).scan()
+        except Exception:
+            logger.exception("Duplicate scan failed")
+
+@router.post("/scan", response_model=DuplicateScan, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(2)
+async def scan_duplicates(
+    duplicate_use_cases: DuplicateDetectionUseCases = Depends(get_duplicate_use_cases),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    job_executor: JobExecutor = Depends(get_job_executor),
+    current_user: User = Depends(get_current_user)
+):
+    pending = await duplicate_use_cases.count_pending()
+    job_executor.submit(lambda: run_duplicate_scan(session_factory))
+    return DuplicateScan(status="scheduled", pending_patients=pending)
+
+@router.get("", response_model=List[DuplicateCluster])
+@query_budget(3)
+async def get_duplicate_clusters(
+    skip: int = Query(0, ge=0, description="Number of clusters to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of clusters to return"),
+    duplicate_use_cases: DuplicateDetectionUseCases = Depends(get_duplicate_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    clusters = await duplicate_use_cases.get_clusters(skip=skip, limit=limit)
+    return [DuplicateCluster.model_validate(cluster) for cluster in clusters]
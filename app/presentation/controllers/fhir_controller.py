@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import Response
+from typing import Optional
+from urllib.parse import urlencode
+from app.schemas.user import User
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.infrastructure.fhir.serialization import FHIR_MEDIA_TYPE, FhirPatientSerializer
+from app.presentation.controllers.patient_controller import get_patient_use_cases
+from app.presentation.dependencies import get_current_user
+from app.presentation.middleware.sql import query_budget
+
+router = APIRouter()
+
+class FhirResponse(Response):
+    media_type = FHIR_MEDIA_TYPE
+
+def get_fhir_serializer(request: Request) -> FhirPatientSerializer:
+    return FhirPatientSerializer(str(request.url_for("search_fhir_patients")).rsplit("/", 1)[0])
+
+@router.get("/Patient/{patient_id}", response_class=FhirResponse)
+@query_budget(2)
+async def read_fhir_patient(
+    patient_id: str,
+    serializer: FhirPatientSerializer = Depends(get_fhir_serializer),
+    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    patient = await patient_use_cases.get_patient_by_id(int(patient_id)) if patient_id.isdigit() else None
+    
+    if patient is None:
+        return FhirResponse(
+            serializer.operation_outcome("not-found", f"Patient/{patient_id} not found"),
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+    
+    return FhirResponse(serializer.resource(patient))
+
+@router.get("/Patient", response_class=FhirResponse)
+@query_budget(2)
+async def search_fhir_patients(
+    request: Request,
+    name: Optional[str] = Query(None, min_length=2, description="Search in patient names"),
+    count: int = Query(50, ge=1, le=1000, alias="_count", description="Page size"),
+    offset: int = Query(0, ge=0, alias="_offset", description="Number of matches to skip"),
+    serializer: FhirPatientSerializer = Depends(get_fhir_serializer),
+    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    patients = await patient_use_cases.get_patients(skip=offset, limit=count + 1, search=name)
+    has_next = len(patients) > count
+    
+    def page_url(page_offset: int) -> str:
+        params = {"name": name} if name else {}
+        params.update({"_count": count, "_offset": page_offset})
+        return f"{request.url_for('search_fhir_patients')}?{urlencode(params)}"
+    
+    links = [("self", page_url(offset))]
+    if has_next:
+        links.append(("next", page_url(offset + count)))
+    if offset:
+        links.append(("previous", page_url(max(offset - count, 0))))
+    
+    return FhirResponse(serializer.searchset(patients[:count], links))
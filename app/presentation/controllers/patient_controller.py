@@ -1,22 +1,154 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import List, Optional
+import asyncio
+import contextlib
+import httpx
+import logging
+import os
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import Any, Awaitable, Callable, List, Optional
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.connection import get_db
-from app.schemas.patient import Patient, PatientCreate, PatientUpdate
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import complete_on_cancel, get_db, get_session_factory
+from app.schemas.patient import (
+    DailyCount,
+    DomainCount,
+    Patient,
+    PatientChangeFeed,
+    PatientCreate,
+    PatientStats,
+    PatientSuggestion,
+    PatientUpdate,
+)
+from app.schemas.import_job import ImportJob
 from app.schemas.user import User
 from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.application.use_cases.import_job_use_cases import ImportJobUseCases
+from app.application.use_cases.import_pipeline import PipelineLimits
+from app.application.use_cases.patient_stats_use_cases import PatientStatsUseCases
+from app.config import settings
+from app.domain.entities.import_job import ImportJobSource, ImportProgress
 from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.repositories.import_job_repository import ImportJobRepository
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository
 from app.infrastructure.external.external_api_service import ExternalApiService
-from app.presentation.dependencies import get_current_user
+from app.infrastructure.jobs.executor import JobExecutor
+from app.infrastructure.repositories.email_filter import email_filter
+from app.infrastructure.repositories.name_index import name_index
+from app.presentation.dependencies import (
+    get_current_user,
+    get_http_client,
+    get_job_executor,
+    resolve_with_current_user,
+    security,
+)
+from app.presentation.middleware.sql import query_budget
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-async def get_patient_use_cases(db: AsyncSession = Depends(get_db)) -> PatientUseCases:
+ProgressCallback = Callable[[ImportProgress], Awaitable[None]]
+ImportRunner = Callable[[PatientUseCases, ProgressCallback, ImportProgress], Awaitable[Any]]
+
+NDJSON_CONTENT_TYPES = {"application/fhir+ndjson", "application/ndjson", "application/x-ndjson"}
+
+def build_patient_use_cases(db: AsyncSession, http_client: Optional[httpx.AsyncClient] = None) -> PatientUseCases:
     patient_repository = PatientRepository(db)
-    external_api_service = ExternalApiService()
-    return PatientUseCases(patient_repository, external_api_service)
+    external_api_service = ExternalApiService(http_client) if http_client else None
+    import_limits = PipelineLimits(
+        page_size=settings.import_page_size,
+        fetch_concurrency=settings.import_fetch_concurrency,
+        queue_pages=settings.import_queue_pages,
+        batch_size=settings.import_batch_size,
+        transform_workers=settings.fhir_transform_workers
+    )
+    return PatientUseCases(
+        patient_repository,
+        external_api_service,
+        import_limits,
+        email_filter=email_filter if settings.email_filter_enabled else None
+    )
+
+async def get_patient_use_cases(
+    db: AsyncSession = Depends(get_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
+) -> PatientUseCases:
+    return build_patient_use_cases(db, http_client)
+
+async def get_patient_stats_use_cases(db: AsyncSession = Depends(get_db)) -> PatientStatsUseCases:
+    return PatientStatsUseCases(PatientStatsRepository(db))
+
+async def get_import_job_use_cases(db: AsyncSession = Depends(get_db)) -> ImportJobUseCases:
+    return ImportJobUseCases(ImportJobRepository(db))
+
+async def run_import_job(
+    session_factory: sessionmaker,
+    http_client: Optional[httpx.AsyncClient],
+    job_id: int,
+    run: ImportRunner,
+    cleanup: Optional[Callable[[], None]] = None
+) -> None:
+    """Execute a queued import, persisting progress as it goes.
+
+    Job bookkeeping uses its own session so progress commits never interleave
+    with the import's writes. ``cleanup`` runs once the job ends, however far
+    it got.
+    """
+    progress = ImportProgress()
+    try:
+        async with session_factory() as job_db, session_factory() as import_db:
+            job_use_cases = ImportJobUseCases(ImportJobRepository(job_db))
+            patient_use_cases = build_patient_use_cases(import_db, http_client)
+
+            async def report(current: ImportProgress) -> None:
+                await job_use_cases.record_progress(job_id, current)
+
+            await job_use_cases.start_job(job_id)
+            try:
+                await run(patient_use_cases, report, progress)
+            except asyncio.CancelledError:
+                await job_use_cases.fail_job(job_id, progress, "Interrupted by shutdown")
+                raise
+            except Exception as e:
+                logger.exception("Import job failed", extra={"job_id": job_id})
+                await job_use_cases.fail_job(job_id, progress, f"Error importing data: {e}")
+            else:
+                await job_use_cases.complete_job(job_id, progress)
+    finally:
+        if cleanup is not None:
+            cleanup()
+
+async def watch_import_jobs(
+    session_factory: sessionmaker,
+    job_executor: JobExecutor,
+    interval: float,
+    stale_after: float
+) -> None:
+    """Keep this worker's import jobs alive and fail those abandoned by others.
 
+    Runs at startup, so jobs left ``running`` by a crashed or restarted worker
+    are failed once their heartbeat is ``stale_after`` seconds old.
+    """
+    async def check() -> int:
+        async with session_factory() as db:
+            job_use_cases = ImportJobUseCases(ImportJobRepository(db))
+            await job_use_cases.keep_alive(job_executor.keys)
+            return await job_use_cases.fail_stale_jobs(stale_after)
+
+    while True:
+        try:
+            failed = await complete_on_cancel(check())
+            if failed:
+                logger.warning("Failed abandoned import jobs", extra={"jobs": failed})
+        except Exception:
+            logger.exception("Import job watchdog failed")
+        await asyncio.sleep(interval)
+
+# Writes also append to the change log and update the stats rollups; on
+# PostgreSQL they also open and stamp their change log rows.
 @router.post("/", response_model=Patient, status_code=status.HTTP_201_CREATED)
+@query_budget(8)
 async def create_patient(
     patient: PatientCreate,
     patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
@@ -32,6 +164,7 @@ async def create_patient(
         )
 
 @router.get("/", response_model=List[Patient])
+@query_budget(2)
 async def get_patients(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
@@ -42,13 +175,76 @@ async def get_patients(
     patients = await patient_use_cases.get_patients(skip=skip, limit=limit, search=search)
     return [Patient.model_validate(patient) for patient in patients]
 
+@router.get("/lookup", response_model=List[Patient])
+@query_budget(2)
+async def lookup_patients(
+    email: Optional[str] = Query(None, min_length=3, description="Email, matched case-insensitively"),
+    phone: Optional[str] = Query(None, min_length=7, description="Phone in any format, matched on its digits"),
+    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        patients = await patient_use_cases.lookup_patients(email=email, phone=phone)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return [Patient.model_validate(patient) for patient in patients]
+
+@router.get("/autocomplete", response_model=List[PatientSuggestion])
+@query_budget(1)
+async def autocomplete_patients(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of one or more name words"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions to return"),
+    current_user: User = Depends(get_current_user)
+):
+    if not name_index.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Name index is still being built",
+            headers={"Retry-After": "5"}
+        )
+    return [PatientSuggestion(id=patient_id, name=name) for patient_id, name in name_index.search(prefix, limit)]
+
+@router.get("/changes", response_model=PatientChangeFeed)
+@query_budget(2)
+async def get_patient_changes(
+    since: int = Query(0, ge=0, description="Cursor returned as next_cursor by the previous call; 0 starts from the beginning"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of change log entries to read"),
+    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    page = await patient_use_cases.get_changes(since=since, limit=limit)
+    return PatientChangeFeed.model_validate(page)
+
+@router.get("/stats", response_model=PatientStats)
+@query_budget(4)
+async def get_patient_stats(
+    days: int = Query(30, ge=1, le=366, description="Number of days of creation counts, ending today (UTC)"),
+    domains: int = Query(10, ge=1, le=100, description="Number of email domains to return, largest first"),
+    stats_use_cases: PatientStatsUseCases = Depends(get_patient_stats_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    stats = await stats_use_cases.get_stats(days=days, domains=domains)
+    return PatientStats(
+        active_patients=stats.active_patients,
+        created_per_day=[DailyCount(day=day, count=count) for day, count in stats.created_per_day],
+        top_domains=[DomainCount(domain=domain, patients=count) for domain, count in stats.top_domains]
+    )
+
 @router.get("/{patient_id}", response_model=Patient)
+@query_budget(2)
 async def get_patient(
     patient_id: int,
-    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
-    current_user: User = Depends(get_current_user)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session_factory: sessionmaker = Depends(get_session_factory)
 ):
-    patient = await patient_use_cases.get_patient_by_id(patient_id)
+    current_user, patient = await resolve_with_current_user(
+        credentials,
+        session_factory,
+        lambda db: build_patient_use_cases(db).get_patient_by_id(patient_id)
+    )
     
     if patient is None:
         raise HTTPException(
@@ -59,6 +255,7 @@ async def get_patient(
     return Patient.model_validate(patient)
 
 @router.put("/{patient_id}", response_model=Patient)
+@query_budget(9)
 async def update_patient(
     patient_id: int,
     patient_update: PatientUpdate,
@@ -85,6 +282,7 @@ async def update_patient(
         )
 
 @router.delete("/{patient_id}")
+@query_budget(7)
 async def delete_patient(
     patient_id: int,
     patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
@@ -100,17 +298,104 @@ async def delete_patient(
     
     return {"message": "Patient deleted successfully"}
 
-@router.post("/import-data", status_code=status.HTTP_200_OK)
+@router.post("/import-data", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(3)
 async def import_patient_data(
-    count: int = Query(10, ge=1, le=100, description="Number of patients to import"),
-    patient_use_cases: PatientUseCases = Depends(get_patient_use_cases),
+    response: Response,
+    count: int = Query(10, ge=1, le=1_000_000, description="Number of patients to import"),
+    mode: str = Query("create", pattern="^(create|sync)$", description="create skips known patients; sync also applies upstream changes"),
+    job_use_cases: ImportJobUseCases = Depends(get_import_job_use_cases),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+    job_executor: JobExecutor = Depends(get_job_executor),
+    current_user: User = Depends(get_current_user)
+):
+    job = await job_use_cases.enqueue_job(count, created_by=current_user.id)
+    
+    async def run(use_cases: PatientUseCases, report: ProgressCallback, progress: ImportProgress) -> None:
+        await use_cases.import_external_patients(count, on_progress=report, progress=progress, sync=mode == "sync")
+    
+    job_executor.submit(lambda: run_import_job(session_factory, http_client, job.id, run), key=job.id)
+    
+    response.headers["Location"] = f"/patients/import-jobs/{job.id}"
+    return ImportJob.model_validate(job)
+
+def _discard_spool(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+async def _spool_request_body(request: Request, max_bytes: int) -> str:
+    """Copy the request body to a temporary file chunk by chunk."""
+    spool = await asyncio.to_thread(tempfile.NamedTemporaryFile, prefix="fhir-", suffix=".upload", delete=False)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"FHIR upload exceeds {max_bytes // 2**20} MB"
+                )
+            await asyncio.to_thread(spool.write, chunk)
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Request body must contain a FHIR Bundle or NDJSON document"
+            )
+    except BaseException:
+        spool.close()
+        os.unlink(spool.name)
+        raise
+    spool.close()
+    return spool.name
+
+@router.post("/import-fhir", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(3)
+async def import_fhir_data(
+    request: Request,
+    response: Response,
+    fhir_format: str = Query("auto", alias="format", pattern="^(auto|bundle|ndjson)$", description="FHIR Bundle or NDJSON; detected when auto"),
+    job_use_cases: ImportJobUseCases = Depends(get_import_job_use_cases),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    job_executor: JobExecutor = Depends(get_job_executor),
     current_user: User = Depends(get_current_user)
 ):
+    if fhir_format == "auto" and request.headers.get("content-type", "").split(";")[0] in NDJSON_CONTENT_TYPES:
+        fhir_format = "ndjson"
+    path = await _spool_request_body(request, settings.fhir_upload_max_mb * 2**20)
+    
+    async def run(use_cases: PatientUseCases, report: ProgressCallback, progress: ImportProgress) -> None:
+        with open(path, "rb") as stream:
+            await use_cases.load_fhir_patients(stream, fhir_format, on_progress=report, progress=progress)
+    
+    def cleanup() -> None:
+        _discard_spool(path)
+    
     try:
-        imported_count = await patient_use_cases.import_external_patients(count)
-        return {"message": f"Successfully imported {imported_count} patients from external API"}
-    except Exception as e:
+        job = await job_use_cases.enqueue_job(None, created_by=current_user.id, source=ImportJobSource.FHIR)
+        task = job_executor.submit(lambda: run_import_job(session_factory, None, job.id, run, cleanup), key=job.id)
+    except BaseException:
+        cleanup()
+        raise
+    # A job cancelled while still queued never reaches run_import_job.
+    task.add_done_callback(lambda _: cleanup())
+    
+    response.headers["Location"] = f"/patients/import-jobs/{job.id}"
+    return ImportJob.model_validate(job)
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJob)
+@query_budget(2)
+async def get_import_job(
+    job_id: int,
+    job_use_cases: ImportJobUseCases = Depends(get_import_job_use_cases),
+    current_user: User = Depends(get_current_user)
+):
+    job = await job_use_cases.get_job(job_id)
+    
+    if job is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error importing data: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
         )
+    
+    return ImportJob.model_validate(job)
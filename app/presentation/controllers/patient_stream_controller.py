@@ -0,0 +1,78 @@
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database.connection import get_session_factory
+from app.domain.entities.patient_change import PatientChange
+from app.infrastructure.events.patient_events import CLOSED, HEARTBEAT, Subscription, patient_events
+from app.presentation.controllers.patient_controller import build_patient_use_cases
+from app.presentation.dependencies import authenticate_credentials, security
+from app.presentation.middleware.sql import query_budget
+from app.schemas.patient import PatientChange as PatientChangeSchema
+
+router = APIRouter()
+
+RETRY_MILLISECONDS = 5000
+
+def encode_change_event(change: PatientChange) -> bytes:
+    data = PatientChangeSchema.model_validate(change).model_dump_json()
+    return f"id: {change.seq}\nevent: {change.operation.value}\ndata: {data}\n\n".encode()
+
+async def read_backlog(session_factory: sessionmaker, last_event_id: int, position: int) -> Optional[List[bytes]]:
+    """Events between ``last_event_id`` and the hub's position, or None when too far behind."""
+    async with session_factory() as db:
+        page = await build_patient_use_cases(db).get_changes(last_event_id, settings.patient_stream_backlog_limit)
+    if page.has_more and page.next_cursor < position:
+        return None
+    return [patient_events.encode(change) for change in page.changes if change.seq <= position]
+
+async def stream_events(subscription: Subscription, backlog: Optional[List[bytes]]) -> AsyncIterator[bytes]:
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        if backlog is None:
+            # The client should catch up through GET /patients/changes first.
+            yield b"event: reset\ndata: {}\n\n"
+            return
+        for event in backlog:
+            yield event
+        while True:
+            item = await subscription.queue.get()
+            if item is CLOSED:
+                return
+            if item is HEARTBEAT:
+                yield b": heartbeat\n\n"
+            elif item[0] > subscription.position:
+                yield item[1]
+    finally:
+        patient_events.unsubscribe(subscription)
+
+@router.get("", response_class=StreamingResponse)
+@query_budget(3)
+async def stream_patient_changes(
+    last_event_id: Optional[int] = Header(None, ge=0, description="Seq of the last event received; replays what followed it"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session_factory: sessionmaker = Depends(get_session_factory)
+):
+    await authenticate_credentials(credentials, session_factory)
+    if not patient_events.running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Patient change stream is not running",
+            headers={"Retry-After": "5"}
+        )
+
+    subscription = await patient_events.subscribe()
+    backlog: Optional[List[bytes]] = []
+    try:
+        if last_event_id is not None and last_event_id < subscription.position:
+            backlog = await read_backlog(session_factory, last_event_id, subscription.position)
+    except BaseException:
+        patient_events.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        stream_events(subscription, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,33 +1,124 @@
-from fastapi import Depends, HTTPException, status
+import asyncio
+import httpx
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database.connection import get_db
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import get_db, get_session_factory
 from app.schemas.user import User
+from app.domain.entities.user import User as UserEntity
 from app.application.use_cases.auth_use_cases import AuthUseCases
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.jobs.executor import JobExecutor
+from app.config import settings
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+T = TypeVar("T")
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+def get_job_executor(request: Request) -> JobExecutor:
+    return request.app.state.job_executor
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def _authenticate(token: str, db: AsyncSession) -> Optional[UserEntity]:
+    """The token's user, or ``None`` for bad credentials.
+
+    Only credential errors are caught: a database failure while resolving the
+    user reaches the 500 handler instead of asking the client to log in again.
+    """
+    try:
+        auth_use_cases = AuthUseCases(UserRepository(db))
+        return await auth_use_cases.get_user_by_token(token)
+    except (JWTError, ValueError):
+        return None
+
+def _discard(task: "asyncio.Task[Any]") -> None:
+    task.cancel()
+    if task.done() and not task.cancelled():
+        task.exception()
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    user = await _authenticate(credentials.credentials, db)
+    if user is None:
+        raise _credentials_exception()
     
+    return User.model_validate(user)
+
+async def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superuser privileges required"
+        )
+    return current_user
+
+def app_session_factory(app: FastAPI) -> sessionmaker:
+    """Session factory for code running outside dependency injection.
+
+    Honours ``app.dependency_overrides`` so middleware and background tasks use
+    the same database as the request handlers.
+    """
+    return app.dependency_overrides.get(get_session_factory, get_session_factory)()
+
+async def authenticate_credentials(credentials: HTTPAuthorizationCredentials, session_factory: sessionmaker) -> User:
+    """Authenticate on a session that is closed again before returning.
+
+    For long-lived responses, which would otherwise keep the ``get_db``
+    session and its pooled connection until they finish.
+    """
+    async with session_factory() as db:
+        user = await _authenticate(credentials.credentials, db)
+    if user is None:
+        raise _credentials_exception()
+    return User.model_validate(user)
+
+async def resolve_with_current_user(
+    credentials: HTTPAuthorizationCredentials,
+    session_factory: sessionmaker,
+    lookup: Callable[[AsyncSession], Awaitable[T]]
+) -> Tuple[User, T]:
+    """Resolve the current user together with an independent data lookup.
+
+    By default both run one after the other on a single session. With
+    ``settings.concurrent_dependencies`` enabled they run at the same time on
+    separate pooled sessions; the lookup result is only returned once the user
+    check has passed, so an invalid token never reaches the data.
+    """
+    if not settings.concurrent_dependencies:
+        async with session_factory() as db:
+            user = await _authenticate(credentials.credentials, db)
+            if user is None:
+                raise _credentials_exception()
+            return User.model_validate(user), await lookup(db)
+
+    async def run_lookup() -> T:
+        async with session_factory() as db:
+            return await lookup(db)
+
+    lookup_task = asyncio.create_task(run_lookup())
     try:
-        token = credentials.credentials
-            
-        user_repository = UserRepository(db)
-        auth_use_cases = AuthUseCases(user_repository)
-        user = await auth_use_cases.get_user_by_token(token)
-        
-        if user is None:
-            raise credentials_exception
-        
-        return User.model_validate(user)
-    except Exception:
-        raise credentials_exception
+        async with session_factory() as db:
+            user = await _authenticate(credentials.credentials, db)
+    except BaseException:
+        _discard(lookup_task)
+        raise
+
+    if user is None:
+        _discard(lookup_task)
+        raise _credentials_exception()
+
+    return User.model_validate(user), await lookup_task
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.application.use_cases.auth_use_cases import AuthUseCases
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.presentation.dependencies import app_session_factory
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_FORMATS = {
+    "speedscope": (SpeedscopeRenderer, "speedscope.json"),
+    "html": (HTMLRenderer, "html"),
+}
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9a-f]{32}\.(speedscope\.json|html)$")
+
+def _requested_format(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").strip().lower() or "speedscope"
+    query_string = scope.get("query_string", b"")
+    if b"profile=" in query_string:
+        for pair in query_string.decode("latin-1").split("&"):
+            key, _, value = pair.partition("=")
+            if key == "profile":
+                return value.lower() or "speedscope"
+    return None
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" and token else None
+    return None
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return Path(settings.profiler_output_dir) / profile_id
+
+class ProfileRateLimiter:
+    """Allow one profiled request at a time, at most once per interval, per worker."""
+
+    def __init__(self):
+        self._active = False
+        self._last_started = float("-inf")
+
+    def available(self) -> bool:
+        return not self._active and time.monotonic() - self._last_started >= settings.profiler_min_interval_seconds
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        if not self.available():
+            return False
+        self._active = True
+        self._last_started = now
+        return True
+
+    def release(self) -> None:
+        self._active = False
+
+class ProfilerMiddleware:
+    """Run a request under pyinstrument when a superuser asks for it.
+
+    Requests opt in with an ``X-Profile`` header or ``?profile=`` query flag
+    (``speedscope`` or ``html``). Requests without the flag go straight through.
+    The profile is written to ``settings.profiler_output_dir`` and its id is
+    returned in ``X-Profile-Id`` for download from ``/admin/profiles/{id}``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.rate_limiter = ProfileRateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile_format = _requested_format(scope)
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = await self._check(scope, profile_format)
+        if status != "accepted":
+            await self.app(scope, receive, self._with_headers(send, {"X-Profile-Status": status}))
+            return
+
+        try:
+            await self._profile(scope, receive, send, profile_format)
+        finally:
+            self.rate_limiter.release()
+
+    async def _check(self, scope: Scope, profile_format: str) -> str:
+        if profile_format not in PROFILE_FORMATS:
+            return "unsupported-format"
+        # Cheap checks first: the user lookup only runs when a profile would
+        # actually be taken, so the flag cannot add a query to every request.
+        token = _bearer_token(scope)
+        if token is None or AuthUseCases.username_from_token(token) is None:
+            return "denied"
+        if not self.rate_limiter.available():
+            return "rate-limited"
+        if not await self._is_superuser(scope, token):
+            return "denied"
+        if not self.rate_limiter.try_acquire():
+            return "rate-limited"
+        return "accepted"
+
+    async def _is_superuser(self, scope: Scope, token: str) -> bool:
+        async with app_session_factory(scope["app"])() as db:
+            user = await AuthUseCases(UserRepository(db)).get_user_by_token(token)
+        return bool(user and user.is_active and user.is_superuser)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, profile_format: str) -> None:
+        renderer_class, extension = PROFILE_FORMATS[profile_format]
+        profile_id = f"{int(time.time())}-{uuid.uuid4().hex}.{extension}"
+        headers = {"X-Profile-Status": "accepted", "X-Profile-Id": profile_id}
+
+        profiler = Profiler(interval=settings.profiler_interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, self._with_headers(send, headers))
+        finally:
+            profiler.stop()
+            output = await asyncio.to_thread(profiler.output, renderer_class())
+            await asyncio.to_thread(self._store, profile_id, output)
+
+    def _store(self, profile_id: str, output: str) -> None:
+        directory = Path(settings.profiler_output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / profile_id
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(output)
+        os.replace(tmp_path, path)
+
+        profiles = sorted(p for p in directory.iterdir() if PROFILE_ID_PATTERN.match(p.name))
+        for stale in profiles[:-settings.profiler_max_files]:
+            stale.unlink(missing_ok=True)
+
+    @staticmethod
+    def _with_headers(send: Send, extra: dict) -> Send:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in extra.items():
+                    headers.append(name, value)
+            await send(message)
+        return send_wrapper
@@ -0,0 +1,72 @@
+import logging
+import time
+from typing import Callable, TypeVar
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.infrastructure.monitoring.sql import (
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_BUDGET_EXCEEDED,
+    DB_TIME_PER_REQUEST,
+    start_query_tracking,
+    stop_query_tracking,
+)
+from app.presentation.middleware.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declare the maximum number of SQL statements an endpoint may run.
+
+    Apply below the route decorator so FastAPI registers the annotated function.
+    """
+    def decorator(endpoint: F) -> F:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_tracking()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", total;dur={total:.2f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_query_tracking(token)
+
+        method = scope["method"]
+        route = route_template(scope)
+        DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(method, route).observe(stats.duration)
+
+        endpoint = getattr(scope.get("route"), "endpoint", None)
+        budget = getattr(endpoint, "__query_budget__", None)
+        if budget is not None and stats.count > budget:
+            DB_QUERY_BUDGET_EXCEEDED.labels(method, route).inc()
+            message = f"{method} {route} ran {stats.count} queries, budget is {budget}"
+            if settings.enforce_query_budgets:
+                raise QueryBudgetExceeded(message)
+            logger.warning("Query budget exceeded: %s", message)
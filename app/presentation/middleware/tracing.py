@@ -0,0 +1,46 @@
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.infrastructure.monitoring.tracing import extract_context, get_tracer
+from app.presentation.middleware.metrics import route_template
+
+class TracingMiddleware:
+    """Open the server span for each request, continuing an incoming W3C trace."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = get_tracer()
+        if tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {route}",
+            context=extract_context(headers),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.method": scope["method"],
+                "http.route": route,
+                "http.target": scope["path"],
+            },
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                span.set_attribute("http.status_code", status_code)
+                endpoint = getattr(scope.get("route"), "endpoint", None)
+                if endpoint is not None:
+                    span.set_attribute("code.function", endpoint.__name__)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+class BatchItem(BaseModel):
+    id: Optional[str] = Field(None, max_length=100, description="Echoed back on the matching response")
+    method: str = Field(..., pattern="^(GET|POST|PUT|DELETE)$")
+    path: str = Field(..., pattern="^/patients", max_length=2000, description="Patient route, with its query string")
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1)
+    atomic: bool = Field(False, description="Run in order in one transaction; any failure rolls back every request")
+    concurrency: int = Field(1, ge=1, description="Requests run at the same time when not atomic; capped by the server")
+
+class BatchItemResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchItemResponse]
+
+class PatientListParams(BaseModel):
+    skip: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=1000)
+    search: Optional[str] = Field(None, min_length=2)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List
+from app.schemas.patient import Patient
+
+class DuplicateMatch(BaseModel):
+    patient_id: int
+    matched_patient_id: int
+    score: float
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class DuplicateCluster(BaseModel):
+    cluster_id: int
+    patients: List[Patient]
+    matches: List[DuplicateMatch]
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class DuplicateScan(BaseModel):
+    status: str
+    pending_patients: int
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, ConfigDict, computed_field
+from datetime import datetime
+from typing import List, Optional
+
+class ImportJob(BaseModel):
+    id: int
+    status: str
+    source: str
+    requested_count: Optional[int] = None
+    processed_count: int
+    imported_count: int
+    updated_count: int
+    unchanged_count: int
+    skipped_count: int
+    failed_count: int
+    errors: List[str]
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    @computed_field
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        finished_at = self.finished_at or datetime.now(self.started_at.tzinfo)
+        return round((finished_at - self.started_at).total_seconds(), 3)
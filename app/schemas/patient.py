@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, field_validator, Field, ConfigDict
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 import re
 
 class PatientBase(BaseModel):
@@ -59,3 +59,36 @@ class Patient(PatientBase):
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+
+class PatientSuggestion(BaseModel):
+    id: int
+    name: str
+
+class PatientChange(BaseModel):
+    seq: int
+    operation: str
+    patient_id: int
+    changed_at: Optional[datetime] = None
+    patient: Optional[Patient] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class PatientChangeFeed(BaseModel):
+    changes: List[PatientChange]
+    next_cursor: int
+    has_more: bool
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class DailyCount(BaseModel):
+    day: date
+    count: int
+
+class DomainCount(BaseModel):
+    domain: str
+    patients: int
+
+class PatientStats(BaseModel):
+    active_patients: int
+    created_per_day: List[DailyCount]
+    top_domains: List[DomainCount]
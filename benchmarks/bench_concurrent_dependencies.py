@@ -0,0 +1,75 @@
+"""Latency of GET /patients/{id} dependency resolution, sequential vs concurrent.
+
+Each statement is delayed by a simulated database round-trip so the numbers
+reflect a networked Postgres rather than a local SQLite file.
+
+    python -m benchmarks.bench_concurrent_dependencies --rtt-ms 2 --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database.connection import Base
+from app.domain.entities.patient import Patient
+from app.domain.entities.user import User
+from app.application.use_cases.auth_use_cases import AuthUseCases
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.presentation.dependencies import resolve_with_current_user
+from app.presentation.controllers.patient_controller import build_patient_use_cases
+import app.models  # noqa: F401
+
+def latency_session(rtt: float):
+    class LatencySession(AsyncSession):
+        async def execute(self, *args, **kwargs):
+            await asyncio.sleep(rtt)
+            return await super().execute(*args, **kwargs)
+    return LatencySession
+
+async def run(rtt_ms: float, iterations: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    setup_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with setup_factory() as db:
+        auth = AuthUseCases(UserRepository(db))
+        await UserRepository(db).create(User(id=None, username="bench", email="bench@example.com", hashed_password="x"))
+        patient = await PatientRepository(db).create(Patient(id=None, name="Bench Patient", email="bench.patient@example.com", phone="+1234567890"))
+        token = auth.create_access_token({"sub": "bench"})
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    factory = sessionmaker(engine, class_=latency_session(rtt_ms / 1000), expire_on_commit=False)
+
+    print(f"simulated round-trip: {rtt_ms:.1f} ms, iterations: {iterations}")
+    for mode in (False, True):
+        settings.concurrent_dependencies = mode
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await resolve_with_current_user(
+                credentials,
+                factory,
+                lambda db: build_patient_use_cases(db).get_patient_by_id(patient.id)
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        label = "concurrent" if mode else "sequential"
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{label:>10}: p50={statistics.median(samples):.2f} ms  p95={p95:.2f} ms")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rtt_ms, args.iterations))
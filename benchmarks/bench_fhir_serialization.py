@@ -0,0 +1,82 @@
+"""Encoding cost of a 1000-entry FHIR searchset Bundle.
+
+Compares the pre-encoded fragment serializer used by /fhir/Patient with
+building the equivalent nested dicts and passing them to json.dumps.
+
+    python -m benchmarks.bench_fhir_serialization --entries 1000 --iterations 200
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from app.domain.entities.patient import Patient
+from app.infrastructure.fhir.serialization import FhirPatientSerializer
+
+BASE_URL = "http://localhost:8000/fhir"
+
+def dict_searchset(patients, links) -> bytes:
+    entries = []
+    for patient in patients:
+        *given, family = patient.name.split()
+        resource = {
+            "resourceType": "Patient",
+            "id": str(patient.id),
+            "meta": {"lastUpdated": patient.updated_at.isoformat(timespec="seconds")},
+            "identifier": [{"system": "urn:nuvie:patient", "value": str(patient.id)}],
+            "name": [{"use": "official", "text": patient.name, "family": family, "given": given}],
+            "telecom": [
+                {"system": "phone", "value": patient.phone},
+                {"system": "email", "value": patient.email},
+            ],
+        }
+        entries.append({
+            "fullUrl": f"{BASE_URL}/Patient/{patient.id}",
+            "resource": resource,
+            "search": {"mode": "match"},
+        })
+    bundle = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "link": [{"relation": relation, "url": url} for relation, url in links],
+        "entry": entries,
+    }
+    return json.dumps(bundle, separators=(",", ":")).encode()
+
+def measure(encode, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = encode()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, len(body)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    patients = [
+        Patient(id=index, name="Patient Number Seven", email=f"patient{index}@example.com",
+                phone="+15550100000", created_at=updated_at, updated_at=updated_at)
+        for index in range(1, args.entries + 1)
+    ]
+    links = [("self", f"{BASE_URL}/Patient?_count={args.entries}&_offset=0")]
+    serializer = FhirPatientSerializer(BASE_URL)
+
+    assert json.loads(serializer.searchset(patients, links)) == json.loads(dict_searchset(patients, links))
+
+    print(f"entries: {args.entries}, iterations: {args.iterations}")
+    for label, encode in (
+        ("dict + json.dumps", lambda: dict_searchset(patients, links)),
+        ("pre-encoded fragments", lambda: serializer.searchset(patients, links)),
+    ):
+        samples, size = measure(encode, args.iterations)
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{label:>22}: median {statistics.median(samples):6.2f} ms  p95 {p95:6.2f} ms  ({size / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+from prometheus_client import multiprocess
+
+bind = "0.0.0.0:8000"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Workers recycled by the RSS watchdog get this long to drain in-flight
+# requests before the arbiter kills them; a replacement is forked right away.
+graceful_timeout = 30
+timeout = 60
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,12 +2,16 @@ import pytest
 import pytest_asyncio
 import asyncio
 import sqlite3
+import httpx
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, text
 from app.main import app
-from app.database.connection import get_db, Base
+from app.config import settings
+from app.database.connection import get_db, get_session_factory, Base
+from app.infrastructure.monitoring.sql import instrument_engine
+from app.presentation.dependencies import get_http_client
 
 from app.models.user import User as UserModel
 from app.models.patient import Patient as PatientModel
@@ -19,6 +23,12 @@ test_engine = create_async_engine(
     echo=False
 )
 TestingSessionLocal = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+instrument_engine(test_engine)
+settings.enforce_query_budgets = True
+
+# SQLite does not enforce ON DELETE CASCADE here, and patient ids are reused
+# once the table is emptied, so rows derived from patients are cleared too.
+DERIVED_PATIENT_TABLES = ("patient_blocking_keys", "duplicate_matches", "duplicate_clusters", "patient_changes", "patient_stats")
 
 def create_test_tables():
     """Create tables using synchronous SQLAlchemy for reliability."""
@@ -40,6 +50,8 @@ def clean_database():
     """Clean database before each test."""
     sync_engine = create_engine("sqlite:///./test_database.db")
     with sync_engine.begin() as conn:
+        for table in DERIVED_PATIENT_TABLES:
+            conn.execute(text(f"DELETE FROM {table}"))
         try:
             conn.execute(text("DELETE FROM patients"))
         except:
@@ -54,6 +66,8 @@ def clean_database():
     
     sync_engine = create_engine("sqlite:///./test_database.db")
     with sync_engine.begin() as conn:
+        for table in DERIVED_PATIENT_TABLES:
+            conn.execute(text(f"DELETE FROM {table}"))
         try:
             conn.execute(text("DELETE FROM patients"))
         except:
@@ -84,7 +98,59 @@ async def override_get_db():
         finally:
             await session.close()
 
+EXTERNAL_USERS = [
+    {"id": 1, "name": "Leanne Graham", "email": "Sincere@april.biz", "phone": "1-770-736-8031 x56442"},
+    {"id": 2, "name": "Ervin Howell", "email": "Shanna@melissa.tv", "phone": "010-692-6593 x09125"},
+    {"id": 3, "name": "Clementine Bauch", "email": "Nathan@yesenia.net", "phone": "1-463-123-4447"},
+    {"id": 4, "name": "Patricia Lebsack", "email": "Julianne.OConner@kory.org", "phone": "493-170-9623 x156"},
+    {"id": 5, "name": "Chelsey Dietrich", "email": "Lucio_Hettinger@annie.ca", "phone": "(254)954-1289"},
+    {"id": 6, "name": "Mrs. Dennis Schulist", "email": "Karley_Dach@jasper.info", "phone": "1-477-935-8478 x6430"},
+    {"id": 7, "name": "Kurtis Weissnat", "email": "Telly.Hoeger@billy.biz", "phone": "210.067.6132"},
+    {"id": 8, "name": "Nicholas Runolfsdottir V", "email": "Sherwood@rosamond.me", "phone": "586.493.6943 x140"},
+    {"id": 9, "name": "Glenna Reichert", "email": "Chaim_McDermott@dana.io", "phone": "(775)976-6794 x41206"},
+    {"id": 10, "name": "Clementina DuBuque", "email": "Rey.Padberg@karina.biz", "phone": "024-648-3804"},
+]
+
+def paginate(items, request: httpx.Request):
+    """Apply json-server style ``_page``/``_limit`` parameters."""
+    if "_limit" not in request.url.params:
+        return items
+    limit = int(request.url.params["_limit"])
+    page = int(request.url.params.get("_page", 1))
+    return items[(page - 1) * limit:page * limit]
+
+def external_api_stub(request: httpx.Request) -> httpx.Response:
+    """Stand-in for the JSONPlaceholder API used by the external services."""
+    if request.url.path == "/users":
+        return httpx.Response(200, json=paginate(EXTERNAL_USERS, request))
+    return httpx.Response(404, json={})
+
+def create_stub_http_client(handler=external_api_stub) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+stub_http_client = create_stub_http_client()
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+app.dependency_overrides[get_http_client] = lambda: stub_http_client
+
+def create_user_headers(client: TestClient, username: str, superuser: bool = False) -> dict:
+    """Register and log in a user, returning bearer auth headers."""
+    client.post("/auth/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "TestPass123!"
+    })
+    if superuser:
+        sync_engine = create_engine("sqlite:///./test_database.db")
+        with sync_engine.begin() as conn:
+            conn.execute(text("UPDATE users SET is_superuser = 1 WHERE username = :username"), {"username": username})
+        sync_engine.dispose()
+    token = client.post("/auth/token", json={
+        "username": username,
+        "password": "TestPass123!"
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
 
 @pytest.fixture
 def client():
@@ -1,5 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.main import app
 
 class TestAuthEndpoints:
     
@@ -121,3 +124,22 @@ class TestAuthEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["username"] == "tokentest"
+
+    def test_database_failure_during_authentication_is_not_401(self, client, monkeypatch):
+        client.post("/auth/register", json={
+            "username": "outageuser",
+            "email": "outage@example.com",
+            "password": "TestPass123!",
+            "full_name": "Outage User"
+        })
+        token = client.post("/auth/token", json={"username": "outageuser", "password": "TestPass123!"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def unavailable(self, username):
+            raise OperationalError("SELECT", {}, Exception("connection refused"))
+
+        monkeypatch.setattr(UserRepository, "get_by_username", unavailable)
+        failing = TestClient(app, raise_server_exceptions=False)
+        assert failing.get("/auth/me", headers=headers).status_code == 500
+        assert failing.post("/batch", json={"requests": [{"method": "GET", "path": "/patients"}]}, headers=headers).status_code == 500
+        assert failing.get("/auth/me", headers={"Authorization": "Bearer invalid"}).status_code == 401
@@ -0,0 +1,119 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.domain.entities.patient import Patient
+from app.infrastructure.repositories.name_index import NameIndex, PrefixIndex, name_index
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.main import app
+from app.models.patient import Patient as PatientModel
+from tests.conftest import TestingSessionLocal, create_user_headers
+
+def test_prefix_index_tracks_renames_and_removals():
+    index = PrefixIndex()
+    index.add(1, "John Smith")
+    index.add(2, "Joanna Smythe")
+    assert set(index.ids_with_prefix("jo")) == {1, 2}
+    assert set(index.ids_with_prefix("smi")) == {1}
+
+    index.add(1, "Jane Doe")
+    assert set(index.ids_with_prefix("smi")) == set()
+    assert set(index.ids_with_prefix("ja")) == {1}
+
+    index.remove(2)
+    assert set(index.ids_with_prefix("jo")) == set()
+    assert index.token_count == 2
+
+def test_bulk_prefix_index_sorts_tokens_once_sealed():
+    index = PrefixIndex(bulk=True)
+    index.add(1, "Zoe Adams")
+    index.add(2, "Adam Young")
+    index.add(3, "Bea Zimmer")
+    index.remove(3)
+    index.seal()
+    assert index.token_count == 4
+    assert set(index.ids_with_prefix("ada")) == {1, 2}
+    assert set(index.ids_with_prefix("z")) == {1}
+
+    index.add(4, "Zed Zimmer")
+    assert set(index.ids_with_prefix("zi")) == {4}
+
+@pytest.mark.asyncio
+async def test_refresh_applies_writes_from_the_change_log(db_session):
+    patients = PatientRepository(db_session)
+    kept = await patients.create(Patient(id=None, name="Ann Lee", email="ann@example.com", phone="+1234567890"))
+    removed = await patients.create(Patient(id=None, name="Bob Ray", email="bob@example.com", phone="+1234567891"))
+    names = NameIndex()
+    await names.rebuild(TestingSessionLocal)
+    assert await names.refresh(TestingSessionLocal) == 0
+
+    # Writes made by another worker reach this index only through the log.
+    await patients.update(kept.id, {"name": "Ann Park"})
+    await patients.delete(removed.id)
+    added = await patients.create(Patient(id=None, name="Cy Po", email="cy@example.com", phone="+1234567892"))
+    assert await names.refresh(TestingSessionLocal, batch_size=2) == 3
+
+    assert names.search("park") == [(kept.id, "Ann Park")]
+    assert names.search("lee") == []
+    assert names.search("bob") == []
+    assert names.search("cy") == [(added.id, "Cy Po")]
+
+@pytest.mark.asyncio
+async def test_search_matches_every_word_and_bounds_results(db_session):
+    db_session.add_all([
+        PatientModel(name="John Smith", email="john@example.com", phone="+1234567890"),
+        PatientModel(name="Smith, Johanna", email="johanna@example.com", phone="+1234567891"),
+        PatientModel(name="José Santos", email="jose@example.com", phone="+1234567892"),
+        PatientModel(name="Mary Jones", email="mary@example.com", phone="+1234567893"),
+    ])
+    await db_session.commit()
+
+    names = NameIndex()
+    assert not names.ready
+    await names.rebuild(TestingSessionLocal, batch_size=2)
+    assert names.ready
+
+    assert [name for _, name in names.search("jo sm")] == ["John Smith", "Smith, Johanna"]
+    assert [name for _, name in names.search("JOSE")] == ["José Santos"]
+    assert len(names.search("jo", limit=2)) == 2
+    assert names.search("   ") == []
+
+def test_autocomplete_is_served_from_the_index_and_follows_writes():
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "autocompleteuser")
+        created = client.post(
+            "/patients/",
+            json={"name": "Zephyrine Quackenbush", "email": "zephyrine@example.com", "phone": "+1234567890"},
+            headers=headers
+        )
+        assert created.status_code == 201
+        patient_id = created.json()["id"]
+
+        deadline = time.monotonic() + 5.0
+        while not name_index.ready and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert name_index.ready
+
+        response = client.get("/patients/autocomplete", params={"prefix": "quack zeph"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == [{"id": patient_id, "name": "Zephyrine Quackenbush"}]
+        # Only the user lookup behind authentication reaches the database.
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+        renamed = client.put(f"/patients/{patient_id}", json={"name": "Zephyrine Quill"}, headers=headers)
+        assert renamed.status_code == 200
+        assert client.get("/patients/autocomplete", params={"prefix": "quack"}, headers=headers).json() == []
+        assert client.get("/patients/autocomplete", params={"prefix": "quil"}, headers=headers).json()[0]["id"] == patient_id
+
+        assert client.delete(f"/patients/{patient_id}", headers=headers).status_code == 200
+        assert client.get("/patients/autocomplete", params={"prefix": "zeph"}, headers=headers).json() == []
+
+def test_autocomplete_is_unavailable_until_the_index_is_built(monkeypatch):
+    client = TestClient(app)
+    headers = create_user_headers(client, "notreadyuser")
+    monkeypatch.setattr(name_index, "_index", None)
+
+    response = client.get("/patients/autocomplete", params={"prefix": "jo"}, headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+    assert client.get("/patients/autocomplete", params={"prefix": ""}, headers=headers).status_code == 400
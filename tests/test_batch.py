@@ -0,0 +1,140 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.infrastructure.repositories.name_index import NameIndex
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository
+from app.main import app
+from app.models.patient import Patient as PatientModel
+from tests.conftest import TestingSessionLocal, create_user_headers
+
+client = TestClient(app)
+
+def create_patient(headers: dict, name: str, email: str) -> dict:
+    response = client.post("/patients/", json={"name": name, "email": email, "phone": "+1234567890"}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+def run_batch(headers: dict, requests: list, **options) -> list:
+    response = client.post("/batch", json={"requests": requests, **options}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["responses"]
+
+def test_batch_returns_a_response_per_request():
+    headers = create_user_headers(client, "batchuser")
+    patient = create_patient(headers, "Ann Lee", "ann@example.com")
+
+    responses = run_batch(headers, [
+        {"id": "get", "method": "GET", "path": f"/patients/{patient['id']}"},
+        {"id": "rename", "method": "PUT", "path": f"/patients/{patient['id']}", "body": {"name": "Ann Park"}},
+        {"id": "search", "method": "GET", "path": "/patients?search=park&limit=5"},
+        {"id": "create", "method": "POST", "path": "/patients/", "body": {"name": "Bob Ray", "email": "bob@example.com", "phone": "+1234567890"}},
+        {"id": "invalid", "method": "POST", "path": "/patients", "body": {"name": "Cy", "email": "not-an-email", "phone": "+1234567890"}},
+        {"id": "missing", "method": "DELETE", "path": "/patients/999999"},
+        {"id": "unknown", "method": "GET", "path": "/patients/import-jobs/1"},
+    ])
+
+    assert [(response["id"], response["status"]) for response in responses] == [
+        ("get", 200), ("rename", 200), ("search", 200), ("create", 201), ("invalid", 400), ("missing", 404), ("unknown", 404),
+    ]
+    assert responses[0]["body"]["name"] == "Ann Lee"
+    assert [found["name"] for found in responses[2]["body"]] == ["Ann Park"]
+    assert [detail.split(":")[0] for detail in responses[4]["body"]["details"]] == ["body -> email"]
+    assert responses[5]["body"] == {"error": "HTTP 404", "message": "Patient not found"}
+
+def test_atomic_batch_rolls_back_every_write():
+    headers = create_user_headers(client, "atomicuser")
+    patient = create_patient(headers, "Ann Lee", "ann@example.com")
+    stats = client.get("/patients/stats", headers=headers).json()
+    cursor = client.get("/patients/changes", headers=headers).json()["next_cursor"]
+
+    responses = run_batch(headers, [
+        {"method": "PUT", "path": f"/patients/{patient['id']}", "body": {"name": "Ann Park"}},
+        {"method": "POST", "path": "/patients", "body": {"name": "Bob Ray", "email": "bob@example.com", "phone": "+1234567890"}},
+        {"id": "dup", "method": "POST", "path": "/patients", "body": {"name": "Ann Copy", "email": "ann@example.com", "phone": "+1234567890"}},
+        {"method": "DELETE", "path": f"/patients/{patient['id']}"},
+    ], atomic=True)
+
+    assert [response["status"] for response in responses] == [424, 424, 400, 424]
+    assert responses[0]["body"]["message"] == "Not applied: request dup of the atomic batch failed"
+    assert [found["name"] for found in client.get("/patients/", headers=headers).json()] == ["Ann Lee"]
+    assert client.get("/patients/stats", headers=headers).json() == stats
+    assert client.get("/patients/changes", params={"since": cursor}, headers=headers).json()["changes"] == []
+
+def test_atomic_batch_commits_when_every_request_succeeds():
+    headers = create_user_headers(client, "commituser")
+    responses = run_batch(headers, [
+        {"method": "POST", "path": "/patients", "body": {"name": "Bob Ray", "email": "bob@example.com", "phone": "+1234567890"}},
+        {"method": "POST", "path": "/patients", "body": {"name": "Cy Po", "email": "cy@example.com", "phone": "+1234567890"}},
+    ], atomic=True)
+
+    assert [response["status"] for response in responses] == [201, 201]
+    assert {found["name"] for found in client.get("/patients/", headers=headers).json()} == {"Bob Ray", "Cy Po"}
+    assert client.get("/patients/stats", headers=headers).json()["active_patients"] == 2
+
+def test_atomic_batch_records_its_changes_once_before_the_commit(monkeypatch):
+    headers = create_user_headers(client, "deferuser")
+    patient = create_patient(headers, "Ann Lee", "ann@example.com")
+    cursor = client.get("/patients/changes", headers=headers).json()["next_cursor"]
+    applied = []
+    apply = PatientStatsRepository.apply
+
+    async def recording_apply(self, deltas):
+        applied.append(dict(deltas))
+        await apply(self, deltas)
+
+    monkeypatch.setattr(PatientStatsRepository, "apply", recording_apply)
+    responses = run_batch(headers, [
+        {"method": "POST", "path": "/patients", "body": {"name": "Bob Ray", "email": "bob@example.com", "phone": "+1234567890"}},
+        {"method": "PUT", "path": f"/patients/{patient['id']}", "body": {"email": "ann@mail.com"}},
+        {"method": "DELETE", "path": f"/patients/{patient['id']}"},
+    ], atomic=True)
+
+    assert [response["status"] for response in responses] == [201, 200, 200]
+    assert len(applied) == 1
+    assert applied[0][("total", "active")] == 0
+    changes = client.get("/patients/changes", params={"since": cursor}, headers=headers).json()["changes"]
+    assert [(change["patient_id"], change["operation"]) for change in changes] == [
+        (responses[0]["body"]["id"], "created"), (patient["id"], "deleted"),
+    ]
+    stats = client.get("/patients/stats", headers=headers).json()
+    assert stats["active_patients"] == 1
+    assert stats["top_domains"] == [{"domain": "example.com", "patients": 1}]
+
+def test_concurrent_batch_keeps_response_order(monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_concurrency", 3)
+    headers = create_user_headers(client, "concurrentuser")
+    requests = [
+        {"id": str(number), "method": "POST", "path": "/patients", "body": {"name": f"Patient {letter}", "email": f"p{number}@example.com", "phone": "+1234567890"}}
+        for number, letter in enumerate("ABCDEFG")
+    ]
+
+    responses = run_batch(headers, requests, concurrency=10)
+    assert [response["id"] for response in responses] == [str(number) for number in range(7)]
+    assert {response["status"] for response in responses} == {201}
+    assert [response["body"]["name"] for response in responses] == [f"Patient {letter}" for letter in "ABCDEFG"]
+
+def test_batch_limits_and_authentication(monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_requests", 2)
+    headers = create_user_headers(client, "limituser")
+    request = {"method": "GET", "path": "/patients"}
+
+    response = client.post("/batch", json={"requests": [request] * 3}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "A batch may contain at most 2 requests"
+    assert client.post("/batch", json={"requests": [{"method": "PATCH", "path": "/patients"}]}, headers=headers).status_code == 400
+    assert client.post("/batch", json={"requests": [request]}, headers={"Authorization": "Bearer invalid"}).status_code == 401
+
+@pytest.mark.asyncio
+async def test_name_index_reload_drops_rolled_back_writes(db_session):
+    db_session.add(PatientModel(name="Ann Lee", email="ann@example.com", phone="+1234567890"))
+    await db_session.commit()
+    names = NameIndex()
+    await names.rebuild(TestingSessionLocal)
+    ann_id = names.search("ann")[0][0]
+
+    names.add(ann_id, "Ann Park")
+    names.add(424242, "Bob Ray")
+    await names.reload(TestingSessionLocal, [ann_id, 424242])
+
+    assert names.search("ann") == [(ann_id, "Ann Lee")]
+    assert names.search("bob") == []
@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.domain.entities.patient import Patient as PatientEntity
+from app.domain.entities.patient_change import ChangeOperation
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.main import app
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+@pytest.fixture
+def headers():
+    return create_user_headers(client, "changefeeduser")
+
+def create_patient(headers, name, email):
+    response = client.post("/patients/", json={"name": name, "email": email, "phone": "+1234567890"}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_feed_returns_writes_in_commit_order_with_tombstones(headers):
+    first = create_patient(headers, "First Patient", "first@example.com")
+    second = create_patient(headers, "Second Patient", "second@example.com")
+    assert client.put(f"/patients/{first}", json={"name": "First Renamed"}, headers=headers).status_code == 200
+    assert client.delete(f"/patients/{second}", headers=headers).status_code == 200
+
+    response = client.get("/patients/changes", headers=headers)
+    assert response.status_code == 200
+    feed = response.json()
+    assert feed["has_more"] is False
+    assert [(change["patient_id"], change["operation"]) for change in feed["changes"]] == [
+        (first, "updated"),
+        (second, "deleted"),
+    ]
+    assert feed["changes"][0]["patient"]["name"] == "First Renamed"
+    assert feed["changes"][1]["patient"] is None
+    seqs = [change["seq"] for change in feed["changes"]]
+    assert seqs == sorted(seqs) and feed["next_cursor"] == seqs[-1]
+
+    empty = client.get("/patients/changes", params={"since": feed["next_cursor"]}, headers=headers).json()
+    assert empty == {"changes": [], "next_cursor": feed["next_cursor"], "has_more": False}
+
+def test_cursor_resumes_across_pages(headers):
+    ids = [create_patient(headers, f"Paged Patient {letter}", f"paged{letter}@example.com") for letter in "abcde"]
+
+    seen = []
+    cursor = 0
+    while True:
+        page = client.get("/patients/changes", params={"since": cursor, "limit": 2}, headers=headers).json()
+        seen.extend(change["patient_id"] for change in page["changes"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == ids
+
+    later = create_patient(headers, "Later Patient", "later@example.com")
+    resumed = client.get("/patients/changes", params={"since": cursor}, headers=headers).json()
+    assert [change["patient_id"] for change in resumed["changes"]] == [later]
+
+@pytest.mark.asyncio
+async def test_bulk_writes_are_logged(db_session):
+    repository = PatientRepository(db_session)
+    await repository.create_many([
+        PatientEntity(id=None, name="Bulk One", email="bulk1@example.com", phone="+1234567890"),
+        PatientEntity(id=None, name="Bulk Two", email="bulk2@example.com", phone="+1234567891"),
+    ])
+    await repository.sync_many("crm", [
+        PatientEntity(id=None, name="Bulk One Synced", email="bulk1@example.com", phone="+1234567890", source_id="c-1"),
+        PatientEntity(id=None, name="Bulk Three", email="bulk3@example.com", phone="+1234567892", source_id="c-3"),
+    ])
+
+    page = await repository.get_changes()
+    assert [(change.patient.name, change.operation) for change in page.changes] == [
+        ("Bulk Two", ChangeOperation.CREATED),
+        ("Bulk Three", ChangeOperation.CREATED),
+        ("Bulk One Synced", ChangeOperation.UPDATED),
+    ]
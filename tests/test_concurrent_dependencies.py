@@ -0,0 +1,103 @@
+import asyncio
+import time
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.config import settings
+from app.presentation.dependencies import resolve_with_current_user
+from app.presentation.controllers.patient_controller import build_patient_use_cases
+from tests.conftest import test_engine
+
+client = TestClient(app)
+
+SIMULATED_RTT = 0.05
+
+class SlowSession(AsyncSession):
+    async def execute(self, *args, **kwargs):
+        await asyncio.sleep(SIMULATED_RTT)
+        return await super().execute(*args, **kwargs)
+
+SlowSessionLocal = sessionmaker(test_engine, class_=SlowSession, expire_on_commit=False)
+
+@pytest.fixture
+def concurrent_mode(monkeypatch):
+    monkeypatch.setattr(settings, "concurrent_dependencies", True)
+
+@pytest.fixture
+def auth_and_patient():
+    client.post("/auth/register", json={
+        "username": "concurrentuser",
+        "email": "concurrent@example.com",
+        "password": "TestPass123!"
+    })
+    token = client.post("/auth/token", json={
+        "username": "concurrentuser",
+        "password": "TestPass123!"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    patient = client.post("/patients/", json={
+        "name": "Concurrent Patient",
+        "email": "concurrent.patient@example.com",
+        "phone": "+1234567890"
+    }, headers=headers).json()
+    return token, patient
+
+def test_get_patient_concurrent_mode(concurrent_mode, auth_and_patient):
+    token, patient = auth_and_patient
+    response = client.get(f"/patients/{patient['id']}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == "concurrent.patient@example.com"
+
+def test_get_patient_concurrent_mode_rejects_invalid_token(concurrent_mode, auth_and_patient):
+    _, patient = auth_and_patient
+    response = client.get(f"/patients/{patient['id']}", headers={"Authorization": "Bearer invalid-token"})
+    assert response.status_code == 401
+    assert "Concurrent Patient" not in response.text
+
+def test_get_nonexistent_patient_concurrent_mode(concurrent_mode, auth_and_patient):
+    token, _ = auth_and_patient
+    response = client.get("/patients/99999", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_overlaps_round_trips(monkeypatch, auth_and_patient):
+    token, patient = auth_and_patient
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def measure() -> float:
+        started = time.perf_counter()
+        _, found = await resolve_with_current_user(
+            credentials,
+            SlowSessionLocal,
+            lambda db: build_patient_use_cases(db).get_patient_by_id(patient["id"])
+        )
+        assert found.id == patient["id"]
+        return time.perf_counter() - started
+
+    monkeypatch.setattr(settings, "concurrent_dependencies", False)
+    sequential = await measure()
+    monkeypatch.setattr(settings, "concurrent_dependencies", True)
+    concurrent = await measure()
+
+    assert sequential >= 2 * SIMULATED_RTT
+    assert concurrent < sequential * 0.8
+
+@pytest.mark.asyncio
+async def test_concurrent_mode_invalid_token_cancels_lookup(concurrent_mode):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid-token")
+    lookup_finished = asyncio.Event()
+
+    async def lookup(db):
+        await asyncio.sleep(SIMULATED_RTT)
+        lookup_finished.set()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await resolve_with_current_user(credentials, SlowSessionLocal, lookup)
+
+    assert exc_info.value.status_code == 401
+    await asyncio.sleep(SIMULATED_RTT * 2)
+    assert not lookup_finished.is_set()
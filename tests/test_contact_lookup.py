@@ -0,0 +1,47 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.domain.normalization import normalize_email, normalize_phone
+from app.main import app
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+def test_normalization():
+    assert normalize_email("  John.Doe@Example.COM ") == "john.doe@example.com"
+    assert normalize_phone("(555) 123-4567") == normalize_phone("+1 555.123.4567") == "+15551234567"
+    assert normalize_phone("+55 11 98765-4321") == "+5511987654321"
+
+def test_lookup_by_phone_and_email():
+    headers = create_user_headers(client, "lookupuser")
+    for name, email, phone in (
+        ("Ana Lima", "Ana.Lima@Example.com", "(555) 123-4567"),
+        ("Rui Lima", "rui@example.com", "+1 555 123 4567"),
+        ("Eva Cruz", "eva@example.com", "555-999-0000"),
+    ):
+        assert client.post("/patients/", json={"name": name, "email": email, "phone": phone}, headers=headers).status_code == 201
+    
+    by_phone = client.get("/patients/lookup", params={"phone": "555.123.4567"}, headers=headers)
+    assert by_phone.status_code == 200
+    assert [patient["name"] for patient in by_phone.json()] == ["Ana Lima", "Rui Lima"]
+    
+    by_email = client.get("/patients/lookup", params={"email": "ana.lima@EXAMPLE.com"}, headers=headers).json()
+    assert [patient["name"] for patient in by_email] == ["Ana Lima"]
+    
+    assert client.get("/patients/lookup", params={"email": "nobody@example.com"}, headers=headers).json() == []
+    assert client.get("/patients/lookup", headers=headers).status_code == 400
+
+def test_emails_differing_only_by_case_are_duplicates():
+    headers = create_user_headers(client, "caseuser")
+    patient = {"name": "Case Patient", "email": "John@Example.com", "phone": "+1234567890"}
+    assert client.post("/patients/", json=patient, headers=headers).status_code == 201
+    
+    response = client.post("/patients/", json={**patient, "email": "john@example.com"}, headers=headers)
+    assert response.status_code == 400
+    assert "already exists" in response.json()["message"]
+
+@pytest.mark.asyncio
+async def test_lookups_use_the_normalized_indexes(db_session):
+    for column in ("email_normalized", "phone_normalized"):
+        plan = await db_session.execute(text(f"EXPLAIN QUERY PLAN SELECT id FROM patients WHERE {column} = :value"), {"value": "x"})
+        assert f"ix_patients_{column}" in " ".join(str(row) for row in plan)
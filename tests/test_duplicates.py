@@ -0,0 +1,129 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.application.use_cases.duplicate_use_cases import DuplicateDetectionUseCases
+from app.domain.entities.duplicate import DuplicateMatch
+from app.domain.entities.patient import Patient
+from app.infrastructure.dedup.matching import blocking_keys, jaro_winkler, match_score, soundex
+from app.infrastructure.repositories.duplicate_repository import DuplicateRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.main import app
+from app.models.patient import Patient as PatientModel
+from tests.conftest import create_user_headers
+
+async def add_patients(db_session, *rows):
+    models = [PatientModel(name=name, email=email, phone=phone) for name, email, phone in rows]
+    db_session.add_all(models)
+    await db_session.commit()
+    return [model.id for model in models]
+
+def test_blocking_keys_and_scoring():
+    assert soundex("robert") == soundex("rupert") == "R163"
+    assert jaro_winkler("martha", "marhta") == pytest.approx(0.961, abs=1e-3)
+    
+    john = Patient(id=1, name="Dr. John Smith", email="john@example.com", phone="+1 (555) 123-4567")
+    swapped = Patient(id=2, name="Smith John", email="jsmith@example.org", phone="555-123-4567")
+    assert blocking_keys(john) == blocking_keys(swapped) == {"n:john:smith", "s:J500:S530", "p:5551234567"}
+    assert match_score(john, swapped) >= 0.9
+    
+    namesake = Patient(id=3, name="John Smith", email="other@example.com", phone="555-987-6543")
+    assert match_score(john, namesake) < 0.85
+
+@pytest.mark.asyncio
+async def test_scan_clusters_duplicates_and_reruns_incrementally(db_session):
+    john, swapped, typo, mary = await add_patients(
+        db_session,
+        ("John Smith", "john@example.com", "+1 555 123 4567"),
+        ("Smith John", "jsmith@example.org", "555-123-4567"),
+        ("Jon Smith", "jon.smith@example.net", "5551234567"),
+        ("Mary Jones", "mary@example.com", "555-000-1111"),
+    )
+    use_cases = DuplicateDetectionUseCases(DuplicateRepository(db_session), batch_size=2)
+    
+    first = await use_cases.scan()
+    assert (first.processed, first.matched) == (4, 3)
+    clusters = await use_cases.get_clusters()
+    assert [[patient.id for patient in cluster.patients] for cluster in clusters] == [[john, swapped, typo]]
+    assert clusters[0].cluster_id == john
+    
+    assert (await use_cases.scan()).processed == 0
+    
+    [late] = await add_patients(db_session, ("John Smyth", "smyth@example.com", "555.123.4567"))
+    second = await use_cases.scan()
+    assert second.processed == 1
+    assert second.compared == 3
+    clusters = await use_cases.get_clusters()
+    assert [patient.id for patient in clusters[0].patients] == [john, swapped, typo, late]
+    assert mary not in [patient.id for cluster in clusters for patient in cluster.patients]
+
+@pytest.mark.asyncio
+async def test_oversized_blocks_are_skipped(db_session):
+    await add_patients(db_session, *[(f"Ann Lee", f"ann{index}@example.com", f"555-100-{index:04d}") for index in range(5)])
+    use_cases = DuplicateDetectionUseCases(DuplicateRepository(db_session), max_block_size=3)
+    
+    result = await use_cases.scan()
+    assert result.compared == 0
+    assert result.oversized_blocks == 2
+
+@pytest.mark.asyncio
+async def test_matches_bridging_two_clusters_merge_them(db_session):
+    first, second, third, fourth = await add_patients(
+        db_session,
+        *[(f"Patient {name}", f"{name}@example.com", "555-200-3000") for name in ("Alpha", "Bravo", "Charlie", "Delta")]
+    )
+    repository = DuplicateRepository(db_session)
+    await repository.record_matches([DuplicateMatch(first, second, 0.9)])
+    await repository.record_matches([DuplicateMatch(third, fourth, 0.9)])
+    await repository.record_matches([DuplicateMatch(second, third, 0.9)])
+    
+    [cluster] = await repository.list_clusters()
+    assert cluster.cluster_id == first
+    assert [patient.id for patient in cluster.patients] == [first, second, third, fourth]
+    assert len(cluster.matches) == 3
+
+@pytest.mark.asyncio
+async def test_edited_patients_are_scored_again(db_session):
+    souza, sousa, costa = await add_patients(
+        db_session,
+        ("Carla Souza", "carla@example.com", "+55 11 98765-4321"),
+        ("Carla Sousa", "csousa@example.org", "11987654321"),
+        ("Carla Souza", "souza@example.net", "(11) 98765-4321"),
+    )
+    use_cases = DuplicateDetectionUseCases(DuplicateRepository(db_session))
+    await use_cases.scan()
+    [cluster] = await use_cases.get_clusters()
+    assert [patient.id for patient in cluster.patients] == [souza, sousa, costa]
+    
+    patients = PatientRepository(db_session)
+    await patients.update(sousa, {"name": "Carla Sousa"})
+    assert await use_cases.count_pending() == 0
+    await patients.update(souza, {"name": "Mary Jones", "email": "mary@example.com", "phone": "555-000-1111"})
+    assert await use_cases.count_pending() == 1
+    
+    result = await use_cases.scan()
+    assert result.processed == 1
+    [cluster] = await use_cases.get_clusters()
+    assert cluster.cluster_id == sousa
+    assert [patient.id for patient in cluster.patients] == [sousa, costa]
+    assert [(match.patient_id, match.matched_patient_id) for match in cluster.matches] == [(sousa, costa)]
+
+def test_scan_endpoint_runs_in_background():
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "dedupuser")
+        for name, email in (("Carla Souza", "carla@example.com"), ("Carla Sousa", "csousa@example.org")):
+            response = client.post("/patients/", json={"name": name, "email": email, "phone": "+5511987654321"}, headers=headers)
+            assert response.status_code == 201
+        
+        response = client.post("/patients/duplicates/scan", headers=headers)
+        assert response.status_code == 202
+        assert response.json() == {"status": "scheduled", "pending_patients": 2}
+        
+        deadline = time.monotonic() + 5.0
+        clusters = []
+        while not clusters and time.monotonic() < deadline:
+            clusters = client.get("/patients/duplicates", headers=headers).json()
+            time.sleep(0.05)
+        assert [patient["name"] for patient in clusters[0]["patients"]] == ["Carla Souza", "Carla Sousa"]
+        assert clusters[0]["matches"][0]["score"] >= 0.85
+        
+        assert client.get("/patients/duplicates").status_code == 403
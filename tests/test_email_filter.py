@@ -0,0 +1,86 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.infrastructure.monitoring.sql import start_query_tracking, stop_query_tracking
+from app.infrastructure.repositories.email_filter import BloomFilter, EmailFilter, email_filter
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.main import app
+from app.models.patient import Patient as PatientModel
+from tests.conftest import TestingSessionLocal, create_user_headers
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    members = [f"patient{index}@example.com" for index in range(5000)]
+    for email in members:
+        bloom.add(email)
+
+    assert all(email in bloom for email in members)
+    false_positives = sum(f"other{index}@example.com" in bloom for index in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert bloom.estimated_false_positive_rate == pytest.approx(0.01, rel=0.2)
+
+@pytest.mark.asyncio
+async def test_ready_filter_skips_lookup_for_new_email(db_session):
+    db_session.add(PatientModel(name="Existing Patient", email="existing@example.com", phone="+1234567890"))
+    await db_session.commit()
+
+    emails = EmailFilter(min_capacity=100)
+    assert emails.might_contain("new@example.com")
+    await emails.rebuild(TestingSessionLocal)
+    assert emails.might_contain("existing@example.com")
+
+    use_cases = PatientUseCases(PatientRepository(db_session), email_filter=emails)
+    stats, token = start_query_tracking()
+    try:
+        await use_cases.create_patient({"name": "New Patient", "email": "new@example.com", "phone": "+1234567891"})
+    finally:
+        stop_query_tracking(token)
+    # Patient insert, change log insert, stats upsert and refresh; no email lookup.
+    assert stats.count == 4
+
+    with pytest.raises(ValueError):
+        await use_cases.create_patient({"name": "Other Patient", "email": "existing@example.com", "phone": "+1234567892"})
+
+@pytest.mark.asyncio
+async def test_unique_constraint_catches_emails_the_filter_has_not_seen(db_session):
+    emails = EmailFilter(min_capacity=100)
+    await emails.rebuild(TestingSessionLocal)
+    async with TestingSessionLocal() as other_worker:
+        other_worker.add(PatientModel(name="Elsewhere Patient", email="elsewhere@example.com", phone="+1234567890"))
+        await other_worker.commit()
+
+    use_cases = PatientUseCases(PatientRepository(db_session), email_filter=emails)
+    with pytest.raises(ValueError, match="already exists"):
+        await use_cases.create_patient({"name": "Late Patient", "email": "elsewhere@example.com", "phone": "+1234567891"})
+
+    created = await use_cases.create_patient({"name": "Next Patient", "email": "next@example.com", "phone": "+1234567892"})
+    assert created.id is not None
+
+def test_writes_update_filter_and_metrics_are_exposed():
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "filteruser")
+        deadline = time.monotonic() + 5.0
+        while not email_filter.ready and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert email_filter.ready
+
+        response = client.post(
+            "/patients/",
+            json={"name": "Filtered Patient", "email": "filtered@example.com", "phone": "+1234567890"},
+            headers=headers
+        )
+        assert response.status_code == 201
+        assert email_filter.might_contain("filtered@example.com")
+
+        duplicate = client.post(
+            "/patients/",
+            json={"name": "Filtered Again", "email": "filtered@example.com", "phone": "+1234567891"},
+            headers=headers
+        )
+        assert duplicate.status_code == 400
+
+        metrics = client.get("/metrics").text
+    assert "email_filter_lookups_total" in metrics
+    assert "email_filter_false_positives_total" in metrics
+    assert "email_filter_bytes" in metrics
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.infrastructure.monitoring.event_loop import EventLoopMonitor
+from app.infrastructure.monitoring.request_context import (
+    RequestContext,
+    bind_request_context,
+    unbind_request_context,
+)
+
+client = TestClient(app)
+
+def blocking_bcrypt_stand_in():
+    time.sleep(0.3)
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_logged_with_stack_and_request(caplog):
+    monitor = EventLoopMonitor(interval=0.02, threshold=0.05)
+    monitor_task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    token = bind_request_context(RequestContext("req-123", "POST", "/auth/token"))
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.infrastructure.monitoring.event_loop"):
+            blocking_bcrypt_stand_in()
+            await asyncio.sleep(0.05)
+    finally:
+        unbind_request_context(token)
+        monitor_task.cancel()
+
+    assert "Event loop blocked" in caplog.text
+    assert "blocking_bcrypt_stand_in" in caplog.text
+    assert "request_id=req-123 POST /auth/token" in caplog.text
+
+@pytest.mark.asyncio
+async def test_idle_loop_is_not_reported(caplog):
+    monitor = EventLoopMonitor(interval=0.02, threshold=0.05)
+    monitor_task = asyncio.create_task(monitor.run())
+    with caplog.at_level(logging.WARNING, logger="app.infrastructure.monitoring.event_loop"):
+        await asyncio.sleep(0.2)
+    monitor_task.cancel()
+    assert "Event loop blocked" not in caplog.text
+
+def test_lag_histogram_exposed():
+    assert "event_loop_lag_seconds_bucket" in client.get("/metrics").text
+
+def test_request_id_is_returned_and_propagated():
+    response = client.get("/health", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    generated = client.get("/health").headers["x-request-id"]
+    assert len(generated) == 32
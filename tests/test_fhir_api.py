@@ -0,0 +1,62 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from app.domain.entities.patient import Patient
+from app.infrastructure.fhir.serialization import FhirPatientSerializer
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+def naive_resource(patient: Patient) -> dict:
+    *given, family = patient.name.split()
+    return {
+        "resourceType": "Patient",
+        "id": str(patient.id),
+        "identifier": [{"system": "urn:nuvie:patient", "value": str(patient.id)}],
+        "name": [{"use": "official", "text": patient.name, "family": family, "given": given}],
+        "telecom": [{"system": "phone", "value": patient.phone}, {"system": "email", "value": patient.email}],
+    }
+
+def test_serializer_matches_dict_encoding_and_escapes():
+    patient = Patient(id=7, name='Zoë "Q" O\'Neil', email="zoe@example.com", phone="+1 555 0100")
+    resource = json.loads(FhirPatientSerializer("http://testserver/fhir").resource(patient))
+    
+    assert resource.pop("meta")["lastUpdated"]
+    assert resource == naive_resource(patient)
+
+def test_read_patient_returns_fhir_json():
+    headers = create_user_headers(client, "fhirreader")
+    created = client.post("/patients/", json={"name": "Maria Clara Souza", "email": "maria.fhir@example.com", "phone": "+5511999990000"}, headers=headers).json()
+    
+    response = client.get(f"/fhir/Patient/{created['id']}", headers=headers)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/fhir+json"
+    resource = response.json()
+    assert resource["name"][0] == {"use": "official", "text": "Maria Clara Souza", "family": "Souza", "given": ["Maria", "Clara"]}
+    assert {"system": "email", "value": "maria.fhir@example.com"} in resource["telecom"]
+    
+    missing = client.get("/fhir/Patient/not-a-number", headers=headers)
+    assert missing.status_code == 404
+    assert missing.json()["resourceType"] == "OperationOutcome"
+
+def test_searchset_is_paginated():
+    headers = create_user_headers(client, "fhirsearch")
+    for index in range(5):
+        client.post("/patients/", json={"name": "Searchset Person", "email": f"searchset{index}@example.com", "phone": "+1234567890"}, headers=headers)
+    
+    first = client.get("/fhir/Patient", params={"name": "Searchset", "_count": 2}, headers=headers).json()
+    assert first["type"] == "searchset"
+    assert len(first["entry"]) == 2
+    links = {link["relation"]: link["url"] for link in first["link"]}
+    assert "previous" not in links
+    
+    second = client.get(links["next"], headers=headers).json()
+    third = client.get({link["relation"]: link["url"] for link in second["link"]}["next"], headers=headers).json()
+    ids = [entry["resource"]["id"] for page in (first, second, third) for entry in page["entry"]]
+    assert len(ids) == len(set(ids)) == 5
+    assert "next" not in {link["relation"] for link in third["link"]}
+    assert first["entry"][0]["fullUrl"].startswith("http://testserver/fhir/Patient/")
+    
+    empty = client.get("/fhir/Patient", params={"name": "Nobody Here"}, headers=headers).json()
+    assert "entry" not in empty
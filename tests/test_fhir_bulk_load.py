@@ -0,0 +1,173 @@
+import asyncio
+import io
+import json
+import tempfile
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.main import app
+from app.config import settings
+from app.application.use_cases.import_job_use_cases import ImportJobUseCases
+from app.application.use_cases.import_pipeline import PipelineLimits
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.infrastructure.fhir.bulk_loader import FhirBulkLoader, transform_pool
+from app.infrastructure.fhir.reader import FhirFileReader, FhirResourceReader
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.external.synthea_service import SyntheaService
+from app.models.patient import Patient as PatientModel
+from tests.conftest import create_user_headers, stub_http_client
+from tests.test_patients import wait_for_import_job
+
+def synthea_patient(index, phone="555-203-4410"):
+    resource = {
+        "resourceType": "Patient",
+        "id": f"b5f0c2a4-{index:04d}",
+        "name": [{"use": "official", "family": f"Kuhn{index}", "given": [f"Abe{index}"], "prefix": ["Mr."]}],
+        "gender": "male",
+        "birthDate": "1980-04-02",
+    }
+    if phone:
+        resource["telecom"] = [{"system": "phone", "value": phone, "use": "home"}]
+    return resource
+
+def bundle(resources, indent=None):
+    entries = []
+    for resource in resources:
+        entries.append({"fullUrl": f"urn:uuid:{resource['id']}", "resource": resource})
+        entries.append({"resource": {"resourceType": "Encounter", "id": f"enc-{resource['id']}"}})
+    return json.dumps({"resourceType": "Bundle", "type": "transaction", "entry": entries}, indent=indent).encode()
+
+def ndjson(resources):
+    return b"\n".join(json.dumps(resource).encode() for resource in resources) + b"\n"
+
+def use_cases(db_session, workers):
+    return PatientUseCases(PatientRepository(db_session), import_limits=PipelineLimits(batch_size=40, transform_workers=workers))
+
+@pytest.mark.parametrize("document, expected_format", [
+    (bundle([synthea_patient(1)], indent=2), "bundle"),
+    (bundle([synthea_patient(1)]), "bundle"),
+    (ndjson([synthea_patient(1), synthea_patient(2)]), "ndjson"),
+])
+def test_reader_detects_format_and_yields_patients_only(document, expected_format):
+    reader = FhirResourceReader(io.BytesIO(document))
+    assert reader.format == expected_format
+    assert len(reader.next_batch(10)) == (2 if expected_format == "ndjson" else 1)
+
+def test_transform_fhir_to_patient_maps_synthea_names():
+    patient = SyntheaService(stub_http_client).transform_fhir_to_patient(synthea_patient(7))
+    assert patient.name == "Abe Kuhn"
+    assert patient.email == "b5f0c2a4-0007@synthea.example"
+    assert patient.phone == "555-203-4410"
+
+@pytest.mark.asyncio
+async def test_ndjson_load_reports_invalid_resources(db_session):
+    resources = [synthea_patient(index) for index in range(100)]
+    resources[5] = synthea_patient(5, phone=None)
+    
+    imported = await use_cases(db_session, workers=0).load_fhir_patients(io.BytesIO(ndjson(resources)))
+    
+    assert imported == 99
+    total = await db_session.scalar(select(func.count()).select_from(PatientModel))
+    assert total == 99
+
+@pytest.mark.asyncio
+async def test_bundle_load_uses_process_pool(db_session):
+    document = bundle([synthea_patient(index) for index in range(200, 300)])
+    
+    try:
+        first = await use_cases(db_session, workers=2).load_fhir_patients(io.BytesIO(document), "bundle")
+        pool = transform_pool.get(2)
+        second = await use_cases(db_session, workers=2).load_fhir_patients(io.BytesIO(document), "bundle")
+        assert transform_pool.get(2) is pool
+    finally:
+        await transform_pool.shutdown()
+    
+    assert (first, second) == (100, 0)
+
+@pytest.mark.asyncio
+async def test_file_loads_batch_across_files(tmp_path):
+    paths = []
+    for index in range(5):
+        path = tmp_path / f"patient{index}.json"
+        path.write_bytes(bundle([synthea_patient(index)]))
+        paths.append(path)
+    (tmp_path / "extra.ndjson").write_bytes(ndjson([synthea_patient(index) for index in range(5, 8)]))
+    paths.append(tmp_path / "extra.ndjson")
+    
+    batches = []
+    
+    async def write_batch(patients):
+        batches.append(len(patients))
+        return len(patients)
+    
+    reader = FhirFileReader(paths)
+    progress = await FhirBulkLoader(write_batch, batch_size=3, workers=0).load_resources(reader)
+    
+    assert batches == [3, 3, 2]
+    assert progress.imported == 8
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_written_row_by_row():
+    written = []
+    
+    async def write_batch(patients):
+        if any(patient.email.startswith("b5f0c2a4-0003@") for patient in patients):
+            raise ValueError("Rejected by the database: value too long")
+        written.extend(patients)
+        return len(patients)
+    
+    document = ndjson([synthea_patient(index) for index in range(6)])
+    progress = await FhirBulkLoader(write_batch, batch_size=6, workers=0).load(io.BytesIO(document))
+    
+    assert (progress.processed, progress.imported, progress.failed) == (6, 5, 1)
+    assert len(written) == 5
+    assert progress.errors == ["b5f0c2a4-0003@synthea.example: Rejected by the database: value too long"]
+
+def test_fhir_upload_endpoint_runs_as_job(monkeypatch):
+    monkeypatch.setattr(settings, "fhir_transform_workers", 0)
+    document = ndjson([synthea_patient(index) for index in range(400, 430)])
+    
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "fhirloader")
+        response = client.post(
+            "/patients/import-fhir",
+            content=document,
+            headers={**headers, "Content-Type": "application/fhir+ndjson"}
+        )
+        assert response.status_code == 202
+        assert response.json()["source"] == "fhir"
+        job = wait_for_import_job(client, response.headers["Location"], headers)
+        
+        empty = client.post("/patients/import-fhir", content=b"", headers=headers)
+    
+    assert job["status"] == "completed"
+    assert job["imported_count"] == 30
+    assert empty.status_code == 400
+
+def test_fhir_upload_spool_is_removed_however_the_job_ends(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(settings, "fhir_transform_workers", 0)
+    monkeypatch.setattr(settings, "import_job_concurrency", 1)
+    monkeypatch.setattr(settings, "import_job_shutdown_timeout", 0.1)
+    document = ndjson([synthea_patient(index) for index in range(500, 505)])
+    
+    def upload(client, headers):
+        return client.post("/patients/import-fhir", content=document, headers={**headers, "Content-Type": "application/fhir+ndjson"})
+    
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "fhirspool")
+        wait_for_import_job(client, upload(client, headers).headers["Location"], headers)
+        
+        # Occupy the only job slot so the next upload is still queued at shutdown.
+        client.portal.call(lambda: app.state.job_executor.submit(lambda: asyncio.sleep(3600)))
+        assert upload(client, headers).status_code == 202
+        assert len(list(tmp_path.glob("fhir-*"))) == 1
+    assert list(tmp_path.glob("fhir-*")) == []
+    
+    async def unavailable(self, *args, **kwargs):
+        raise RuntimeError("database unavailable")
+    
+    monkeypatch.setattr(ImportJobUseCases, "enqueue_job", unavailable)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        assert upload(client, headers).status_code == 500
+    assert list(tmp_path.glob("fhir-*")) == []
@@ -0,0 +1,87 @@
+import httpx
+import pytest
+from app.infrastructure.external import http_cache
+from app.infrastructure.external.external_api_service import ExternalApiService
+from app.infrastructure.external.http_cache import (
+    HTTP_CACHE_REQUESTS,
+    CachedResponse,
+    CachingTransport,
+    DiskCache,
+)
+from tests.conftest import external_api_stub
+
+ETAG = '"users-v1"'
+
+class ConditionalStub:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304, headers={"ETag": ETAG})
+        response = external_api_stub(request)
+        response.headers["ETag"] = ETAG
+        return response
+
+def create_cached_client(tmp_path, handler, ttl=300.0):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=2**20)
+    transport = CachingTransport(httpx.MockTransport(handler), cache, ttl)
+    return httpx.AsyncClient(transport=transport)
+
+def cache_count(result: str) -> float:
+    return HTTP_CACHE_REQUESTS.labels(result)._value.get()
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_without_network(tmp_path):
+    stub = ConditionalStub()
+    async with create_cached_client(tmp_path, stub) as client:
+        hits = cache_count("hit")
+        first = await ExternalApiService(client).fetch_patients(count=3)
+        second = await ExternalApiService(client).fetch_patients(count=3)
+
+    assert first == second
+    assert len(stub.requests) == 1
+    assert cache_count("hit") == hits + 1
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_with_etag(tmp_path):
+    stub = ConditionalStub()
+    async with create_cached_client(tmp_path, stub, ttl=0) as client:
+        revalidated = cache_count("revalidated")
+        await client.get("https://jsonplaceholder.typicode.com/users")
+        response = await client.get("https://jsonplaceholder.typicode.com/users")
+
+    assert stub.requests[1].headers["If-None-Match"] == ETAG
+    assert response.status_code == 200
+    assert response.extensions["cache_status"] == "revalidated"
+    assert len(response.json()) == 10
+    assert cache_count("revalidated") == revalidated + 1
+
+@pytest.mark.asyncio
+async def test_parsed_body_is_reused_across_revalidations(tmp_path):
+    stub = ConditionalStub()
+    async with create_cached_client(tmp_path, stub, ttl=0) as client:
+        first = http_cache.cached_json(await client.get("https://jsonplaceholder.typicode.com/users"))
+        second = http_cache.cached_json(await client.get("https://jsonplaceholder.typicode.com/users"))
+    assert first is second
+
+@pytest.mark.asyncio
+async def test_uncacheable_responses_pass_through(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={}, headers={"Cache-Control": "no-store"})
+
+    async with create_cached_client(tmp_path, handler) as client:
+        await client.get("https://example.test/a")
+        await client.post("https://example.test/a")
+    assert list((tmp_path / "cache").iterdir()) == []
+
+def test_disk_cache_is_shared_and_bounded(tmp_path):
+    writer = DiskCache(str(tmp_path), max_bytes=2500)
+    reader = DiskCache(str(tmp_path), max_bytes=2500)
+    for index in range(4):
+        writer.set(CachedResponse(f"https://example.test/{index}", 200, {}, 0.0, b"x" * 1000))
+
+    assert reader.get("https://example.test/3").body == b"x" * 1000
+    assert len(list(tmp_path.iterdir())) == 2
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 2500
@@ -0,0 +1,51 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.infrastructure.external.external_api_service import ExternalApiService
+from app.infrastructure.external.http_client import create_http_client
+from app.infrastructure.external.synthea_service import SyntheaService
+from tests.conftest import EXTERNAL_USERS, create_stub_http_client, external_api_stub
+
+def test_lifespan_owns_shared_client():
+    with TestClient(app) as client:
+        shared = app.state.http_client
+        assert isinstance(shared, httpx.AsyncClient)
+        assert not shared.is_closed
+        assert client.get("/health").status_code == 200
+    assert shared.is_closed
+
+def test_client_uses_configured_limits(monkeypatch):
+    monkeypatch.setattr(settings, "http_max_connections", 7)
+    monkeypatch.setattr(settings, "http_max_keepalive_connections", 3)
+    monkeypatch.setattr(settings, "http_connect_timeout", 2.0)
+    monkeypatch.setattr(settings, "http_cache_enabled", False)
+    http_client = create_http_client()
+    pool = http_client._transport._transport._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert http_client.timeout.connect == 2.0
+
+@pytest.mark.asyncio
+async def test_services_share_injected_client():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return external_api_stub(request)
+
+    http_client = create_stub_http_client(handler)
+    external = await ExternalApiService(http_client).fetch_patients(count=3)
+    synthea = await SyntheaService(http_client).fetch_patients(count=2)
+
+    assert [patient["email"] for patient in external] == [user["email"] for user in EXTERNAL_USERS[:3]]
+    assert external[0] == {"name": "Leanne Graham", "email": "Sincere@april.biz", "phone": "1-770-736-8031"}
+    assert [patient["resourceType"] for patient in synthea] == ["Patient", "Patient"]
+    assert len(requests) == 2
+
+@pytest.mark.asyncio
+async def test_external_errors_propagate():
+    http_client = create_stub_http_client(lambda request: httpx.Response(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        await ExternalApiService(http_client).fetch_patients()
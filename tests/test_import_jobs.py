@@ -0,0 +1,119 @@
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.application.use_cases.import_job_use_cases import STALE_JOB_ERROR, ImportJobUseCases
+from app.domain.entities.import_job import MAX_RECORDED_ERRORS, ImportJobStatus, ImportProgress
+from app.infrastructure.jobs.executor import JobExecutor
+from app.infrastructure.repositories.import_job_repository import ImportJobRepository
+from app.models.import_job import ImportJob as ImportJobModel
+from app.presentation.dependencies import get_http_client
+from tests.conftest import create_stub_http_client, create_user_headers
+from tests.test_patients import wait_for_import_job
+
+def test_import_job_reports_progress_counts():
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "importjobs")
+        response = client.post("/patients/import-data?count=5", headers=headers)
+        
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        job = wait_for_import_job(client, response.headers["Location"], headers)
+        
+        assert job["status"] == "completed"
+        assert job["processed_count"] == 5
+        assert job["imported_count"] + job["skipped_count"] == 5
+        assert job["failed_count"] == 0
+        assert job["duration_seconds"] is not None
+        
+        rerun = client.post("/patients/import-data?count=5", headers=headers)
+        job = wait_for_import_job(client, rerun.headers["Location"], headers)
+        assert job["skipped_count"] == 5
+
+def test_failed_import_job_records_error():
+    def failing(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+    
+    stub_client = create_stub_http_client(failing)
+    previous_override = app.dependency_overrides[get_http_client]
+    app.dependency_overrides[get_http_client] = lambda: stub_client
+    try:
+        with TestClient(app) as client:
+            headers = create_user_headers(client, "importfailure")
+            response = client.post("/patients/import-data?count=2", headers=headers)
+            job = wait_for_import_job(client, response.headers["Location"], headers)
+    finally:
+        app.dependency_overrides[get_http_client] = previous_override
+    
+    assert job["status"] == "failed"
+    assert "503" in job["errors"][-1]
+
+def test_unknown_import_job_returns_404():
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "importmissing")
+        assert client.get("/patients/import-jobs/999999", headers=headers).status_code == 404
+
+@pytest.mark.asyncio
+async def test_executor_limits_concurrency_and_cancels_on_shutdown():
+    executor = JobExecutor(max_concurrency=2)
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+    
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await release.wait()
+        finally:
+            running -= 1
+    
+    tasks = [executor.submit(job, key=number) for number in range(5)]
+    await asyncio.sleep(0.01)
+    assert peak == 2
+    assert executor.pending == 5
+    assert sorted(executor.keys) == [0, 1, 2, 3, 4]
+    
+    await executor.shutdown(timeout=0.01)
+    assert all(task.done() for task in tasks)
+    assert executor.pending == 0
+    assert executor.keys == []
+
+@pytest.mark.asyncio
+async def test_abandoned_jobs_are_failed_and_held_jobs_kept_alive(db_session):
+
+    use_cases = ImportJobUseCases(ImportJobRepository(db_session))
+    abandoned = await use_cases.enqueue_job(5)
+    await use_cases.start_job(abandoned.id)
+    held = await use_cases.enqueue_job(5)
+    await use_cases.start_job(held.id)
+    finished = await use_cases.enqueue_job(5)
+    await use_cases.complete_job(finished.id, ImportProgress())
+
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    for job_id in (abandoned.id, held.id, finished.id):
+        (await db_session.get(ImportJobModel, job_id)).heartbeat_at = long_ago
+    await db_session.commit()
+
+    await use_cases.keep_alive([held.id])
+    assert await use_cases.fail_stale_jobs(stale_after=300) == 1
+
+    reaped = await use_cases.get_job(abandoned.id)
+    assert reaped.status == ImportJobStatus.FAILED
+    assert reaped.errors == [STALE_JOB_ERROR]
+    assert (await use_cases.get_job(held.id)).status == ImportJobStatus.RUNNING
+    assert (await use_cases.get_job(finished.id)).status == ImportJobStatus.COMPLETED
+
+@pytest.mark.asyncio
+async def test_failed_job_keeps_a_bounded_error_list(db_session):
+
+    use_cases = ImportJobUseCases(ImportJobRepository(db_session))
+    job = await use_cases.enqueue_job(5)
+    progress = ImportProgress(errors=[f"error {number}" for number in range(MAX_RECORDED_ERRORS)])
+
+    failed = await use_cases.fail_job(job.id, progress, "fatal")
+    assert len(failed.errors) == MAX_RECORDED_ERRORS
+    assert failed.errors[-1] == "fatal"
@@ -0,0 +1,137 @@
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import func, select
+from app.application.use_cases.import_pipeline import ImportPipeline, PipelineLimits
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.domain.entities.import_job import ImportProgress
+from app.domain.entities.patient import Patient
+from app.infrastructure.external.external_api_service import ExternalApiService
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.models.patient import Patient as PatientModel
+from tests.conftest import create_stub_http_client, paginate
+
+def synthetic_users(total):
+    return [
+        {"id": index, "name": "Person Number", "email": f"person{index}@pipeline.example.com", "phone": "555-010-0000"}
+        for index in range(total)
+    ]
+
+@pytest.mark.asyncio
+async def test_pipeline_bounds_concurrency_and_memory():
+    limits = PipelineLimits(page_size=50, fetch_concurrency=3, queue_pages=2, batch_size=120)
+    source = synthetic_users(2000)
+    in_flight = 0
+    peak_in_flight = 0
+    fetched = 0
+    written = 0
+    peak_buffered = 0
+    batch_sizes = []
+    
+    async def fetch_page(page, page_size):
+        nonlocal in_flight, peak_in_flight, fetched
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        rows = source[(page - 1) * page_size:page * page_size]
+        fetched += len(rows)
+        return rows
+    
+    async def write_batch(batch):
+        nonlocal written, peak_buffered
+        peak_buffered = max(peak_buffered, fetched - written)
+        await asyncio.sleep(0.001)
+        batch_sizes.append(len(batch))
+        written += len(batch)
+        return len(batch)
+    
+    progress = await ImportPipeline(fetch_page, dict, write_batch, limits).run(1990, ImportProgress())
+    
+    assert progress.processed == progress.imported == 1990
+    assert peak_in_flight == 3
+    assert max(batch_sizes) < limits.batch_size + limits.page_size
+    max_buffered = (2 * limits.queue_pages + limits.fetch_concurrency + 2) * limits.page_size + limits.batch_size
+    assert peak_buffered <= max_buffered
+
+@pytest.mark.asyncio
+async def test_pipeline_surfaces_fetch_errors():
+    async def fetch_page(page, page_size):
+        raise RuntimeError("source unavailable")
+    
+    async def write_batch(batch):
+        return len(batch)
+    
+    with pytest.raises(RuntimeError, match="source unavailable"):
+        await ImportPipeline(fetch_page, dict, write_batch).run(10, ImportProgress())
+
+@pytest.mark.asyncio
+async def test_paginated_import_writes_in_batches(db_session):
+    users = synthetic_users(1200)
+    users[7]["name"] = "123"
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=paginate(users, request))
+    
+    use_cases = PatientUseCases(
+        PatientRepository(db_session),
+        ExternalApiService(create_stub_http_client(handler)),
+        PipelineLimits(page_size=100, fetch_concurrency=4, batch_size=250)
+    )
+    reports = []
+    
+    async def on_progress(progress):
+        reports.append(progress.processed)
+    
+    progress = ImportProgress()
+    imported = await use_cases.import_external_patients(1500, on_progress=on_progress, progress=progress)
+    
+    assert imported == 1199
+    assert progress.failed == 1
+    assert progress.processed == 1200
+    assert reports == sorted(reports) and len(reports) > 1
+    total = await db_session.scalar(select(func.count()).select_from(PatientModel))
+    assert total == 1199
+    
+    rerun = ImportProgress()
+    assert await use_cases.import_external_patients(1500, progress=rerun) == 0
+    assert rerun.skipped == 1199
+
+@pytest.mark.asyncio
+async def test_oversized_record_fails_alone(db_session):
+    users = synthetic_users(30)
+    users[4]["name"] = "Bartholomew " * 10
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=paginate(users, request))
+    
+    use_cases = PatientUseCases(
+        PatientRepository(db_session),
+        ExternalApiService(create_stub_http_client(handler)),
+        PipelineLimits(page_size=10, batch_size=30)
+    )
+    progress = ImportProgress()
+    
+    assert await use_cases.import_external_patients(30, progress=progress) == 29
+    assert (progress.processed, progress.failed) == (30, 1)
+    assert progress.errors == ["person4@pipeline.example.com: name: String should have at most 100 characters"]
+
+@pytest.mark.asyncio
+async def test_batch_rejected_by_the_database_is_written_row_by_row(db_session):
+    def to_patient(user):
+        # A missing name slips past normalization and violates NOT NULL.
+        name = None if user["id"] == 3 else user["name"]
+        return Patient(id=None, name=name, email=user["email"], phone=user["phone"], content_hash=str(user["id"]))
+    
+    users = synthetic_users(8)
+    
+    async def fetch_page(page, page_size):
+        return users[(page - 1) * page_size:page * page_size]
+    
+    repository = PatientRepository(db_session)
+    pipeline = ImportPipeline(fetch_page, to_patient, repository.create_many, PipelineLimits(page_size=8, batch_size=8))
+    progress = await pipeline.run(8, ImportProgress())
+    
+    assert (progress.processed, progress.imported, progress.failed) == (8, 7, 1)
+    assert progress.errors[0].startswith("person3@pipeline.example.com: Rejected by the database: NOT NULL constraint failed")
+    assert await db_session.scalar(select(func.count()).select_from(PatientModel)) == 7
@@ -0,0 +1,88 @@
+import copy
+import httpx
+import pytest
+from sqlalchemy import select
+from app.application.use_cases.import_pipeline import PipelineLimits
+from app.application.use_cases.patient_use_cases import PatientUseCases
+from app.domain.entities.import_job import ImportProgress
+from app.domain.entities.patient import Patient as PatientEntity
+from app.infrastructure.external.external_api_service import ExternalApiService
+from app.infrastructure.monitoring.sql import start_query_tracking, stop_query_tracking
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.models.patient import Patient as PatientModel
+from tests.conftest import EXTERNAL_USERS, create_stub_http_client, paginate
+
+def sync_use_cases(db_session, users):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=paginate(users, request))
+    
+    return PatientUseCases(
+        PatientRepository(db_session),
+        ExternalApiService(create_stub_http_client(handler)),
+        PipelineLimits(page_size=5, batch_size=100)
+    )
+
+async def run_sync(use_cases):
+    progress = ImportProgress()
+    await use_cases.import_external_patients(100, progress=progress, sync=True)
+    return progress
+
+@pytest.mark.asyncio
+async def test_sync_reports_created_updated_and_unchanged(db_session):
+    users = copy.deepcopy(EXTERNAL_USERS)
+    use_cases = sync_use_cases(db_session, users)
+    
+    first = await run_sync(use_cases)
+    assert (first.imported, first.updated, first.unchanged) == (10, 0, 0)
+    
+    stats, token = start_query_tracking()
+    try:
+        second = await run_sync(use_cases)
+    finally:
+        stop_query_tracking(token)
+    assert (second.imported, second.updated, second.unchanged) == (0, 0, 10)
+    assert stats.count == 1
+    
+    users[0]["name"] = "Leanne Graham Smith"
+    users[3]["phone"] = "555-999-0000"
+    third = await run_sync(use_cases)
+    assert (third.imported, third.updated, third.unchanged) == (0, 2, 8)
+    
+    renamed = await db_session.scalar(
+        select(PatientModel).where(PatientModel.source == "jsonplaceholder", PatientModel.source_id == "1")
+    )
+    await db_session.refresh(renamed)
+    assert renamed.name == "Leanne Graham Smith"
+
+@pytest.mark.asyncio
+async def test_sync_adopts_patients_imported_without_source_id(db_session):
+    users = copy.deepcopy(EXTERNAL_USERS[:3])
+    use_cases = sync_use_cases(db_session, users)
+    await use_cases.create_patient({"name": "Leanne Manual", "email": users[0]["email"], "phone": "+1234567890"})
+    
+    progress = await run_sync(use_cases)
+    
+    assert (progress.imported, progress.updated, progress.unchanged) == (2, 1, 0)
+    adopted = await db_session.scalar(select(PatientModel).where(PatientModel.email == users[0]["email"]))
+    await db_session.refresh(adopted)
+    assert (adopted.source_id, adopted.name) == ("1", "Leanne Graham")
+
+@pytest.mark.asyncio
+async def test_sync_leaves_other_sources_rows_with_the_same_source_id_alone(db_session):
+    repository = PatientRepository(db_session)
+    await repository.sync_many("crm", [
+        PatientEntity(id=None, name="Crm Patient", email="shared@example.com", phone="+1234567890", source_id="7")
+    ])
+    await repository.sync_many("erp", [
+        PatientEntity(id=None, name="Erp Patient", email="erp@example.com", phone="+1234567891", source_id="7")
+    ])
+    
+    result = await repository.sync_many("erp", [
+        PatientEntity(id=None, name="Erp Renamed", email="shared@example.com", phone="+1234567891", source_id="7")
+    ])
+    
+    assert (result.created, result.updated, result.unchanged) == (0, 0, 0)
+    rows = (await db_session.execute(
+        select(PatientModel.source, PatientModel.source_id, PatientModel.name).order_by(PatientModel.source)
+    )).all()
+    assert [tuple(row) for row in rows] == [("crm", "7", "Crm Patient"), ("erp", "7", "Erp Patient")]
@@ -0,0 +1,69 @@
+import signal
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.infrastructure.monitoring import memory
+from app.infrastructure.monitoring.memory import RssWatchdog, memory_diagnostics
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+leak = []
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    memory_diagnostics.reset()
+    leak.clear()
+
+def test_snapshot_diff_ranks_allocation_sites():
+    headers = create_user_headers(client, "memoryadmin", superuser=True)
+    first = client.post("/admin/memory/snapshots", headers=headers)
+    assert first.status_code == 201
+
+    leak.extend(bytearray(1024) for _ in range(2000))
+    second = client.post("/admin/memory/snapshots", headers=headers).json()
+
+    response = client.get(
+        f"/admin/memory/snapshots/diff?from_id={first.json()['id']}&to_id={second['id']}&limit=5",
+        headers=headers
+    )
+    assert response.status_code == 200
+    top = response.json()[0]
+    assert "test_memory_diagnostics.py" in top["location"]
+    assert top["size_diff"] >= 2000 * 1024
+
+    listed = client.get("/admin/memory/snapshots", headers=headers).json()
+    assert [snapshot["id"] for snapshot in listed] == [first.json()["id"], second["id"]]
+
+def test_diff_unknown_snapshot_returns_404():
+    headers = create_user_headers(client, "memorymissing", superuser=True)
+    response = client.get("/admin/memory/snapshots/diff?from_id=998&to_id=999", headers=headers)
+    assert response.status_code == 404
+
+def test_object_counts():
+    headers = create_user_headers(client, "memoryobjects", superuser=True)
+    response = client.get("/admin/memory/objects?limit=10", headers=headers)
+    assert response.status_code == 200
+    counts = response.json()
+    assert len(counts) == 10
+    assert counts[0]["count"] >= counts[-1]["count"]
+
+def test_memory_endpoints_require_superuser():
+    headers = create_user_headers(client, "memoryuser")
+    assert client.post("/admin/memory/snapshots", headers=headers).status_code == 403
+    assert client.get("/admin/memory/objects", headers=headers).status_code == 403
+
+@pytest.mark.asyncio
+async def test_rss_watchdog_recycles_worker(monkeypatch):
+    signals = []
+    monkeypatch.setattr(memory.os, "kill", lambda pid, sig: signals.append(sig))
+
+    watchdog = RssWatchdog(max_rss_bytes=1, interval=0.01, consecutive_checks=2)
+    await watchdog.run()
+
+    assert signals == [signal.SIGTERM]
+
+def test_rss_watchdog_below_watermark():
+    watchdog = RssWatchdog(max_rss_bytes=2**50)
+    assert watchdog.check() is False
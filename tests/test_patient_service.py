@@ -2,11 +2,12 @@ import pytest
 from app.application.use_cases.patient_use_cases import PatientUseCases
 from app.infrastructure.repositories.patient_repository import PatientRepository
 from app.infrastructure.external.external_api_service import ExternalApiService
+from tests.conftest import stub_http_client
 
 @pytest.mark.asyncio
 async def test_create_patient(db_session):
     patient_repository = PatientRepository(db_session)
-    external_api_service = ExternalApiService()
+    external_api_service = ExternalApiService(stub_http_client)
     patient_use_cases = PatientUseCases(patient_repository, external_api_service)
     
     patient_data = {
@@ -25,7 +26,7 @@ async def test_create_patient(db_session):
 @pytest.mark.asyncio
 async def test_get_patient_by_id(db_session):
     patient_repository = PatientRepository(db_session)
-    external_api_service = ExternalApiService()
+    external_api_service = ExternalApiService(stub_http_client)
     patient_use_cases = PatientUseCases(patient_repository, external_api_service)
     
     patient_data = {
@@ -44,7 +45,7 @@ async def test_get_patient_by_id(db_session):
 @pytest.mark.asyncio
 async def test_get_patients_with_search(db_session):
     patient_repository = PatientRepository(db_session)
-    external_api_service = ExternalApiService()
+    external_api_service = ExternalApiService(stub_http_client)
     patient_use_cases = PatientUseCases(patient_repository, external_api_service)
     
     patients_data = [
@@ -78,7 +79,7 @@ async def test_get_patients_with_search(db_session):
 @pytest.mark.asyncio
 async def test_create_duplicate_email(db_session):
     patient_repository = PatientRepository(db_session)
-    external_api_service = ExternalApiService()
+    external_api_service = ExternalApiService(stub_http_client)
     patient_use_cases = PatientUseCases(patient_repository, external_api_service)
     
     patient_data = {
@@ -0,0 +1,75 @@
+from datetime import date, datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.application.use_cases.patient_stats_use_cases import PatientStatsUseCases
+from app.domain.entities.patient import Patient as PatientEntity
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository
+from app.main import app
+from app.models.patient import Patient as PatientModel
+from app.models.patient_stats import PatientStat
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+def patient(name: str, email: str, source_id: str = None) -> PatientEntity:
+    return PatientEntity(id=None, name=name, email=email, phone="+1234567890", source_id=source_id)
+
+async def rollup_rows(db_session):
+    result = await db_session.execute(select(PatientStat.dimension, PatientStat.key, PatientStat.count))
+    return {(dimension, key): count for dimension, key, count in result if count}
+
+@pytest.mark.asyncio
+async def test_writes_keep_rollups_equal_to_a_rebuild(db_session):
+    repository = PatientRepository(db_session)
+    first = await repository.create(patient("Ann Lee", "ann@clinic.org"))
+    await repository.create_many([patient("Bob Ray", "bob@clinic.org"), patient("Cy Po", "cy@mail.com")])
+    await repository.sync_many("crm", [patient("Di Wu", "di@mail.com", source_id="d")])
+    await repository.sync_many("crm", [patient("Di Wu", "di@other.net", source_id="d")])
+    await repository.update(first.id, {"email": "ann@mail.com"})
+    await repository.delete(first.id)
+
+    incremental = await rollup_rows(db_session)
+    today = datetime.utcnow().date().isoformat()
+    assert incremental == {
+        ("day", today): 3,
+        ("domain", "clinic.org"): 1,
+        ("domain", "mail.com"): 1,
+        ("domain", "other.net"): 1,
+        ("total", "active"): 3,
+    }
+
+    await PatientStatsRepository(db_session).rebuild()
+    assert await rollup_rows(db_session) == incremental
+
+@pytest.mark.asyncio
+async def test_rebuild_groups_existing_rows_by_day(db_session):
+    db_session.add_all([
+        PatientModel(name="Old One", email="old1@a.com", phone="+1234567890", created_at=datetime(2026, 1, 2, 10)),
+        PatientModel(name="Old Two", email="old2@b.com", phone="+1234567890", created_at=datetime(2026, 1, 2, 23)),
+        PatientModel(name="Old Six", email="old6@a.com", phone="+1234567890", created_at=datetime(2026, 1, 4, 8)),
+    ])
+    await db_session.commit()
+    use_cases = PatientStatsUseCases(PatientStatsRepository(db_session))
+    await use_cases.rebuild()
+
+    stats = await use_cases.get_stats(days=3, domains=1, today=date(2026, 1, 4))
+    assert stats.active_patients == 3
+    assert stats.created_per_day == [(date(2026, 1, 2), 2), (date(2026, 1, 3), 0), (date(2026, 1, 4), 1)]
+    assert stats.top_domains == [("a.com", 2)]
+
+def test_stats_endpoint():
+    headers = create_user_headers(client, "statsuser")
+    for name, email in (("Eve Stone", "eve@clinic.org"), ("Fay Moss", "fay@clinic.org"), ("Gus Hill", "gus@mail.com")):
+        assert client.post("/patients/", json={"name": name, "email": email, "phone": "+1234567890"}, headers=headers).status_code == 201
+
+    response = client.get("/patients/stats", params={"days": 7}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["active_patients"] == 3
+    assert len(body["created_per_day"]) == 7
+    assert body["created_per_day"][-1] == {"day": datetime.utcnow().date().isoformat(), "count": 3}
+    assert body["top_domains"] == [{"domain": "clinic.org", "patients": 2}, {"domain": "mail.com", "patients": 1}]
+
+    assert client.get("/patients/stats", params={"days": 0}, headers=headers).status_code == 400
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from app.domain.entities.patient import Patient as PatientEntity
+from app.infrastructure.events.patient_events import CLOSED, patient_events
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.main import app
+from app.presentation.controllers.batch_controller import run_atomic
+from app.presentation.controllers.patient_stream_controller import encode_change_event
+from app.schemas.batch import BatchItem
+from tests.conftest import TestingSessionLocal, create_user_headers
+
+class SseStream:
+    """Drives the ASGI app directly; TestClient buffers whole responses."""
+
+    def __init__(self, headers: dict, last_event_id: int = None):
+        self.status = None
+        self.body = ""
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._disconnected = asyncio.Event()
+        raw_headers = [(b"host", b"test")] + [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+        if last_event_id is not None:
+            raw_headers.append((b"last-event-id", str(last_event_id).encode()))
+        self._scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/patients/stream", "raw_path": b"/patients/stream", "root_path": "",
+            "query_string": b"", "headers": raw_headers, "client": ("test", 1), "server": ("test", 80),
+        }
+        self._requested = False
+        self._task = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(app(self._scope, self._receive, self._messages.put))
+        start = await asyncio.wait_for(self._messages.get(), 5)
+        self.status = start["status"]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._disconnected.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def read_until(self, text: str, timeout: float = 5.0) -> str:
+        async def read():
+            while text not in self.body:
+                message = await self._messages.get()
+                self.body += message.get("body", b"").decode()
+        await asyncio.wait_for(read(), timeout)
+        return self.body
+
+@pytest.fixture
+def headers():
+    return create_user_headers(TestClient(app), "streamuser")
+
+@pytest_asyncio.fixture
+async def running_hub():
+    task = asyncio.create_task(patient_events.run(TestingSessionLocal, PatientRepository, encode_change_event, 0.05))
+    await asyncio.sleep(0)
+    yield patient_events
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+def patient(name: str, email: str) -> PatientEntity:
+    return PatientEntity(id=None, name=name, email=email, phone="+1234567890")
+
+@pytest.mark.asyncio
+async def test_stream_delivers_writes_and_heartbeats(headers, running_hub, db_session):
+    async with SseStream(headers) as stream:
+        assert stream.status == 200
+        await stream.read_until("retry:")
+        created = await PatientRepository(db_session).create(patient("Live Patient", "live@example.com"))
+
+        body = await stream.read_until('"Live Patient"')
+        assert "event: created\n" in body
+        assert f'"patient_id":{created.id}' in body
+        await stream.read_until(": heartbeat")
+    assert running_hub.subscriber_count == 0
+
+@pytest.mark.asyncio
+async def test_last_event_id_replays_missed_changes(headers, running_hub, db_session):
+    repository = PatientRepository(db_session)
+    await repository.create(patient("Seen Patient", "seen@example.com"))
+    seen = (await repository.get_changes()).next_cursor
+    await repository.create(patient("Missed Patient", "missed@example.com"))
+
+    async with SseStream(headers, last_event_id=seen) as stream:
+        body = await stream.read_until('"Missed Patient"')
+        assert '"Seen Patient"' not in body
+        await repository.delete((await repository.get_by_email("seen@example.com")).id)
+        body = await stream.read_until("event: deleted")
+        assert body.count("event: created") == 1
+
+@pytest.mark.asyncio
+async def test_stream_delivers_atomic_batches_once_committed(headers, running_hub):
+    async with SseStream(headers) as stream:
+        await stream.read_until("retry:")
+        responses = await run_atomic(TestingSessionLocal, [
+            BatchItem(method="POST", path="/patients", body={"name": "Atomic One", "email": "atomic1@example.com", "phone": "+1234567890"}),
+            BatchItem(method="POST", path="/patients", body={"name": "Atomic Two", "email": "atomic2@example.com", "phone": "+1234567890"}),
+            # Reads after the last write give the hub time to look at the log
+            # before the batch is committed.
+            *[BatchItem(method="GET", path="/patients?search=atomic") for _ in range(5)],
+        ])
+        assert [response.status for response in responses] == [201, 201, 200, 200, 200, 200, 200]
+
+        body = await stream.read_until('"Atomic Two"')
+        assert body.count("event: created") == 2
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_is_closed(running_hub, db_session):
+    running_hub.queue_size = 1
+    try:
+        subscription = await running_hub.subscribe()
+        await PatientRepository(db_session).create_many([
+            patient("Burst One", "burst1@example.com"),
+            patient("Burst Two", "burst2@example.com"),
+        ])
+        assert await asyncio.wait_for(subscription.queue.get(), 5) is CLOSED
+        assert running_hub.subscriber_count == 0
+    finally:
+        running_hub.queue_size = 1000
+
+def test_stream_requires_running_hub(headers):
+    response = TestClient(app).get("/patients/stream", headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -1,9 +1,18 @@
+import time
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 
 client = TestClient(app)
 
+def wait_for_import_job(test_client, location, headers, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = test_client.get(location, headers=headers).json()
+        if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
 class TestPatientEndpoints:
     
     @pytest.fixture(autouse=True)
@@ -167,7 +176,10 @@ class TestPatientEndpoints:
         assert get_response.status_code == 404
 
     def test_import_external_data(self):
-        response = client.post("/patients/import-data?count=3", headers=self.headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert "imported" in data["message"].lower()
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post("/patients/import-data?count=3", headers=self.headers)
+            assert response.status_code == 202
+            job = wait_for_import_job(lifespan_client, response.headers["Location"], self.headers)
+        
+        assert job["status"] == "completed"
+        assert job["processed_count"] == 3
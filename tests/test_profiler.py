@@ -0,0 +1,85 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.infrastructure.repositories.user_repository import UserRepository
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+def _login(username: str, superuser: bool = False) -> dict:
+    return create_user_headers(client, username, superuser)
+
+@pytest.fixture(autouse=True)
+def profiler_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profiler_output_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiler_min_interval_seconds", 0)
+    # Rebuild the middleware stack so each test starts with a fresh rate limiter.
+    app.middleware_stack = None
+
+def test_request_without_flag_is_not_profiled():
+    response = client.get("/health")
+    assert "x-profile-status" not in response.headers
+    assert "x-profile-id" not in response.headers
+
+def test_superuser_profile_is_stored_and_downloadable(tmp_path):
+    headers = _login("profileradmin", superuser=True)
+    response = client.get("/patients/", headers={**headers, "X-Profile": "speedscope"})
+    assert response.status_code == 200
+    assert response.headers["x-profile-status"] == "accepted"
+
+    profile_id = response.headers["x-profile-id"]
+    assert (tmp_path / profile_id).is_file()
+    assert profile_id in client.get("/admin/profiles", headers=headers).json()
+
+    download = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+    assert download.status_code == 200
+    assert "speedscope" in json.loads(download.content)["$schema"]
+
+def test_query_flag_selects_html_format():
+    headers = _login("profilerhtml", superuser=True)
+    response = client.get("/patients/?profile=html", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["x-profile-id"].endswith(".html")
+
+def test_regular_user_cannot_profile(tmp_path):
+    headers = _login("profileruser")
+    response = client.get("/patients/", headers={**headers, "X-Profile": "speedscope"})
+    assert response.status_code == 200
+    assert response.headers["x-profile-status"] == "denied"
+    assert list(tmp_path.iterdir()) == []
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+
+def test_profiling_is_rate_limited(monkeypatch):
+    headers = _login("profilerlimit", superuser=True)
+    monkeypatch.setattr(settings, "profiler_min_interval_seconds", 3600)
+
+    first = client.get("/health", headers={**headers, "X-Profile": "speedscope"})
+    second = client.get("/health", headers={**headers, "X-Profile": "speedscope"})
+    assert first.headers["x-profile-status"] == "accepted"
+    assert second.headers["x-profile-status"] == "rate-limited"
+
+def test_flag_without_valid_token_or_while_limited_skips_user_lookup(monkeypatch):
+    headers = _login("profilerlookup", superuser=True)
+    lookups = []
+    original = UserRepository.get_by_username
+
+    async def counting_lookup(self, username):
+        lookups.append(username)
+        return await original(self, username)
+
+    monkeypatch.setattr(UserRepository, "get_by_username", counting_lookup)
+    anonymous = client.get("/health", headers={"X-Profile": "speedscope", "Authorization": "Bearer forged"})
+    assert anonymous.headers["x-profile-status"] == "denied"
+    assert lookups == []
+
+    monkeypatch.setattr(settings, "profiler_min_interval_seconds", 3600)
+    assert client.get("/health", headers={**headers, "X-Profile": "speedscope"}).headers["x-profile-status"] == "accepted"
+    assert client.get("/health", headers={**headers, "X-Profile": "speedscope"}).headers["x-profile-status"] == "rate-limited"
+    assert lookups == ["profilerlookup"]
+
+def test_download_rejects_invalid_profile_id():
+    headers = _login("profilerpath", superuser=True)
+    response = client.get("/admin/profiles/..%2F..%2Fetc%2Fpasswd", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,165 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.infrastructure.external.http_cache import CachingTransport, DiskCache
+from app.infrastructure.external.resilience import (
+    EXTERNAL_HEDGED_REQUESTS,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    ResilientTransport,
+    circuit_breakers,
+)
+from tests.conftest import create_user_headers
+
+URL = "https://upstream.test/users"
+
+class FaultInjectingStub:
+    """Upstream stand-in that plays back a script of faults, then succeeds.
+
+    Script items are a status code, an exception class, or a
+    ``(delay_seconds, status_code)`` pair.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        action = self.script.pop(0) if self.script else 200
+        if isinstance(action, tuple):
+            delay, action = action
+            await asyncio.sleep(delay)
+        if isinstance(action, type) and issubclass(action, Exception):
+            raise action("injected fault", request=request)
+        return httpx.Response(action, json={"call": self.calls})
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def resilient_client(stub, breakers=None, **options):
+    options.setdefault("base_delay", 0)
+    transport = ResilientTransport(httpx.MockTransport(stub), breakers or CircuitBreakerRegistry(), **options)
+    return httpx.AsyncClient(transport=transport)
+
+@pytest.mark.asyncio
+async def test_idempotent_requests_are_retried():
+    stub = FaultInjectingStub(503, httpx.ConnectError, 200)
+    async with resilient_client(stub) as client:
+        response = await client.get(URL)
+    assert response.status_code == 200
+    assert stub.calls == 3
+
+@pytest.mark.asyncio
+async def test_writes_and_client_errors_are_not_retried():
+    stub = FaultInjectingStub(503, 404)
+    async with resilient_client(stub) as client:
+        assert (await client.post(URL)).status_code == 503
+        assert (await client.get(URL)).status_code == 404
+    assert stub.calls == 2
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    breakers = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=30, clock=clock)
+    stub = FaultInjectingStub(*[httpx.ReadTimeout] * 3)
+    
+    async with resilient_client(stub, breakers, max_attempts=3) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get(URL)
+        assert breakers.get("upstream.test").state is CircuitState.OPEN
+        
+        with pytest.raises(CircuitOpenError):
+            await client.get(URL)
+        assert stub.calls == 3
+        
+        clock.now += 31
+        assert breakers.snapshot()[0]["state"] == "half_open"
+        assert (await client.get(URL)).status_code == 200
+    
+    assert breakers.get("upstream.test").state is CircuitState.CLOSED
+
+@pytest.mark.asyncio
+async def test_hedged_request_cuts_tail_latency():
+    breakers = CircuitBreakerRegistry()
+    for _ in range(50):
+        breakers.get("upstream.test").record_latency(0.01)
+    stub = FaultInjectingStub((2.0, 200), 200)
+    hedges = EXTERNAL_HEDGED_REQUESTS.labels("upstream.test", "hedge")._value.get()
+    
+    async with resilient_client(stub, breakers, hedging=True, hedge_min_delay=0.02) as client:
+        started = time.monotonic()
+        response = await client.get(URL)
+    
+    assert time.monotonic() - started < 1.0
+    assert response.json() == {"call": 2}
+    assert EXTERNAL_HEDGED_REQUESTS.labels("upstream.test", "hedge")._value.get() == hedges + 1
+
+@pytest.mark.asyncio
+async def test_retryable_hedge_answer_waits_for_the_primary():
+    breakers = CircuitBreakerRegistry()
+    for _ in range(50):
+        breakers.get("upstream.test").record_latency(0.01)
+    stub = FaultInjectingStub((0.3, 200), 503)
+    primaries = EXTERNAL_HEDGED_REQUESTS.labels("upstream.test", "primary")._value.get()
+
+    async with resilient_client(stub, breakers, hedging=True, hedge_min_delay=0.02) as client:
+        response = await client.get(URL)
+
+    assert response.status_code == 200
+    assert stub.calls == 2
+    assert EXTERNAL_HEDGED_REQUESTS.labels("upstream.test", "primary")._value.get() == primaries + 1
+
+@pytest.mark.asyncio
+async def test_every_attempt_sends_its_own_request():
+    breakers = CircuitBreakerRegistry()
+    for _ in range(50):
+        breakers.get("upstream.test").record_latency(0.01)
+    seen = []
+    
+    async def mutating_stub(request: httpx.Request) -> httpx.Response:
+        seen.append((request, request.headers.get_list("x-attempt")))
+        request.headers["x-attempt"] = str(len(seen))
+        await asyncio.sleep(0.2 if len(seen) == 1 else 0)
+        return httpx.Response(200 if len(seen) == 3 else 503)
+    
+    async with resilient_client(mutating_stub, breakers, hedging=True, hedge_min_delay=0.02) as client:
+        assert (await client.get(URL)).status_code == 200
+    
+    assert [headers for _, headers in seen] == [[], [], []]
+    assert len({id(request) for request, _ in seen}) == 3
+
+@pytest.mark.asyncio
+async def test_cache_serves_stale_entry_when_circuit_is_open(tmp_path):
+    clock = FakeClock()
+    breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=30, clock=clock)
+    stub = FaultInjectingStub(200, httpx.ConnectError)
+    transport = CachingTransport(
+        ResilientTransport(httpx.MockTransport(stub), breakers, max_attempts=1),
+        DiskCache(str(tmp_path), 2**20),
+        ttl=0,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get(URL)
+        stale = await client.get(URL)
+        again = await client.get(URL)
+    
+    assert stale.extensions["cache_status"] == again.extensions["cache_status"] == "stale"
+    assert stub.calls == 2
+
+def test_admin_exposes_circuit_state():
+    circuit_breakers.get("jsonplaceholder.typicode.com")
+    with TestClient(app) as client:
+        headers = create_user_headers(client, "circuitadmin", superuser=True)
+        response = client.get("/admin/external/circuits", headers=headers)
+    
+    assert response.status_code == 200
+    assert any(circuit["host"] == "jsonplaceholder.typicode.com" for circuit in response.json())
@@ -0,0 +1,87 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.config import settings
+from app.database.connection import get_db
+from app.infrastructure.monitoring.sql import redact_parameters
+from app.presentation.middleware.sql import QueryBudgetExceeded, QueryStatsMiddleware, query_budget
+from tests.conftest import override_get_db
+
+client = TestClient(app)
+
+probe_app = FastAPI()
+probe_app.add_middleware(QueryStatsMiddleware)
+probe_app.dependency_overrides[get_db] = override_get_db
+
+@probe_app.get("/n-plus-one")
+@query_budget(2)
+async def n_plus_one(db=Depends(get_db)):
+    for _ in range(3):
+        await db.execute(text("SELECT 1"))
+    return {"ok": True}
+
+probe_client = TestClient(probe_app)
+
+@pytest.fixture
+def headers():
+    client.post("/auth/register", json={
+        "username": "sqlstats",
+        "email": "sqlstats@example.com",
+        "password": "TestPass123!"
+    })
+    token = client.post("/auth/token", json={
+        "username": "sqlstats",
+        "password": "TestPass123!"
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def test_server_timing_reports_query_count(headers, monkeypatch):
+    # With a ready email filter the duplicate-email lookup may be skipped.
+    monkeypatch.setattr(settings, "email_filter_enabled", False)
+    response = client.post("/patients/", json={
+        "name": "Timing Patient",
+        "email": "timing@example.com",
+        "phone": "+1234567890"
+    }, headers=headers)
+    assert response.status_code == 201
+    server_timing = response.headers["server-timing"]
+    assert 'desc="6 queries"' in server_timing
+    assert server_timing.startswith("db;dur=")
+
+def test_query_metrics_exposed(headers):
+    client.get("/patients/", headers=headers)
+    body = client.get("/metrics").text
+    assert 'db_queries_per_request_count{method="GET",route="/patients/"}' in body
+    assert "db_query_duration_seconds_bucket" in body
+
+def test_query_budget_exceeded_fails_in_test_mode():
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 queries, budget is 2"):
+        probe_client.get("/n-plus-one")
+
+def test_query_budget_exceeded_only_logs_outside_test_mode(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "enforce_query_budgets", False)
+    with caplog.at_level(logging.WARNING):
+        response = probe_client.get("/n-plus-one")
+    assert response.status_code == 200
+    assert "Query budget exceeded" in caplog.text
+
+def test_slow_query_log_redacts_parameters(monkeypatch, caplog, headers):
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.post("/patients/", json={
+            "name": "Secret Patient",
+            "email": "secret.patient@example.com",
+            "phone": "+1234567890"
+        }, headers=headers)
+    assert "Slow query" in caplog.text
+    assert "INSERT INTO patients" in caplog.text
+    assert "secret.patient@example.com" not in caplog.text
+    assert "<str>" in caplog.text
+
+def test_redact_parameters():
+    assert redact_parameters({"email": "a@b.com", "id": 1}) == "{email: <str>, id: <int>}"
+    assert redact_parameters(("a@b.com", 1)) == "(<str>, <int>)"
+    assert redact_parameters([(1,), (2,)], executemany=True) == "<2 parameter sets>"
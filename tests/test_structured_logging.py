@@ -0,0 +1,82 @@
+import json
+import logging
+import queue
+from fastapi.testclient import TestClient
+from app.main import app
+from app.infrastructure.monitoring.request_context import (
+    RequestContext,
+    bind_request_context,
+    unbind_request_context,
+)
+from app.infrastructure.monitoring.structured_logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    RequestContextFilter,
+    SamplingFilter,
+)
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+def _record(msg="HTTP error response", **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.main", logging.WARNING, __file__, 1, msg, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+def test_json_formatter_includes_request_id_and_extra_fields():
+    record = _record(route="/patients/{patient_id}", status_code=404)
+    token = bind_request_context(RequestContext("req-42", "GET", "/patients/7"))
+    try:
+        RequestContextFilter().filter(record)
+    finally:
+        unbind_request_context(token)
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "HTTP error response"
+    assert payload["request_id"] == "req-42"
+    assert payload["route"] == "/patients/{patient_id}"
+    assert payload["status_code"] == 404
+
+def test_sampling_prefers_most_specific_rule():
+    sampler = SamplingFilter({"404": 0.1, "/patients/{patient_id} 404": 0.5, "5xx": 1.0})
+    route_kept = sum(sampler.filter(_record(route="/patients/{patient_id}", status_code=404)) for _ in range(10))
+    other_kept = sum(sampler.filter(_record(route="/patients/", status_code=404)) for _ in range(10))
+    errors_kept = sum(sampler.filter(_record(status_code=503)) for _ in range(10))
+    untagged_kept = sum(sampler.filter(_record()) for _ in range(10))
+    assert (route_kept, other_kept, errors_kept, untagged_kept) == (5, 1, 10, 10)
+
+def test_rate_limit_suppresses_repeats_and_reports_count():
+    limiter = RateLimitFilter(limit=3, window=3600)
+    kept = [limiter.filter(_record(status_code=404)) for _ in range(10)]
+    assert kept.count(True) == 3
+
+    limiter.window = 0
+    record = _record(status_code=404)
+    assert limiter.filter(record)
+    assert record.suppressed == 7
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record("first"))
+    handler.handle(_record("second"))
+    assert handler.queue.qsize() == 1
+    assert handler.queue.get_nowait().msg == "first"
+
+def test_error_responses_log_route_template(caplog):
+    headers = create_user_headers(client, "logginguser")
+    # The production handler stamps the request id with this filter.
+    request_context = RequestContextFilter()
+    caplog.handler.addFilter(request_context)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.main"):
+            client.get("/patients/424242", headers={**headers, "X-Request-ID": "poll-1"})
+    finally:
+        caplog.handler.removeFilter(request_context)
+
+    (record,) = [r for r in caplog.records if r.getMessage() == "HTTP error response"]
+    assert record.request_id == "poll-1"
+    assert record.route == "/patients/{patient_id}"
+    assert record.status_code == 404
+    assert "424242" not in record.getMessage()
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import func, select
+from app.cli.seed_patients import seed
+from app.domain.entities.patient_change import ChangeOperation
+from app.domain.normalization import normalize_email, normalize_phone
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.infrastructure.repositories.patient_stats_repository import PatientStatsRepository
+from app.infrastructure.synthetic.population import BLOCK_SIZE, SyntheticPopulation
+from app.models.patient import Patient as PatientModel
+from app.models.patient_stats import PatientStat
+from app.schemas.patient import PatientCreate
+from tests.conftest import test_engine
+
+def test_population_is_deterministic_and_independent_of_batching():
+    whole = SyntheticPopulation(seed=7).generate(BLOCK_SIZE - 50, 100)
+    first = SyntheticPopulation(seed=7).generate(BLOCK_SIZE - 50, 30)
+    rest = SyntheticPopulation(seed=7).generate(BLOCK_SIZE - 20, 70)
+
+    assert list(whole.rows()) == list(first.rows()) + list(rest.rows())
+    assert whole.source_ids[0] == str(BLOCK_SIZE - 50)
+    assert SyntheticPopulation(seed=8).generate(BLOCK_SIZE - 50, 100).names != whole.names
+
+def test_generated_patients_pass_schema_validation():
+    columns = SyntheticPopulation(seed=1).generate(0, 2000)
+
+    assert len(set(columns.emails)) == 2000
+    for name, email, phone in zip(columns.names, columns.emails, columns.phones):
+        patient = PatientCreate(name=name, email=email, phone=phone)
+        assert patient.email == email
+
+@pytest.mark.asyncio
+async def test_seed_loads_in_batches_and_resumes(db_session):
+    assert await seed(test_engine, 300, seed=3, batch_size=128, quiet=True) == 300
+    assert await seed(test_engine, 200, seed=3, batch_size=128, quiet=True) == 200
+
+    total = await db_session.scalar(select(func.count()).select_from(PatientModel).where(PatientModel.source == "synthetic"))
+    assert total == 500
+    last = await db_session.scalar(select(PatientModel).where(PatientModel.source_id == "499"))
+    expected = SyntheticPopulation(seed=3).generate(499, 1)
+    assert (last.name, last.email, last.content_hash) == (expected.names[0], expected.emails[0], expected.content_hashes[0])
+
+@pytest.mark.asyncio
+async def test_seeded_patients_reach_the_change_feed(db_session):
+    patients = PatientRepository(db_session)
+    cursor = await patients.last_change_seq()
+    await seed(test_engine, 150, seed=4, batch_size=64, quiet=True)
+
+    page = await patients.get_changes(cursor, limit=1000)
+    assert [change.patient.source_id for change in page.changes] == [str(index) for index in range(150)]
+    assert {change.operation for change in page.changes} == {ChangeOperation.CREATED}
+    assert page.next_cursor == await patients.last_change_seq()
+
+@pytest.mark.asyncio
+async def test_seeded_patients_reach_the_stats(db_session):
+    async def rollup_rows():
+        result = await db_session.execute(select(PatientStat.dimension, PatientStat.key, PatientStat.count))
+        return {(dimension, key): count for dimension, key, count in result if count}
+
+    await seed(test_engine, 150, seed=5, batch_size=64, quiet=True)
+
+    incremental = await rollup_rows()
+    assert incremental[("total", "active")] == 150
+    await PatientStatsRepository(db_session).rebuild()
+    assert await rollup_rows() == incremental
+
+def test_generated_contact_columns_are_normalized():
+    columns = SyntheticPopulation(seed=2).generate(0, 50)
+
+    assert columns.normalized_phones == [normalize_phone(phone) for phone in columns.phones]
+    assert columns.emails == [normalize_email(email) for email in columns.emails]
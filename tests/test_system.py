@@ -26,14 +26,25 @@ class TestSystemEndpoints:
         assert "version" in data
 
     def test_metrics_endpoint(self):
-        """Test the metrics endpoint"""
+        """Test the metrics endpoint exposes Prometheus text format"""
+        client.get("/health")
         response = client.get("/metrics")
         assert response.status_code == 200
-        data = response.json()
-        assert data["service"] == "nuvie-backend"
-        assert "uptime" in data
-        assert "database" in data
-        assert "memory_usage" in data
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+        assert "http_request_duration_seconds_bucket" in body
+        assert "http_requests_in_progress" in body
+        assert "db_pool_connections_checked_out" in body
+
+    def test_metrics_use_route_templates(self):
+        """Test that request metrics are labelled by route template, not raw path"""
+        client.get("/patients/12345")
+        client.get("/nonexistent-endpoint")
+        body = client.get("/metrics").text
+        assert 'route="/patients/{patient_id}"' in body
+        assert 'route="unmatched",status="404"' in body
+        assert "/patients/12345" not in body
 
 class TestValidationHandling:
     
@@ -0,0 +1,72 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.trace import SpanKind
+from app.main import app
+from app.infrastructure.monitoring.tracing import TracingTransport, configure_tracing
+from tests.conftest import create_user_headers
+
+client = TestClient(app)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+@pytest.fixture
+def exporter():
+    span_exporter = configure_tracing("memory", sample_ratio=1.0)
+    yield span_exporter
+    configure_tracing("none")
+
+def _by_name(spans):
+    return {span.name: span for span in spans}
+
+def test_request_spans_cover_each_layer(exporter):
+    headers = create_user_headers(client, "traceuser")
+    patient_id = client.post("/patients/", json={
+        "name": "Traced Patient",
+        "email": "traced@example.com",
+        "phone": "+1234567890"
+    }, headers=headers).json()["id"]
+    exporter.clear()
+
+    response = client.get(f"/patients/{patient_id}", headers={**headers, "traceparent": TRACEPARENT})
+    assert response.status_code == 200
+
+    spans = exporter.get_finished_spans()
+    assert {span.context.trace_id for span in spans} == {int(TRACE_ID, 16)}
+
+    named = _by_name(spans)
+    server = named["GET /patients/{patient_id}"]
+    use_case = named["PatientUseCases.get_patient_by_id"]
+    repository = named["PatientRepository.get_by_id"]
+    assert server.kind == SpanKind.SERVER
+    assert server.attributes["http.status_code"] == 200
+    assert use_case.parent.span_id == server.context.span_id
+    assert repository.parent.span_id == use_case.context.span_id
+
+    sql = [span for span in spans if span.name == "SQL SELECT" and span.parent.span_id == repository.context.span_id]
+    assert len(sql) == 1
+    assert "FROM patients" in sql[0].attributes["db.statement"]
+
+def test_unsampled_requests_create_no_spans(exporter):
+    configure_tracing(exporter, sample_ratio=0.0)
+    client.get("/health")
+    assert exporter.get_finished_spans() == ()
+
+@pytest.mark.asyncio
+async def test_http_client_span_propagates_traceparent(exporter):
+    seen_headers = {}
+
+    def stub(request: httpx.Request) -> httpx.Response:
+        seen_headers.update(request.headers)
+        return httpx.Response(200, json=[])
+
+    transport = TracingTransport(httpx.MockTransport(stub))
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        await http_client.get("https://example.org/users?page=1")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.kind == SpanKind.CLIENT
+    assert span.attributes["http.url"] == "https://example.org/users"
+    assert span.attributes["http.status_code"] == 200
+    assert seen_headers["traceparent"].split("-")[1] == format(span.context.trace_id, "032x")